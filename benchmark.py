@@ -0,0 +1,37 @@
+import argparse
+import sys
+
+sys.path.append("src")
+from benchmarking.Perft import PERFT_EXPECTED, run
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Perft regression check and throughput benchmark of the game engine.')
+
+    parser.add_argument('--depth', type=int, default=3,
+                        help=f'Perft depth - counts up to depth {len(PERFT_EXPECTED["initial"])} are checked '
+                             f'against the reference.')
+    parser.add_argument('--matrix', action='store_true',
+                        help='Benchmark the numpy matrix board instead of the bitboard.')
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='Minimal measured time per function in seconds.')
+    parser.add_argument('--search-depth', type=int, default=None,
+                        help='Also time a self-play game of minimax players of this depth with the plain and the '
+                             'batched leaf evaluation.')
+    parser.add_argument('--search-plies', type=int, default=40,
+                        help='Number of steps of the timed self-play game.')
+    parser.add_argument('--output', default='perft_results.json',
+                        help='JSON file the report is written to.')
+
+    args = parser.parse_args()
+
+    report = run(args.depth, bitboard=not args.matrix, min_time=args.min_time, output=args.output,
+                 search_depth=args.search_depth, search_plies=args.search_plies)
+
+    for name, counts in report['perft']['counts'].items():
+        print(f'perft {name}: {counts}')
+    print(f'perft: {report["perft"]["nodes_per_second"]:,.0f} nodes/s')
+    for name, calls in report['calls_per_second'].items():
+        print(f'{name}: {calls:,.0f} calls/s')
+    for name, game in report.get('search', {}).get('games', {}).items():
+        print(f'search {name}: {game["seconds"]:0.3f} s, {game["leaves"]} leaves over {game["steps"]} steps')
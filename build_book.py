@@ -0,0 +1,28 @@
+import argparse
+import os
+import sys
+
+sys.path.append("src")
+from benchmarking.Tournament import HEURISTICS
+from game_problem.ChineseCheckers import ChineseCheckers
+from search.OpeningBookBuilder import build_opening_book
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Builds an opening book by searching the first plies of the game.')
+
+    parser.add_argument('--heuristic', choices=sorted(HEURISTICS), default='Weighted',
+                        help='Heuristic of the searches - a player can only use a book built with its heuristic.')
+    parser.add_argument('--depth', type=int, default=6,
+                        help='Search depth of every book position.')
+    parser.add_argument('--plies', type=int, default=3,
+                        help='Number of steps from the initial state covered by the book.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Number of worker processes searching the positions.')
+    parser.add_argument('--output', default='opening_book.bin',
+                        help='The book file.')
+
+    args = parser.parse_args()
+
+    build_opening_book(ChineseCheckers(triangle_size=3, bitboard=True), HEURISTICS[args.heuristic](), args.depth,
+                       args.plies, args.output, workers=args.workers)
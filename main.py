@@ -1,4 +1,5 @@
 import argparse
+import os
 import sys
 
 sys.path.append("src")
@@ -8,17 +9,59 @@ from GameController import GameController
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Chinese Checkers game with AI and player options.')
 
-    parser.add_argument('--first-player', choices=['human', 'minimax'], required=False,
+    parser.add_argument('--first-player', choices=['human', 'minimax', 'mcts'], required=False,
                         help='Type of the first player.')
     parser.add_argument('--first-minimax-depth', type=int, default=6, required=False,
                         help='Minimax depth for the first player, if applicable.')
-    parser.add_argument('--second-player', choices=['random', 'nonrepeatrandom', 'minimax'], required=False,
+    parser.add_argument('--first-minimax-time', type=float, default=None, required=False,
+                        help='Time budget per move in seconds for the first player - enables iterative deepening '
+                             'up to the minimax depth.')
+    parser.add_argument('--second-player', choices=['random', 'nonrepeatrandom', 'minimax', 'mcts'], required=False,
                         help='Type of the second player.')
     parser.add_argument('--second-minimax-depth', type=int, default=6, required=False,
                         help='Minimax depth for the second player, if applicable.')
+    parser.add_argument('--second-minimax-time', type=float, default=None, required=False,
+                        help='Time budget per move in seconds for the second player - enables iterative deepening '
+                             'up to the minimax depth.')
+    parser.add_argument('--minimax-workers', type=int, default=1, required=False,
+                        help='Number of worker processes searching the root actions of each minimax player - with a time '
+                             'budget, every iteration of the deepening is spread across the workers.')
+    parser.add_argument('--minimax-turn-plies', action='store_true',
+                        help='Search whole turns (a crawl or a complete chain of jumps) as single plies, so that the '
+                             'minimax depth counts turns.')
+    parser.add_argument('--minimax-pvs', action='store_true',
+                        help='Search with the principal variation search (null windows, aspiration windows with a '
+                             'time budget) instead of the plain alpha-beta search.')
+    parser.add_argument('--minimax-ponder', action='store_true',
+                        help='Let the minimax players search the likely replies in a background process while the '
+                             'opponent decides - a reply searched in advance is answered at once.')
+
+    parser.add_argument('--mcts-iterations', type=int, default=None, required=False,
+                        help='Simulations per move of the MCTS players (default: 1000 without a time budget).')
+    parser.add_argument('--mcts-time', type=float, default=None, required=False,
+                        help='Time budget per move in seconds of the MCTS players.')
+    parser.add_argument('--mcts-workers', type=int, default=1, required=False,
+                        help='Number of worker processes playing the rollouts of each MCTS player.')
+    parser.add_argument('--mcts-guided-rollouts', action='store_true',
+                        help='Pick the rollout actions of the MCTS players by the heuristic instead of at random.')
+
+    parser.add_argument('--opening-book', default=None, required=False,
+                        help='Opening book file used by the minimax players - built by build_book.py with the '
+                             'Weighted heuristic.')
+
+    parser.add_argument('--endgame-pegs', type=int, default=None, required=False,
+                        help='Solve the endgame exactly once at most this many pegs of a minimax player are outside '
+                             'its goal - plays the shortest forced win instead of searching.')
+
+    parser.add_argument('--headless', action='store_true',
+                        help='Run without the GUI - pygame is not loaded. Only AI players can play headless.')
 
     args = parser.parse_args()
+    if args.headless and args.first_player == 'human':
+        parser.error('a human player needs the GUI - remove --headless')
+    if args.opening_book is not None and not os.path.isfile(args.opening_book):
+        parser.error(f'opening book {args.opening_book} not found - build it with build_book.py')
 
-    controller = GameController(verbose=False, use_graphics=True, args=args)
+    controller = GameController(verbose=False, use_graphics=not args.headless, args=args)
 
     controller.game_loop()
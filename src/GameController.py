@@ -1,3 +1,4 @@
+import argparse
 import time
 
 from benchmarking.GameAnalytics import GameAnalytics
@@ -6,23 +7,35 @@ from players.NonRepeatRandomPlayer import NonRepeatingRandomPlayer
 from game_problem.Heuristic import WeightedHeuristic, SumOfPegsInCornerHeuristic, AverageManhattanToCornerHeuristic, \
     AverageEuclideanToCornerHeuristic, MaxManhattanToCornerHeuristic, EnsuredNormalizedHeuristic, \
     AverageEuclideanToEachCornerHeuristic, AverageManhattanToEachCornerHeuristic
-from players.GraphicsHumanPlayer import GraphicsHumanPlayer
+from players.MCTSPlayer import MCTSPlayer
 from players.MinimaxAIPlayer import MinimaxAIPlayer
 from players.RandomPlayer import RandomPlayer
+from search.EndgameSolver import EndgameSolver
+from search.EvalCache import EvalCache
+from search.OpeningBook import OpeningBook
 from game_problem.ChineseCheckers import ChineseCheckers
-from game.Graphics import Graphics
 from utils import play_beep
 
 
-def create_player(player_type, depth=6, gui=None, problem=None, max_player=None, heuristic=None):
+def create_player(player_type, depth=6, gui=None, problem=None, max_player=None, heuristic=None, time_budget=None,
+                  workers=1, turn_plies=False, opening_book=None, endgame_pegs=None, iterations=None,
+                  guided_rollouts=False, pvs=False, ponder=False):
     if player_type == 'human':
+        # Imported on demand - pygame is only loaded when a GUI is requested
+        from players.GraphicsHumanPlayer import GraphicsHumanPlayer
         return GraphicsHumanPlayer(gui)
     elif player_type == 'random':
         return RandomPlayer()
     elif player_type == 'nonrepeatrandom':
         return NonRepeatingRandomPlayer()
     elif player_type == 'minimax':
-        return MinimaxAIPlayer(problem, max_player, max_depth=depth, heuristic=heuristic, verbose=True)
+        endgame_solver = EndgameSolver(problem, endgame_pegs) if endgame_pegs is not None else None
+        return MinimaxAIPlayer(problem, max_player, max_depth=depth, heuristic=heuristic, verbose=True,
+                               time_budget=time_budget, workers=workers, turn_plies=turn_plies,
+                               opening_book=opening_book, endgame_solver=endgame_solver, pvs=pvs, ponder=ponder)
+    elif player_type == 'mcts':
+        return MCTSPlayer(problem, heuristic=heuristic, iterations=iterations, time_budget=time_budget,
+                          workers=workers, guided_rollouts=guided_rollouts)
     else:
         raise ValueError("Unsupported player type")
 
@@ -127,23 +140,44 @@ def build_test_subject_both_with_weighted_each_corners(problem: GameProblem, dep
         (AverageEuclideanToEachCornerHeuristic(), 0.4),
         (MaxManhattanToCornerHeuristic(), 0.2),
     ])
+    # The players evaluate the states for different sides, so they cannot reuse each other's evaluations - every
+    # player keeps a cache of its own
     return [
-        MinimaxAIPlayer(problem, 1, depth, heuristic, verbose=verbose, title='WeightedEachCorner'),
-        MinimaxAIPlayer(problem, 2, depth, heuristic, verbose=verbose, title='WeightedEachCorner')
+        MinimaxAIPlayer(problem, 1, depth, heuristic, verbose=verbose, title='WeightedEachCorner',
+                        eval_cache=EvalCache()),
+        MinimaxAIPlayer(problem, 2, depth, heuristic, verbose=verbose, title='WeightedEachCorner',
+                        eval_cache=EvalCache())
     ]
 
 
+# Game setup options of the command line (see main.py) and their defaults - callers may pass a namespace holding only
+# some of them, e.g. only the player types
+GAME_SETUP_DEFAULTS = {
+    'first_player': None, 'second_player': None,
+    'first_minimax_depth': 6, 'second_minimax_depth': 6,
+    'first_minimax_time': None, 'second_minimax_time': None,
+    'minimax_workers': 1, 'minimax_turn_plies': False, 'minimax_pvs': False, 'minimax_ponder': False,
+    'mcts_iterations': None, 'mcts_time': None, 'mcts_workers': 1, 'mcts_guided_rollouts': False,
+    'opening_book': None, 'endgame_pegs': None,
+}
+
+
 class GameController:
     def __init__(self, verbose=True, use_graphics=True, args=None):
         self.analytics = GameAnalytics()
         self.verbose = verbose  # Flag to print the state and action applied
         self.use_graphics = use_graphics  # Flag to use the GUI
-        self.problem = ChineseCheckers(triangle_size=3)  # Initialize the game problem
-        self.gui = Graphics() if use_graphics else None  # Initialize the GUI if the flag is set
+        self.problem = ChineseCheckers(triangle_size=3, bitboard=True)  # Initialize the game problem
+        self.gui = None
+        if use_graphics:
+            # Imported on demand - pygame is only loaded and a display opened when the GUI is requested
+            from game.Graphics import Graphics
+            self.gui = Graphics()  # Initialize the GUI
         self.players = []
         self.handle_game_setup(args)
 
     def handle_game_setup(self, args):
+        args = argparse.Namespace(**{**GAME_SETUP_DEFAULTS, **(vars(args) if args is not None else {})})
         default_heuristic = WeightedHeuristic([
             (SumOfPegsInCornerHeuristic(), 0.1),
             (AverageManhattanToCornerHeuristic(), 0.3),
@@ -158,15 +192,39 @@ class GameController:
             # self.players = build_test_subject_weighted_single_corner_vs_weighted_each_corners(self.problem, 6, 6, self.verbose)
             self.players = build_test_subject_both_with_weighted_each_corners(self.problem, 6, self.verbose)
         else:
+            opening_book = None
+            if args.opening_book is not None:
+                opening_book = OpeningBook(args.opening_book, self.problem.triangle_size, default_heuristic.tag())
             player1_depth = args.first_minimax_depth if args.first_player == 'minimax' else None
             player2_depth = args.second_minimax_depth if args.second_player == 'minimax' else None
             player1 = create_player(args.first_player, depth=player1_depth, gui=self.gui,
-                                    problem=self.problem, max_player=1, heuristic=default_heuristic)
+                                    problem=self.problem, max_player=1, heuristic=default_heuristic,
+                                    turn_plies=args.minimax_turn_plies, opening_book=opening_book,
+                                    endgame_pegs=args.endgame_pegs,
+                                    **self._search_options(args, args.first_player, args.first_minimax_time))
             player2 = create_player(args.second_player, depth=player2_depth, gui=self.gui,
-                                    problem=self.problem, max_player=2, heuristic=default_heuristic)
+                                    problem=self.problem, max_player=2, heuristic=default_heuristic,
+                                    turn_plies=args.minimax_turn_plies, opening_book=opening_book,
+                                    endgame_pegs=args.endgame_pegs,
+                                    **self._search_options(args, args.second_player, args.second_minimax_time))
             self.players.append(player1)
             self.players.append(player2)
 
+    @staticmethod
+    def _search_options(args, player_type, minimax_time) -> dict:
+        """
+        Picks the search budget options of a player from the command line arguments
+        :param args: the command line arguments
+        :param player_type: type of the player
+        :param minimax_time: time budget per move of the player if it is a minimax player
+        :return: keyword arguments of create_player
+        """
+        if player_type == 'mcts':
+            return {'time_budget': args.mcts_time, 'workers': args.mcts_workers, 'iterations': args.mcts_iterations,
+                    'guided_rollouts': args.mcts_guided_rollouts}
+        return {'time_budget': minimax_time, 'workers': args.minimax_workers, 'pvs': args.minimax_pvs,
+                'ponder': args.minimax_ponder}
+
     def game_loop(self):
         """
         Main game loop - takes care of the game state and the players' turns.
@@ -208,10 +266,12 @@ class GameController:
         # Print the game duration and the performance metrics of the players
         self.analytics.add_game_data(game_duration, turn, self.players, winner)
         self.analytics.print_game_data()
-        self.analytics.save_to_file()
+
+        # Release the worker processes of the players
+        for player in self.players:
+            player.close()
 
         # code used to plot the results
-        # self.analytics.load_from_file('game_data.json')
         # self.analytics.plot()
 
         play_beep()
@@ -1,50 +1,229 @@
 import json
-from collections import defaultdict
-
-import matplotlib.pyplot as plt
 import os
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional
 
 import numpy as np
 
+try:
+    import fcntl
+except ImportError:  # Windows - a single append write is not interleaved with other writers in practice
+    fcntl = None
+
 
 class GameAnalytics:
-    def __init__(self, filename='game_data.json'):
+    """
+    Append-only storage of the played games - a JSON Lines file with one game record per line.
+    Records are appended under an exclusive file lock, so that several processes (e.g. tournament workers) can write
+    to the same file, and read back one at a time without loading the whole history.
+    """
+    def __init__(self, filename='game_data.jsonl'):
+        """
+        :param filename: the JSON Lines file of the records
+        """
         self.filename = filename
-        if os.path.exists(self.filename):
-            self.data = self.load_from_file(self.filename)
-        else:
-            self.data = {'games': []}
-
-    def load_existing_data(self):
-        try:
-            with open(self.filename, 'r') as file:
-                self.data = json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            self.data = {'games': []}
+        self._last_game: Optional[dict] = None
 
-    def add_game_data(self, game_duration, total_turns, players, winner):
+    def migrate(self, json_filename: str):
+        """
+        Appends the games of a JSON file in the former {'games': [...]} format - the JSON file is left untouched
+        :param json_filename: the JSON file to be migrated
+        """
+        with open(json_filename, 'r') as file:
+            games = json.load(file)['games']
+        self.add_games(games)
+
+    @staticmethod
+    def game_record(game_duration, total_turns, players, winner) -> dict:
+        """
+        Builds the record of a finished game
+        :param game_duration: duration of the game in seconds
+        :param total_turns: number of actions applied
+        :param players: the players of the game, in seat order
+        :param winner: index of the winning player, 0 for an unfinished game
+        :return: the game record
+        """
         players_data = []
         for i, player in enumerate(players):
             player_dict = player.to_dict()
             player_dict['player_id'] = i + 1  # Assign player ID based on enumeration
             players_data.append(player_dict)
 
-        game_data = {
+        return {
             'game_duration': game_duration,
             'total_turns': total_turns,
             'players': players_data,
             'winner': winner
         }
-        self.data['games'].append(game_data)
-        self.save_to_file()
 
-    def print_game_data(self):
-        if not self.data['games']:
-            print("No games have been recorded.")
+    def add_game_data(self, game_duration, total_turns, players, winner):
+        self.add_games([self.game_record(game_duration, total_turns, players, winner)])
+
+    def add_games(self, games: List[dict]):
+        """
+        Appends game records to the file with a single locked write
+        :param games: list of game records
+        """
+        if not games:
             return
+        lines = ''.join(json.dumps(game) + '\n' for game in games)
+        with open(self.filename, 'a') as file:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                file.write(lines)
+                file.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(file, fcntl.LOCK_UN)
+        self._last_game = games[-1]
+
+    def iter_games(self) -> Iterator[dict]:
+        """
+        Reads the game records one at a time
+        :return: iterator over the records in the order they were written
+        """
+        yield from self.iter_file(self.filename)
+
+    @staticmethod
+    def iter_file(filename: str) -> Iterator[dict]:
+        """
+        Reads the game records of a JSON Lines file one at a time - a line cut short by an interrupted writer is
+        skipped
+        :param filename: the records file
+        :return: iterator over the records
+        """
+        if not os.path.exists(filename):
+            return
+        with open(filename, 'r') as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def last_game(self) -> Optional[dict]:
+        """
+        Returns the most recent game - the last one added by this object, otherwise the last record of the file
+        :return: the game record or None if no game has been recorded
+        """
+        if self._last_game is None:
+            for game in self.iter_games():
+                self._last_game = game
+        return self._last_game
+
+    @staticmethod
+    def load_from_file(filename):
+        """
+        Loads all the games of a file - JSON Lines or the former JSON format
+        :param filename: the file to be loaded
+        :return: dictionary with the list of games under 'games'
+        """
+        if filename.endswith('.json'):
+            with open(filename, 'r') as file:
+                return json.load(file)
+        return {'games': list(GameAnalytics.iter_file(filename))}
+
+    def search_statistics(self) -> Dict[str, dict]:
+        """
+        Aggregates the search statistics of the recorded games by player type
+        :return: player type -> summed counters, the share of cutoffs caused by the first searched action, the mean
+        effective branching factor of the searched moves and the split of the search time
+        """
+        summary: Dict[str, dict] = {}
+        for game in self.iter_games():
+            for player in game['players']:
+                if 'search_nodes' not in player:
+                    continue
+                totals = summary.setdefault(player['player_type'], {
+                    'games': 0, 'moves': 0, 'nodes': 0, 'nodes_per_depth': [], 'leaves': 0, 'cutoffs': 0,
+                    'cutoff_index_counts': [], 'history_pruned': 0, 'movegen_time': 0.0, 'eval_time': 0.0,
+                    'time': 0.0, 'researches': 0, 'aspiration_failures': 0, 'branching_factors': [],
+                })
+                totals['games'] += 1
+                totals['moves'] += len(player['search_moves'])
+                for key in ('nodes', 'leaves', 'cutoffs', 'history_pruned', 'movegen_time', 'eval_time'):
+                    totals[key] += player[f'search_{key}']
+                # Not recorded by the older games
+                for key in ('time', 'researches', 'aspiration_failures'):
+                    totals[key] += player.get(f'search_{key}', 0)
+                for key in ('nodes_per_depth', 'cutoff_index_counts'):
+                    counts = totals[key]
+                    for index, count in enumerate(player[f'search_{key}']):
+                        if index == len(counts):
+                            counts.append(0)
+                        counts[index] += count
+                totals['branching_factors'].extend(move['effective_branching_factor']
+                                                   for move in player['search_moves']
+                                                   if move['effective_branching_factor'] is not None)
+
+        for totals in summary.values():
+            branching_factors = totals.pop('branching_factors')
+            totals['effective_branching_factor'] = float(np.mean(branching_factors)) if branching_factors else None
+            totals['first_move_cutoff_rate'] = \
+                totals['cutoff_index_counts'][0] / totals['cutoffs'] if totals['cutoffs'] else None
+        return summary
+
+    def search_comparison(self, baseline: str = 'alphabeta') -> Dict[int, Dict[str, dict]]:
+        """
+        Compares the search algorithms of the recorded games at equal search depth
+        :param baseline: the algorithm the others are compared to - the plain alpha-beta search by default
+        :return: max depth -> search algorithm -> searched moves, nodes and seconds per searched move and, when the
+        baseline was played at the same depth, the ratios of the nodes and the seconds to the baseline's
+        """
+        comparison: Dict[int, Dict[str, dict]] = {}
+        for game in self.iter_games():
+            for player in game['players']:
+                if 'search_nodes' not in player:
+                    continue
+                # Games recorded before the algorithms were told apart were searched by the plain alpha-beta search
+                algorithm = player.get('search_algorithm', 'alphabeta')
+                totals = comparison.setdefault(player['max_depth'], {}).setdefault(algorithm, {
+                    'moves': 0, 'nodes': 0, 'time': 0.0,
+                })
+                totals['moves'] += len(player['search_moves'])
+                totals['nodes'] += player['search_nodes']
+                totals['time'] += player.get('search_time', 0.0)
+
+        for algorithms in comparison.values():
+            for totals in algorithms.values():
+                moves = totals['moves']
+                totals['nodes_per_move'] = totals['nodes'] / moves if moves else None
+                totals['time_per_move'] = totals['time'] / moves if moves else None
+            reference = algorithms.get(baseline)
+            if reference is None or not reference['nodes_per_move'] or not reference['time_per_move']:
+                continue
+            for totals in algorithms.values():
+                if totals['nodes_per_move'] is None:
+                    continue
+                totals['node_ratio'] = totals['nodes_per_move'] / reference['nodes_per_move']
+                totals['time_ratio'] = totals['time_per_move'] / reference['time_per_move']
+        return comparison
+
+    def print_search_comparison(self, baseline: str = 'alphabeta'):
+        """
+        Prints the comparison of the search algorithms of the recorded games
+        :param baseline: the algorithm the others are compared to
+        """
+        for depth, algorithms in sorted(self.search_comparison(baseline).items()):
+            for algorithm, totals in sorted(algorithms.items()):
+                if not totals['moves']:
+                    continue
+                line = (f"Depth {depth} {algorithm}: {totals['moves']} moves "
+                        f"| {totals['nodes_per_move']:0.1f} nodes/move | {totals['time_per_move']:0.4f} s/move")
+                if 'node_ratio' in totals and algorithm != baseline:
+                    line += f" | nodes x{totals['node_ratio']:0.3f} | time x{totals['time_ratio']:0.3f} vs {baseline}"
+                print(line)
 
+    def print_game_data(self):
         # Access the most recent game's data
-        game = self.data['games'][-1]
+        game = self.last_game()
+        if game is None:
+            print("No games have been recorded.")
+            return
 
         print('Most Recent Game:')
         print(f'Winner: Player {game["winner"]} ({game["players"][game["winner"] - 1]["player_type"]})')
@@ -56,22 +235,46 @@ class GameAnalytics:
             print(f"Player {player_data['player_id']} move count: {player_data['move_count']}")
             if 'expanded_states' in player_data:
                 print(f"Player {player_data['player_id']} expanded states: {player_data['expanded_states']}")
+            if 'tt_hit_rate' in player_data:
+                print(f"Player {player_data['player_id']} TT hit rate: {player_data['tt_hit_rate']:0.4f} "
+                      f"| TT entries: {player_data['tt_entries']}")
+            if 'eval_cache_hit_rate' in player_data:
+                print(f"Player {player_data['player_id']} eval cache hit rate: "
+                      f"{player_data['eval_cache_hit_rate']:0.4f} | hits: {player_data['eval_cache_hits']} "
+                      f"| misses: {player_data['eval_cache_misses']}")
+            if 'book_hits' in player_data:
+                print(f"Player {player_data['player_id']} opening book hits: {player_data['book_hits']}")
+            if 'endgame_moves' in player_data:
+                print(f"Player {player_data['player_id']} endgame solver moves: {player_data['endgame_moves']} "
+                      f"| solved: {player_data['endgame_solved']} | failed: {player_data['endgame_failed']} "
+                      f"| nodes: {player_data['endgame_nodes']}")
+            if 'ponder_hits' in player_data:
+                print(f"Player {player_data['player_id']} ponder hits: {player_data['ponder_hits']} "
+                      f"| pondered positions: {player_data['pondered_positions']} "
+                      f"| ponder nodes: {player_data['ponder_nodes']}")
+            if player_data.get('search_nodes'):
+                print(f"Player {player_data['player_id']} search nodes: {player_data['search_nodes']} "
+                      f"| per depth: {player_data['search_nodes_per_depth']} | leaves: {player_data['search_leaves']}")
+                print(f"Player {player_data['player_id']} cutoffs: {player_data['search_cutoffs']} "
+                      f"| first move cutoff rate: {player_data['search_first_move_cutoff_rate'] or 0:0.4f} "
+                      f"| history pruned: {player_data['search_history_pruned']} "
+                      f"| EBF: {player_data['search_effective_branching_factor'] or 0:0.2f}")
+                print(f"Player {player_data['player_id']} move generation time: "
+                      f"{player_data['search_movegen_time']:0.4f} | evaluation time: "
+                      f"{player_data['search_eval_time']:0.4f}")
+            if player_data.get('search_algorithm') == 'pvs':
+                print(f"Player {player_data['player_id']} PVS re-searches: {player_data['search_researches']} "
+                      f"| aspiration failures: {player_data['search_aspiration_failures']}")
         print('\n')
 
-    def save_to_file(self):
-        with open(self.filename, 'w') as file:
-            json.dump(self.data, file, indent=4)
-
-    @staticmethod
-    def load_from_file(filename):
-        with open(filename, 'r') as file:
-            return json.load(file)
-
     def plot(self):
+        # Imported on demand - matplotlib is slow to load and only needed for plotting
+        import matplotlib.pyplot as plt
+
         expanded_states_per_depth = defaultdict(list)
         average_time_per_depth = defaultdict(list)
 
-        for game in self.data['games']:
+        for game in self.iter_games():
             for player in game['players']:
                 depth = player['max_depth']
                 expanded_states_per_depth[depth].append(player['expanded_states'])
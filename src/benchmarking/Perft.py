@@ -0,0 +1,281 @@
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from game.BitBoard import BitBoard
+from game.Board import Board
+from game.State import State
+from game_problem.ChineseCheckers import ChineseCheckers
+from game_problem.Heuristic import AverageManhattanToCornerHeuristic, AverageManhattanToEachCornerHeuristic, \
+    AverageEuclideanToCornerHeuristic, AverageEuclideanToEachCornerHeuristic, MaxManhattanToCornerHeuristic, \
+    SumOfPegsInCornerHeuristic, WeightedHeuristic, Heuristic
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+
+"""
+Perft-style benchmark of the game engine - counts the nodes of the full step tree to a fixed depth from recorded
+positions and measures the throughput (calls per second) of actions, result, terminal_test and of every heuristic.
+The node counts are a regression check - a faster move generator must reproduce them exactly.
+Optionally, a self-play game of the minimax players is timed with and without the batched leaf evaluation.
+"""
+
+# Recorded positions of the 7x7 board (triangle size 3) - (board matrix, player to move), all at the start of a turn
+POSITIONS: Dict[str, tuple] = {
+    'initial': (None, 1),
+    'opening': ([
+        [0, 0, 0, 0, 2, 2, 2],
+        [0, 0, 0, 0, 0, 2, 0],
+        [0, 0, 0, 0, 0, 0, 2],
+        [0, 0, 0, 0, 0, 0, 2],
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 0, 1, 1, 0, 0, 0],
+        [1, 1, 1, 0, 0, 0, 0],
+    ], 1),
+    'midgame': ([
+        [0, 0, 0, 0, 2, 0, 2],
+        [0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 2, 2],
+        [0, 0, 0, 0, 2, 2, 0],
+        [1, 0, 0, 1, 0, 0, 0],
+        [0, 0, 1, 1, 0, 0, 0],
+        [1, 0, 1, 0, 0, 0, 0],
+    ], 1),
+    'contact': ([
+        [0, 0, 0, 0, 0, 0, 2],
+        [0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 1, 0, 2, 0, 0],
+        [0, 0, 0, 2, 2, 0, 0],
+        [1, 0, 0, 2, 0, 0, 2],
+        [0, 1, 1, 0, 0, 0, 0],
+        [1, 1, 0, 0, 0, 0, 0],
+    ], 2),
+}
+
+# Node counts of the step tree at depth 1, 2, 3, ... - the reference any move generator must reproduce
+PERFT_EXPECTED: Dict[str, List[int]] = {
+    'initial': [10, 68, 640, 7060, 80612],
+    'opening': [22, 299, 4812, 70418, 1171556],
+    'midgame': [27, 608, 13127, 287831, 6295710],
+    'contact': [30, 591, 13263, 248586, 5774486],
+}
+
+HEURISTICS: Dict[str, Callable[[], Heuristic]] = {
+    'AverageManhattanToCorner': AverageManhattanToCornerHeuristic,
+    'AverageManhattanToEachCorner': AverageManhattanToEachCornerHeuristic,
+    'AverageEuclideanToCorner': AverageEuclideanToCornerHeuristic,
+    'AverageEuclideanToEachCorner': AverageEuclideanToEachCornerHeuristic,
+    'MaxManhattanToCorner': MaxManhattanToCornerHeuristic,
+    'SumOfPegsInCorner': SumOfPegsInCornerHeuristic,
+    'Weighted': lambda: WeightedHeuristic([
+        (SumOfPegsInCornerHeuristic(), 0.1),
+        (AverageManhattanToEachCornerHeuristic(), 0.3),
+        (AverageEuclideanToEachCornerHeuristic(), 0.4),
+        (MaxManhattanToCornerHeuristic(), 0.2),
+    ]),
+}
+
+
+def position_state(name: str, bitboard: bool = True) -> State:
+    """
+    Builds the state of a recorded position
+    :param name: name of the position in POSITIONS
+    :param bitboard: flag to use the bitboard backend
+    :return: the state
+    """
+    matrix, player = POSITIONS[name]
+    if matrix is None:
+        return ChineseCheckers(3, bitboard=bitboard).initial_state()
+    board = Board(3, matrix=np.array(matrix))
+    return State(BitBoard.from_board(board) if bitboard else board, player)
+
+
+def perft(problem: ChineseCheckers, state: State, depth: int) -> int:
+    """
+    Counts the nodes of the step tree at the given depth - terminal states have no children
+    :param problem: the game problem
+    :param state: the root state
+    :param depth: depth of the counted nodes
+    :return: number of nodes
+    """
+    if depth == 0:
+        return 1
+    if problem.terminal_test(state):
+        return 0
+    actions = problem.actions(state)
+    if depth == 1:
+        return sum(1 for _ in actions)
+    return sum(perft(problem, problem.result(state, action), depth - 1) for action in actions)
+
+
+def check_perft(depth: int, bitboard: bool = True) -> Dict[str, List[int]]:
+    """
+    Counts the nodes of every recorded position to the given depth and compares them to the reference counts
+    :param depth: maximal depth
+    :param bitboard: flag to use the bitboard backend
+    :return: position name -> node counts at depth 1, 2, ... depth
+    :raises AssertionError: when a count differs from the reference
+    """
+    problem = ChineseCheckers(3, bitboard=bitboard)
+    counts = {}
+    for name in POSITIONS:
+        state = position_state(name, bitboard)
+        counts[name] = [perft(problem, state, d) for d in range(1, depth + 1)]
+        expected = PERFT_EXPECTED[name][:depth]
+        if counts[name][:len(expected)] != expected:
+            raise AssertionError(f'Perft mismatch for {name}: {counts[name]} != {expected}')
+    return counts
+
+
+def workload(problem: ChineseCheckers, states: Sequence[State], depth: int = 2) -> List[State]:
+    """
+    Collects every state of the step trees of the given states up to a depth
+    :param problem: the game problem
+    :param states: the root states
+    :param depth: depth of the collected trees
+    :return: list of states
+    """
+    collected = []
+    frontier = list(states)
+    for _ in range(depth + 1):
+        collected.extend(frontier)
+        frontier = [problem.result(state, action) for state in frontier for action in problem.actions(state)]
+    return collected
+
+
+def throughput(function: Callable, arguments: Sequence, min_time: float = 0.2) -> float:
+    """
+    Measures the calls per second of a function over a list of arguments - repeats the whole list until the minimal
+    time is reached (at least once)
+    :param function: the measured function of one argument
+    :param arguments: the arguments
+    :param min_time: minimal measured time in seconds
+    :return: calls per second
+    """
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for argument in arguments:
+            function(argument)
+        calls += len(arguments)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls / elapsed
+
+
+def benchmark(states: Sequence[State], problem: ChineseCheckers, min_time: float = 0.2) -> Dict[str, float]:
+    """
+    Measures the throughput of the engine functions over a set of states
+    :param states: the benchmarked states
+    :param problem: the game problem
+    :param min_time: minimal measured time per function in seconds
+    :return: function name -> calls per second
+    """
+    pairs = [(state, action) for state in states for action in problem.actions(state)]
+
+    def terminal_test(state: State):
+        # The status is cached on the state - measure its computation, not the cache
+        state.reset_terminal_status()
+        return problem.terminal_test(state)
+
+    results = {
+        'actions': throughput(lambda state: list(problem.actions(state)), states, min_time),
+        'result': throughput(lambda pair: problem.result(*pair), pairs, min_time),
+        'terminal_test': throughput(terminal_test, states, min_time),
+    }
+    for name, factory in HEURISTICS.items():
+        heuristic = factory()
+        results[f'eval.{name}'] = throughput(lambda state: heuristic.eval(state, 1), states, min_time)
+    return results
+
+
+def search_benchmark(depth: int, plies: int = 40, bitboard: bool = True, repeats: int = 3) -> Dict[str, dict]:
+    """
+    Times a self-play game of two minimax players from the initial position - with the plain search and with the
+    batched evaluation of the frontier nodes. Both searches decide the same actions, so they play the same game.
+    :param depth: search depth of the players
+    :param plies: number of played steps
+    :param bitboard: flag to use the bitboard backend
+    :param repeats: number of games per search - the fastest one is reported
+    :return: search name -> seconds of the game, evaluated leaves and played steps
+    """
+    problem = ChineseCheckers(3, bitboard=bitboard)
+    results = {}
+    for name, batch_eval in (('plain', False), ('batched', True)):
+        best = None
+        for _ in range(repeats):
+            players = {player: MinimaxAIPlayer(problem, player, depth, HEURISTICS['Weighted'](), verbose=False,
+                                               batch_eval=batch_eval)
+                       for player in (1, 2)}
+            state = problem.initial_state()
+            steps = 0
+            start = time.perf_counter()
+            while steps < plies and not problem.terminal_test(state):
+                state = problem.result(state, players[problem.player(state)].get_action(problem, state))
+                steps += 1
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best['seconds']:
+                leaves = sum(player.evaluated_states_count for player in players.values())
+                best = {'seconds': elapsed, 'leaves': leaves, 'steps': steps}
+        results[name] = best
+    return results
+
+
+def environment() -> dict:
+    """
+    Describes the commit and the environment the benchmark runs in
+    :return: dictionary of the environment
+    """
+    def git(*args) -> Optional[str]:
+        try:
+            return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        'commit': git('rev-parse', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
+
+
+def run(depth: int = 3, bitboard: bool = True, min_time: float = 0.2, output: Optional[str] = None,
+        search_depth: Optional[int] = None, search_plies: int = 40) -> dict:
+    """
+    Runs the perft regression check and the throughput benchmark
+    :param depth: perft depth
+    :param bitboard: flag to use the bitboard backend
+    :param min_time: minimal measured time per function in seconds
+    :param output: JSON file the report is written to - None to skip writing
+    :param search_depth: search depth of the timed self-play games - None to skip them
+    :param search_plies: number of steps of the timed self-play games
+    :return: the report
+    """
+    problem = ChineseCheckers(3, bitboard=bitboard)
+    start = time.perf_counter()
+    counts = check_perft(depth, bitboard)
+    perft_time = time.perf_counter() - start
+    nodes = sum(sum(node_counts) for node_counts in counts.values())
+
+    states = workload(problem, [position_state(name, bitboard) for name in POSITIONS], depth=1)
+    report = {
+        'environment': environment(),
+        'backend': 'bitboard' if bitboard else 'matrix',
+        'perft': {'depth': depth, 'counts': counts, 'nodes': nodes, 'nodes_per_second': nodes / perft_time},
+        'calls_per_second': benchmark(states, problem, min_time),
+    }
+    if search_depth is not None:
+        report['search'] = {'depth': search_depth, 'plies': search_plies,
+                            'games': search_benchmark(search_depth, search_plies, bitboard)}
+    if output is not None:
+        with open(output, 'w') as file:
+            json.dump(report, file, indent=4)
+    return report
@@ -0,0 +1,217 @@
+import itertools
+import multiprocessing as mp
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from benchmarking.GameAnalytics import GameAnalytics
+from game_problem.ChineseCheckers import ChineseCheckers
+from game_problem.Heuristic import WeightedHeuristic, SumOfPegsInCornerHeuristic, AverageManhattanToCornerHeuristic, \
+    AverageEuclideanToCornerHeuristic, MaxManhattanToCornerHeuristic, AverageEuclideanToEachCornerHeuristic, \
+    AverageManhattanToEachCornerHeuristic, Heuristic
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+
+"""
+Headless tournament between minimax players - plays many games in parallel worker processes without the GUI
+(no pygame import). Every worker appends the record of a game to the analytics file as soon as the game is over.
+"""
+
+# Heuristics that can be entered in a tournament by name - the weighted heuristics of the build_test_subject_* setups
+HEURISTICS: Dict[str, Callable[[], Heuristic]] = {
+    'Weighted': lambda: WeightedHeuristic([
+        (SumOfPegsInCornerHeuristic(), 0.1),
+        (AverageManhattanToCornerHeuristic(), 0.3),
+        (AverageEuclideanToCornerHeuristic(), 0.4),
+        (MaxManhattanToCornerHeuristic(), 0.2),
+    ]),
+    'WeightedEachCorner': lambda: WeightedHeuristic([
+        (SumOfPegsInCornerHeuristic(), 0.1),
+        (AverageManhattanToEachCornerHeuristic(), 0.3),
+        (AverageEuclideanToEachCornerHeuristic(), 0.4),
+        (MaxManhattanToCornerHeuristic(), 0.2),
+    ]),
+    'AverageEuclidean': lambda: WeightedHeuristic([
+        (SumOfPegsInCornerHeuristic(), 0.2),
+        (AverageEuclideanToCornerHeuristic(), 0.8),
+    ]),
+    'AverageEuclideanToEachCorner': lambda: WeightedHeuristic([
+        (SumOfPegsInCornerHeuristic(), 0.5),
+        (AverageEuclideanToEachCornerHeuristic(), 0.5),
+    ]),
+    'AverageManhattan': lambda: WeightedHeuristic([
+        (SumOfPegsInCornerHeuristic(), 0.2),
+        (AverageManhattanToCornerHeuristic(), 0.8),
+    ]),
+    'AverageManhattanToEachCorner': lambda: WeightedHeuristic([
+        (SumOfPegsInCornerHeuristic(), 0.2),
+        (AverageManhattanToEachCornerHeuristic(), 0.8),
+    ]),
+}
+
+# Search algorithms of the minimax players - the plain alpha-beta search and the principal variation search
+SEARCH_ALGORITHMS = ('alphabeta', 'pvs')
+
+
+@dataclass(frozen=True)
+class PlayerSpec:
+    """
+    Class that represents a minimax player entered in a tournament
+    """
+    heuristic: str  # name of the heuristic in HEURISTICS
+    depth: int  # maximal search depth
+    algorithm: str = 'alphabeta'  # search algorithm in SEARCH_ALGORITHMS
+
+    @property
+    def title(self) -> str:
+        title = f'{self.heuristic}@{self.depth}'
+        return title if self.algorithm == 'alphabeta' else f'{title}/{self.algorithm}'
+
+
+@dataclass(frozen=True)
+class Matchup:
+    """
+    Class that represents an ordered pairing - the first player takes the first seat
+    """
+    first: PlayerSpec
+    second: PlayerSpec
+
+    @property
+    def label(self) -> str:
+        return f'{self.first.title} vs {self.second.title}'
+
+
+def build_matchups(heuristics: Sequence[str], depths: Sequence[int], both_seats: bool = True,
+                   algorithms: Sequence[str] = ('alphabeta',)) -> List[Matchup]:
+    """
+    Pairs every (heuristic, depth, search algorithm) player with every other one
+    :param heuristics: names of the heuristics
+    :param depths: search depths
+    :param both_seats: flag indicating if every pairing is also played with the seats swapped
+    :param algorithms: search algorithms
+    :return: list of matchups
+    """
+    for name in heuristics:
+        if name not in HEURISTICS:
+            raise ValueError(f'Unknown heuristic: {name}')
+    for algorithm in algorithms:
+        if algorithm not in SEARCH_ALGORITHMS:
+            raise ValueError(f'Unknown search algorithm: {algorithm}')
+    specs = [PlayerSpec(name, depth, algorithm)
+             for name, depth, algorithm in itertools.product(heuristics, depths, algorithms)]
+    pairs = itertools.permutations(specs, 2) if both_seats else itertools.combinations(specs, 2)
+    return [Matchup(first, second) for first, second in pairs]
+
+
+def play_game(matchup: Matchup, triangle_size: int = 3, max_turns: int = 1000, opening_plies: int = 0,
+              seed: Optional[int] = None) -> dict:
+    """
+    Plays a single headless game of a matchup
+    :param matchup: the players of the game
+    :param triangle_size: size of the corner triangles of the board
+    :param max_turns: number of applied actions after which the game is stopped as unfinished (winner 0)
+    :param opening_plies: number of random actions played before the players take over - games between
+    deterministic players only differ by their openings
+    :param seed: seed of the random opening
+    :return: the game record, in the format of GameAnalytics
+    """
+    problem = ChineseCheckers(triangle_size, bitboard=True)
+    players = [
+        MinimaxAIPlayer(problem, seat + 1, spec.depth, HEURISTICS[spec.heuristic](), verbose=False, title=spec.title,
+                        pvs=spec.algorithm == 'pvs')
+        for seat, spec in enumerate((matchup.first, matchup.second))
+    ]
+    rng = random.Random(seed)
+
+    state = problem.initial_state()
+    game_start_timer = time.perf_counter()
+    turn = 0
+    while not problem.terminal_test(state) and turn < max_turns:
+        if turn < opening_plies:
+            action = rng.choice(list(problem.actions(state)))
+        else:
+            action = players[state.player - 1].get_action(problem, state)
+        state = problem.result(state, action)
+        turn += 1
+    game_duration = time.perf_counter() - game_start_timer
+
+    if problem.terminal_test(state):
+        winner = state.player if problem.utility(state, state.player) >= 0 else len(players) + 1 - state.player
+    else:
+        winner = 0
+    for player in players:
+        player.close()
+
+    record = GameAnalytics.game_record(game_duration, turn, players, winner)
+    record['matchup'] = matchup.label
+    record['seed'] = seed
+    return record
+
+
+def _play_task(task: Tuple[int, Matchup, dict, Optional[str]]) -> Tuple[int, dict]:
+    """
+    Plays a game of the tournament in a worker process
+    :param task: tuple of the game index, the matchup, the keyword arguments of play_game and the analytics file the
+    record is appended to (None to skip storing)
+    :return: tuple of the game index and the game record
+    """
+    index, matchup, kwargs, filename = task
+    record = play_game(matchup, **kwargs)
+    if filename is not None:
+        GameAnalytics(filename).add_games([record])
+    return index, record
+
+
+def run_tournament(matchups: Sequence[Matchup], games: int, workers: int = 1, triangle_size: int = 3,
+                   max_turns: int = 1000, opening_plies: int = 0, seed: int = 0,
+                   analytics: Optional[GameAnalytics] = None, verbose: bool = True) -> List[dict]:
+    """
+    Plays every matchup the given number of times across a pool of worker processes
+    :param matchups: the matchups to be played
+    :param games: number of games per matchup
+    :param workers: number of worker processes, 1 plays the games in the current process
+    :param triangle_size: size of the corner triangles of the board
+    :param max_turns: number of applied actions after which a game is stopped as unfinished
+    :param opening_plies: number of random actions opening each game
+    :param seed: base seed - game i of the tournament opens with seed + i
+    :param analytics: analytics the game records are appended to as the games finish - None to skip storing
+    :param verbose: flag to print the progress
+    :return: the game records in matchup order
+    """
+    filename = analytics.filename if analytics is not None else None
+    tasks = []
+    for matchup in matchups:
+        for _ in range(games):
+            index = len(tasks)
+            kwargs = {'triangle_size': triangle_size, 'max_turns': max_turns, 'opening_plies': opening_plies,
+                      'seed': seed + index}
+            tasks.append((index, matchup, kwargs, filename))
+
+    records: List[Optional[dict]] = [None] * len(tasks)
+    if workers > 1:
+        with mp.Pool(processes=workers) as pool:
+            results = pool.imap_unordered(_play_task, tasks)
+            for finished, (index, record) in enumerate(results, start=1):
+                records[index] = record
+                if verbose:
+                    print(f'[{finished}/{len(tasks)}] {record["matchup"]}: winner {record["winner"]}')
+    else:
+        for finished, task in enumerate(tasks, start=1):
+            index, record = _play_task(task)
+            records[index] = record
+            if verbose:
+                print(f'[{finished}/{len(tasks)}] {record["matchup"]}: winner {record["winner"]}')
+    return records
+
+
+def summarize(records: Sequence[dict]) -> Dict[str, Tuple[int, int, int]]:
+    """
+    Counts the results of every matchup
+    :param records: game records of a tournament
+    :return: matchup label -> (first seat wins, second seat wins, unfinished games)
+    """
+    summary: Dict[str, List[int]] = {}
+    for record in records:
+        counts = summary.setdefault(record['matchup'], [0, 0, 0])
+        counts[record['winner'] - 1 if record['winner'] else 2] += 1
+    return {label: (counts[0], counts[1], counts[2]) for label, counts in summary.items()}
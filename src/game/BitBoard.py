@@ -0,0 +1,311 @@
+from functools import cache
+from typing import Tuple, List, Iterable, Iterator, Optional
+
+import numpy as np
+
+from game.Board import Board, bot_left_corner_coords, top_right_corner_coords
+
+
+@cache
+def cell_coords(board_size: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    Returns the coordinate pair of every bit index of a board of the given size.
+    :return: tuple of coordinate pairs indexed by bit position
+    """
+    return tuple((i, j) for i in range(board_size) for j in range(board_size))
+
+
+@cache
+def corner_mask(triangle_size: int, board_size: int, corner: str) -> int:
+    """
+    Returns the bit mask of the cells of a corner triangle.
+    :param corner: string indicating the corner ('bottom' or 'top')
+    :return: integer mask with one bit set per corner cell
+    """
+    if corner == 'bottom':
+        np_corner = bot_left_corner_coords(triangle_size, board_size)
+    else:  # corner == 'top'
+        np_corner = top_right_corner_coords(triangle_size, board_size)
+
+    mask = 0
+    for i, j in np_corner:
+        mask |= 1 << (int(i) * board_size + int(j))
+    return mask
+
+
+class BitBoard:
+    """
+    Immutable board of the game stored as one integer bit mask per player.
+    Bit i * board_size + j is set in masks[p - 1] when player p has a peg on cell (i, j).
+    """
+    __slots__ = ('triangle_size', 'board_size', 'masks', '_matrix')
+
+    def __init__(self, triangle_size: int, initialised=True, matrix: np.ndarray = None,
+                 masks: Optional[Tuple[int, int]] = None):
+        self.triangle_size = triangle_size
+        self.board_size = triangle_size * 2 + 1
+        self._matrix = None
+
+        if masks is not None:
+            self.masks = masks
+        elif matrix is not None:
+            assert matrix.shape == (self.board_size, self.board_size)
+            self.masks = self._masks_from_matrix(matrix)
+        elif initialised:
+            self.masks = (corner_mask(self.triangle_size, self.board_size, 'bottom'),
+                          corner_mask(self.triangle_size, self.board_size, 'top'))
+        else:
+            self.masks = (0, 0)
+
+    @staticmethod
+    def _masks_from_matrix(matrix: np.ndarray) -> Tuple[int, int]:
+        """
+        Packs a board matrix into the pair of player masks.
+        :param matrix: the square matrix of cell values
+        :return: tuple of player 1 and player 2 masks
+        """
+        masks = [0, 0]
+        for bit, value in enumerate(matrix.flat):
+            if value:
+                masks[int(value) - 1] |= 1 << bit
+        return masks[0], masks[1]
+
+    @classmethod
+    def from_board(cls, board: Board) -> 'BitBoard':
+        """
+        Builds the bitboard equivalent of a matrix board.
+        :param board: the matrix board to be converted
+        :return: the bitboard with the same pegs
+        """
+        return cls(board.triangle_size, matrix=board.matrix)
+
+    def to_board(self) -> Board:
+        """
+        Builds the matrix board equivalent of this bitboard.
+        :return: a new (mutable) matrix board
+        """
+        return Board(self.triangle_size, matrix=np.array(self.matrix))
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """
+        Read-only matrix view of the board, built on first access - used by the GUI and for printing.
+        :return: square matrix of cell values
+        """
+        if self._matrix is None:
+            matrix = np.zeros((self.board_size, self.board_size), dtype=int)
+            for player, mask in enumerate(self.masks, start=1):
+                for i, j in self._iter_mask(mask):
+                    matrix[i, j] = player
+            matrix.flags.writeable = False
+            self._matrix = matrix
+        return self._matrix
+
+    @property
+    def occupied(self) -> int:
+        """
+        Mask of all occupied cells.
+        """
+        return self.masks[0] | self.masks[1]
+
+    def bit(self, coords: Tuple[int, int]) -> int:
+        """
+        Returns the single-bit mask of a cell.
+        :param coords: the coordinate pair of the cell
+        :return: integer mask with the bit of the cell set
+        """
+        # int() - numpy coordinates would overflow for boards wider than 64 cells
+        return 1 << int(coords[0] * self.board_size + coords[1])
+
+    def _iter_mask(self, mask: int) -> Iterator[Tuple[int, int]]:
+        """
+        Iterates the coordinate pairs of the bits set in a mask in row-major order.
+        :param mask: integer mask
+        """
+        coords = cell_coords(self.board_size)
+        while mask:
+            low = mask & -mask
+            yield coords[low.bit_length() - 1]
+            mask ^= low
+
+    def cells(self, player: int) -> Iterator[Tuple[int, int]]:
+        """
+        Iterates the cells holding pegs of a player in row-major order.
+        :param player: player index
+        :return: iterator of coordinate pairs
+        """
+        return self._iter_mask(self.masks[player - 1])
+
+    def pegs(self, player: int) -> np.ndarray:
+        """
+        Returns the coordinates of the pegs of a player.
+        :param player: player index
+        :return: array of coordinate pairs with shape (pegs, 2)
+        """
+        return np.array(list(self.cells(player)), dtype=int).reshape(-1, 2)
+
+    def adjacent_cells(self, src: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Returns a list of diamond-adjacent cells to the specific cell.
+        :param src: the coordinate pair of the source cell
+        :return: list of diamond-adjacent cell coordinate pairs
+        """
+        for i in range(-1, 2):
+            for j in range(-1, 2):
+                if i == -1 and j == 1 or i == 1 and j == -1:
+                    continue
+                dest = src[0] + i, src[1] + j
+                if self.within_bounds(dest):
+                    yield dest
+
+    def count_in_corner(self, corner: str, value: int) -> int:
+        """
+        Counts the pegs of a specific value inside a corner.
+        :param corner: string indicating the corner to be checked ('bottom' or 'top')
+        :param value: specific value to be counted
+        :return: number of corner cells holding the value
+        """
+        return (self.masks[value - 1] & corner_mask(self.triangle_size, self.board_size, corner)).bit_count()
+
+    def is_cornered_pegs(self, corner: str) -> bool:
+        """
+        Checks if the corner is filled with pegs of any type.
+        :param corner: string indicating the corner to be checked ('bottom' or 'top')
+        :return: boolean value
+        """
+        mask = corner_mask(self.triangle_size, self.board_size, corner)
+        return self.occupied & mask == mask
+
+    def is_cornered_with(self, corner: str, value: int) -> bool:
+        """
+        Checks if the corner is filled with pegs of a specific value.
+        :param corner: string indicating the corner to be checked ('bottom' or 'top')
+        :param value: specific value to be checked for in the board
+        :return: boolean value
+        """
+        mask = corner_mask(self.triangle_size, self.board_size, corner)
+        return self.masks[value - 1] & mask == mask
+
+    def is_top_right_terminal(self) -> bool:
+        """
+        Checks if the top-right corner is terminal for player 1.
+        :return: boolean value
+        """
+        return self.is_cornered_pegs('top') and not self.is_cornered_with('top', 2)
+
+    def is_bot_left_terminal(self) -> bool:
+        """
+        Checks if the bottom-left corner is terminal for player 2.
+        :return: boolean value
+        """
+        return self.is_cornered_pegs('bottom') and not self.is_cornered_with('bottom', 1)
+
+    def terminal_status(self) -> int:
+        """
+        Checks both goal corners at once against the precomputed corner masks.
+        :return: 1 if the top-right corner is terminal (player 1 wins), 2 if the bottom-left corner is terminal
+        (player 2 wins), 0 otherwise
+        """
+        occupied = self.masks[0] | self.masks[1]
+        top = corner_mask(self.triangle_size, self.board_size, 'top')
+        if occupied & top == top and self.masks[1] & top != top:
+            return 1
+        bottom = corner_mask(self.triangle_size, self.board_size, 'bottom')
+        if occupied & bottom == bottom and self.masks[0] & bottom != bottom:
+            return 2
+        return 0
+
+    def moved(self, initial_pos: Tuple[int, int], path: Tuple[int, int]) -> 'BitBoard':
+        """
+        Returns a new board with the contents of the initial position and the destination swapped.
+        :param initial_pos: the initial position of the peg
+        :param path: the destination position of the peg
+        :return: the new board
+        """
+        if not self.within_bounds(path):
+            raise Exception(f'Coordinates out of bound: {path}')
+
+        swap = self.bit(initial_pos) | self.bit(path)
+        mask1, mask2 = self.masks
+        if mask1 & swap and mask1 & swap != swap:
+            mask1 ^= swap
+        if mask2 & swap and mask2 & swap != swap:
+            mask2 ^= swap
+        return BitBoard(self.triangle_size, masks=(mask1, mask2))
+
+    def with_pegs(self, player_id: int, destinations: Iterable[Tuple[int, int]]) -> 'BitBoard':
+        """
+        Returns a new board with pegs of a specific player placed on the destinations.
+        :param player_id: player index
+        :param destinations: iterable of destination coordinate pairs
+        :return: the new board
+        """
+        masks = list(self.masks)
+        for dest in destinations:
+            bit = self.bit(dest)
+            masks[0] &= ~bit
+            masks[1] &= ~bit
+            masks[player_id - 1] |= bit
+        return BitBoard(self.triangle_size, masks=(masks[0], masks[1]))
+
+    def within_bounds(self, coords: Tuple[int, int]) -> bool:
+        """
+        Checks if the coordinates are within the bounds of the board.
+        :param coords: the coordinate pair to be checked
+        :return: boolean value indicating if the coordinates are within the bounds of the board
+        """
+        return 0 <= coords[0] < self.board_size and 0 <= coords[1] < self.board_size
+
+    def is_empty(self, coords: Tuple[int, int]) -> bool:
+        """
+        Checks if a cell holds no peg.
+        :param coords: the coordinate pair of the cell
+        :return: boolean value
+        """
+        return not (self.masks[0] | self.masks[1]) >> int(coords[0] * self.board_size + coords[1]) & 1
+
+    def __getitem__(self, coords: Tuple[int, int]) -> int:
+        bit = self.bit(coords)
+        if self.masks[0] & bit:
+            return 1
+        if self.masks[1] & bit:
+            return 2
+        return 0
+
+    def __str__(self):
+        separator = '  '
+        text = ' ' + separator + separator.join((str(i) for i in range(self.board_size)))
+        for i, row in enumerate(self.matrix):
+            text += '\n' + str(i) + separator + separator.join(str(x) if x else '.' for x in row)
+        return text
+
+    def __eq__(self, other):
+        if isinstance(other, BitBoard):
+            return self.board_size == other.board_size and self.masks == other.masks
+        return np.array_equal(self.matrix, other.matrix)
+
+    def __hash__(self):
+        return hash(self.masks)
+
+    def __copy__(self):
+        # Immutable - sharing the instance is safe
+        return self
+
+
+def stack_boards(boards: List) -> np.ndarray:
+    """
+    Stacks the matrices of several boards of the same size into one array - bitboards are unpacked in a single
+    vectorized pass instead of building every matrix
+    :param boards: list of Board or BitBoard objects
+    :return: array of cell values with shape (boards, board_size, board_size)
+    """
+    size = boards[0].board_size
+    if not isinstance(boards[0], BitBoard):
+        return np.stack([board.matrix for board in boards])
+
+    cell_count = size * size
+    byte_count = (cell_count + 7) // 8
+    raw = b''.join(mask.to_bytes(byte_count, 'little') for board in boards for mask in board.masks)
+    bits = np.unpackbits(np.frombuffer(raw, dtype=np.uint8), bitorder='little')
+    bits = bits.reshape(len(boards), 2, byte_count * 8)[:, :, :cell_count].astype(int)
+    return (bits[:, 0] + 2 * bits[:, 1]).reshape(len(boards), size, size)
@@ -1,5 +1,6 @@
+from copy import copy
 from functools import cache, cached_property
-from typing import Tuple, List, Iterable
+from typing import Tuple, List, Iterable, Iterator
 
 import numpy as np
 
@@ -36,6 +37,20 @@ def bot_left_corner_coords(triangle_size: int, board_size: int) -> np.ndarray:
     return np.array(res)
 
 
+@cache
+def corner_flat_indices(triangle_size: int, board_size: int, corner: str) -> np.ndarray:
+    """
+    Returns the indices of the cells of a corner in the flattened board matrix.
+    :param corner: string indicating the corner ('bottom' or 'top')
+    :return: array of flat indices
+    """
+    if corner == 'bottom':
+        np_corner = bot_left_corner_coords(triangle_size, board_size)
+    else:  # corner == 'top'
+        np_corner = top_right_corner_coords(triangle_size, board_size)
+    return np_corner[:, 0] * board_size + np_corner[:, 1]
+
+
 class Board:
     """
     Class that represents the board of the game
@@ -103,6 +118,20 @@ class Board:
 
         return np.all(self.matrix[np_corner[:, 0], np_corner[:, 1]] == value)
 
+    def count_in_corner(self, corner: str, value: int) -> int:
+        """
+        Counts the pegs of a specific value inside a corner.
+        :param corner: string indicating the corner to be checked ('bottom' or 'top')
+        :param value: specific value to be counted
+        :return: number of corner cells holding the value
+        """
+        if corner == 'bottom':
+            np_corner = bot_left_corner_coords(self.triangle_size, self.board_size)
+        else:  # corner == 'top'
+            np_corner = top_right_corner_coords(self.triangle_size, self.board_size)
+
+        return int(np.sum(self.matrix[np_corner[:, 0], np_corner[:, 1]] == value))
+
     def is_top_right_terminal(self) -> bool:
         """
         Checks if the top-right corner is terminal for player 1.
@@ -119,6 +148,21 @@ class Board:
         return (self.is_cornered_pegs('bottom') and  # Initial config has BOTTOM with 1's
                 not self.is_cornered_with('bottom', 1))
 
+    def terminal_status(self) -> int:
+        """
+        Checks both goal corners at once - reads each corner with a single lookup of precomputed indices.
+        :return: 1 if the top-right corner is terminal (player 1 wins), 2 if the bottom-left corner is terminal
+        (player 2 wins), 0 otherwise
+        """
+        cells = self.matrix.ravel()
+        top = cells[corner_flat_indices(self.triangle_size, self.board_size, 'top')]
+        if np.all(top != 0) and not np.all(top == 2):
+            return 1
+        bottom = cells[corner_flat_indices(self.triangle_size, self.board_size, 'bottom')]
+        if np.all(bottom != 0) and not np.all(bottom == 1):
+            return 2
+        return 0
+
     def move(self, initial_pos: Tuple[int, int], path: Tuple[int, int]):
         """
         Moves a peg from the initial position to the destination position.
@@ -135,6 +179,17 @@ class Board:
         self.matrix[x][y] = self.matrix[current_x][current_y]
         self.matrix[current_x][current_y] = tmp
 
+    def moved(self, initial_pos: Tuple[int, int], path: Tuple[int, int]) -> 'Board':
+        """
+        Returns a copy of the board with the peg moved from the initial position to the destination position.
+        :param initial_pos: the initial position of the peg
+        :param path: the destination position of the peg
+        :return: the new board
+        """
+        new_board = copy(self)
+        new_board.move(initial_pos, path)
+        return new_board
+
     def within_bounds(self, coords: Tuple[int, int]) -> bool:
         """
         Checks if the coordinates are within the bounds of the board.
@@ -152,6 +207,40 @@ class Board:
         for dest in destinations:
             self.matrix[dest] = player_id
 
+    def cells(self, player: int) -> Iterator[Tuple[int, int]]:
+        """
+        Iterates the cells holding pegs of a player in row-major order.
+        :param player: player index
+        :return: iterator of coordinate pairs
+        """
+        for i, j in np.argwhere(self.matrix == player):
+            yield int(i), int(j)
+
+    def pegs(self, player: int) -> np.ndarray:
+        """
+        Returns the coordinates of the pegs of a player.
+        :param player: player index
+        :return: array of coordinate pairs with shape (pegs, 2)
+        """
+        return np.argwhere(self.matrix == player)
+
+    def is_empty(self, coords: Tuple[int, int]) -> bool:
+        """
+        Checks if a cell holds no peg.
+        :param coords: the coordinate pair of the cell
+        :return: boolean value
+        """
+        return self.matrix[coords[0], coords[1]] == 0
+
+    def __getitem__(self, coords: Tuple[int, int]) -> int:
+        return self.matrix[coords[0], coords[1]]
+
+    def __eq__(self, other):
+        return np.array_equal(self.matrix, other.matrix)
+
+    def __hash__(self):
+        return hash(bytes(self.matrix))
+
     def __str__(self):
         separator = '  '
         text = ' ' + separator + separator.join((str(i) for i in range(self.matrix.shape[0])))
@@ -160,6 +249,5 @@ class Board:
         return text
 
     def __copy__(self):
-        new_board = Board(self.triangle_size)
-        new_board.matrix = np.copy(self.matrix)
-        return new_board
+        # Pass the copied matrix directly - avoids building and discarding an initialised matrix
+        return Board(self.triangle_size, matrix=np.copy(self.matrix))
@@ -0,0 +1,29 @@
+from dataclasses import dataclass, field
+from typing import Tuple, List
+
+from game.Action import Action
+from game.Step import Step
+
+
+@dataclass(frozen=True, eq=True, order=True)
+class MacroAction(Action):
+    """
+    Class that represents a whole turn - a crawl or a complete chain of jumps of one peg.
+    The step type is the mode the turn ends in: CRAWL for a crawl and END for a chain of jumps, so that applying the
+    macro action with ChineseCheckers.result passes the turn to the other player.
+    """
+    path: Tuple[Tuple[int, int], ...] = field(default=(), compare=False)  # cells visited from src to dest
+
+    def steps(self) -> List[Action]:
+        """
+        Expands the turn into the single-step actions of the game
+        :return: list of actions to apply in order
+        """
+        if self.step_type == Step.CRAWL:
+            return [Action(self.src, self.dest, Step.CRAWL)]
+        steps = [Action(a, b, Step.JUMP) for a, b in zip(self.path, self.path[1:])]
+        steps.append(Action(self.dest, self.dest, Step.END))
+        return steps
+
+    def __str__(self):
+        return f"src: {self.src} dest: {self.dest} step_type: {self.step_type} path: {self.path}"
@@ -1,10 +1,11 @@
-import numpy as np
-
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from functools import cached_property
+from typing import Optional, Tuple, Union
 
 from game.Step import Step
 from game.Board import Board
+from game.BitBoard import BitBoard
+from game.Zobrist import zobrist_keys
 
 
 @dataclass
@@ -12,7 +13,7 @@ class State:
     """
     Class that represents the state of the game
     """
-    board: Board  # the current board object
+    board: Union[Board, BitBoard]  # the current board object (matrix or bitboard backend)
     player: int = 1  # the player index to move
     mode: int = Step.END  # the mode of the last action applied
     peg: Tuple[Optional[int], Optional[int]] = (None, None)  # the peg that was moved in the last action
@@ -22,7 +23,31 @@ class State:
 
     def __eq__(self, other):
         return (self.player == other.player and self.mode == other.mode
-                and self.peg == other.peg and np.array_equal(self.board.matrix, other.board.matrix))
+                and self.peg == other.peg and self.board == other.board)
+
+    @cached_property
+    def zobrist(self) -> int:
+        """
+        Zobrist hash of the state - computed from scratch on first access unless seeded by ChineseCheckers.result
+        with the incremental update of the parent hash. The board must not be mutated after the state is hashed.
+        :return: 64-bit hash
+        """
+        return zobrist_keys(self.board.triangle_size).full_hash(self.board, self.player, self.mode, self.peg)
+
+    @cached_property
+    def terminal_status(self) -> int:
+        """
+        Winner of the state - the index of the player that filled its goal corner, 0 while the game goes on.
+        Computed once per state; ChineseCheckers.apply and undo reset it when the state is modified in place.
+        :return: 0, 1 or 2
+        """
+        return self.board.terminal_status()
+
+    def reset_terminal_status(self):
+        """
+        Forgets the cached terminal status - to be called after the board of the state is modified
+        """
+        self.__dict__.pop('terminal_status', None)
 
     def __hash__(self):
-        return hash((bytes(self.board.matrix), self.player, self.mode, self.peg))
+        return self.zobrist
@@ -38,7 +38,7 @@ class Step:
         if (((delta_x12 == 1 and delta_y12 == 0) or
              (delta_x12 == 0 and delta_y12 == 1) or
              abs(x1 + y1 - (x2 + y2)) == 2 and delta_x12 == 1)
-                and board.matrix[x2][y2] == 0):
+                and board[x2, y2] == 0):
             return True
         return False
 
@@ -58,8 +58,8 @@ class Step:
         if (((abs(x1 + y1 - (x2 + y2)) == 4 and delta_x12 == 2) or
              (delta_x12 == 2 and delta_y12 == 0) or
              (delta_x12 == 0 and delta_y12 == 2)) and
-                board.matrix[(x1 + x2) // 2][(y1 + y2) // 2] != 0 and
-                board.matrix[x2][y2] == 0):
+                board[(x1 + x2) // 2, (y1 + y2) // 2] != 0 and
+                board[x2, y2] == 0):
             return True
         pass
 
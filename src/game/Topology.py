@@ -0,0 +1,54 @@
+from functools import cache
+from typing import Tuple, Dict
+
+Cell = Tuple[int, int]
+
+# The six directions a peg can move in, in row-major order of the offsets
+DIRECTIONS = ((-1, -1), (-1, 0), (0, -1), (0, 1), (1, 0), (1, 1))
+
+
+class Topology:
+    """
+    Precomputed move tables of a board - the crawl neighbours and the (over, landing) jump pairs of every cell.
+    Built once per triangle size through board_topology.
+    """
+    def __init__(self, triangle_size: int):
+        self.triangle_size = triangle_size
+        self.board_size = triangle_size * 2 + 1
+        self.cells: Tuple[Cell, ...] = tuple((i, j) for i in range(self.board_size) for j in range(self.board_size))
+
+        # cell -> tuple of adjacent cells reachable by a CRAWL
+        self.neighbours: Dict[Cell, Tuple[Cell, ...]] = {}
+        # cell -> tuple of (jumped-over cell, landing cell) pairs reachable by a JUMP
+        self.jumps: Dict[Cell, Tuple[Tuple[Cell, Cell], ...]] = {}
+
+        for cell in self.cells:
+            neighbours = []
+            jumps = []
+            for di, dj in DIRECTIONS:
+                over = cell[0] + di, cell[1] + dj
+                landing = cell[0] + 2 * di, cell[1] + 2 * dj
+                if self.within_bounds(over):
+                    neighbours.append(over)
+                    if self.within_bounds(landing):
+                        jumps.append((over, landing))
+            self.neighbours[cell] = tuple(neighbours)
+            self.jumps[cell] = tuple(jumps)
+
+    def within_bounds(self, coords: Cell) -> bool:
+        """
+        Checks if the coordinates are within the bounds of the board.
+        :param coords: the coordinate pair to be checked
+        :return: boolean value indicating if the coordinates are within the bounds of the board
+        """
+        return 0 <= coords[0] < self.board_size and 0 <= coords[1] < self.board_size
+
+
+@cache
+def board_topology(triangle_size: int) -> Topology:
+    """
+    Returns the shared move tables of the board with the given triangle size.
+    :param triangle_size: size of the corner triangles
+    :return: the cached topology object
+    """
+    return Topology(triangle_size)
@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from typing import Tuple, Optional, Any
+
+
+@dataclass(frozen=True)
+class UndoRecord:
+    """
+    Class that represents the information needed to take back an action applied in place
+    """
+    src: Tuple[int, int]  # source peg coordinate tuple of the applied action
+    dest: Tuple[int, int]  # destination peg coordinate tuple of the applied action
+    mode: int  # the mode of the state before the action
+    peg: Tuple[Optional[int], Optional[int]]  # the moved peg of the state before the action
+    player: int  # the player to move before the action
+    zobrist: int  # the hash of the state before the action
+    board: Optional[Any] = None  # the board before the action - only kept for immutable boards
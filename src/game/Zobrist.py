@@ -0,0 +1,82 @@
+import random
+from functools import cache
+from typing import Tuple, Optional, Dict
+
+Cell = Tuple[int, int]
+
+# Fixed seed so that hashes are identical across processes and runs
+ZOBRIST_SEED = 2180
+
+
+class ZobristKeys:
+    """
+    Random 64-bit keys used to hash states incrementally - one key per (cell, player), one for player 2 to move,
+    one per step mode and one per cell the last moved peg can stand on.
+    """
+    def __init__(self, triangle_size: int):
+        self.triangle_size = triangle_size
+        self.board_size = triangle_size * 2 + 1
+        rng = random.Random(ZOBRIST_SEED * 100 + triangle_size)
+
+        cells = [(i, j) for i in range(self.board_size) for j in range(self.board_size)]
+        # (cell, player) -> key, indexed with the cell value so that empty cells hash to 0
+        self.pegs: Dict[Cell, Tuple[int, int, int]] = {
+            cell: (0, rng.getrandbits(64), rng.getrandbits(64)) for cell in cells
+        }
+        self.side = rng.getrandbits(64)
+        self.modes: Dict[int, int] = {mode: rng.getrandbits(64) for mode in (1, 2, 3)}
+        self.moved_peg: Dict[Tuple[Optional[int], Optional[int]], int] = {cell: rng.getrandbits(64) for cell in cells}
+        self.moved_peg[(None, None)] = 0
+
+    def full_hash(self, board, player: int, mode: int, peg: Tuple[Optional[int], Optional[int]]) -> int:
+        """
+        Computes the hash of a state from scratch.
+        :param board: the board of the state
+        :param player: the player to move
+        :param mode: the mode of the last action applied
+        :param peg: the peg that was moved in the last action
+        :return: 64-bit hash
+        """
+        value = 0
+        for player_id in (1, 2):
+            for cell in board.cells(player_id):
+                value ^= self.pegs[cell][player_id]
+        if player == 2:
+            value ^= self.side
+        return value ^ self.modes[mode] ^ self.moved_peg[peg]
+
+    def child_hash(self, parent_hash: int, board, src: Cell, dest: Cell,
+                   mode: int, child_mode: int, peg, child_peg, side_changed: bool) -> int:
+        """
+        Updates a parent hash with a move - swaps the contents of src and dest on the parent board.
+        :param parent_hash: hash of the parent state
+        :param board: the board of the parent state (before the move)
+        :param src: source cell of the move
+        :param dest: destination cell of the move
+        :param mode: the mode of the parent state
+        :param child_mode: the mode of the child state
+        :param peg: the moved peg of the parent state
+        :param child_peg: the moved peg of the child state
+        :param side_changed: flag indicating if the turn passes to the other player
+        :return: 64-bit hash of the child state
+        """
+        value = parent_hash
+        if src != dest:
+            src_keys = self.pegs[src]
+            dest_keys = self.pegs[dest]
+            moving = board[src]
+            replaced = board[dest]
+            value ^= src_keys[moving] ^ dest_keys[moving] ^ dest_keys[replaced] ^ src_keys[replaced]
+        if side_changed:
+            value ^= self.side
+        return value ^ self.modes[mode] ^ self.modes[child_mode] ^ self.moved_peg[peg] ^ self.moved_peg[child_peg]
+
+
+@cache
+def zobrist_keys(triangle_size: int) -> ZobristKeys:
+    """
+    Returns the shared Zobrist keys of the board with the given triangle size.
+    :param triangle_size: size of the corner triangles
+    :return: the cached keys object
+    """
+    return ZobristKeys(triangle_size)
@@ -1,23 +1,29 @@
-from copy import copy
 from typing import Tuple, Iterable
 
 from game.Action import Action
+from game.BitBoard import BitBoard
+from game.MacroAction import MacroAction
 from game.Board import Board
 from game.State import State
 from game.Step import Step
+from game.Topology import Topology, board_topology
+from game.UndoRecord import UndoRecord
+from game.Zobrist import zobrist_keys
 from game_problem.GameProblem import GameProblem
 
 
 class ChineseCheckers(GameProblem):
-    def __init__(self, triangle_size: int = 3):
+    def __init__(self, triangle_size: int = 3, bitboard: bool = False):
         self.triangle_size = triangle_size
+        self.bitboard = bitboard  # Flag to store positions as immutable bit masks instead of numpy matrices
 
     def initial_state(self) -> State:
         """
         Initial state of the Chinese Checkers game
         :return: a state object
         """
-        return State(Board(self.triangle_size), 1, mode=Step.END, peg=(None, None))
+        board = BitBoard(self.triangle_size) if self.bitboard else Board(self.triangle_size)
+        return State(board, 1, mode=Step.END, peg=(None, None))
 
     def player(self, state: State) -> int:
         """
@@ -28,28 +34,33 @@ class ChineseCheckers(GameProblem):
         return state.player
 
     @staticmethod
-    def _peg_actions(state, src: Tuple[int, int]) -> Iterable[Action]:
+    def _peg_actions(state, src: Tuple[int, int], topology: Topology) -> Iterable[Action]:
         """
-        Generate all possible actions for a selected peg
+        Generate all possible actions for a selected peg - looks up the precomputed move tables and only
+        checks the occupancy of the cells involved
         :param state: current state of the game
         :param src: the selected peg coordinate pair
+        :param topology: the move tables of the board
         :return: an iterable of valid actions
         """
-        board = state.board
-
-        for i in range(-2, 3):
-            for j in range(-2, 3):
-                if board.within_bounds((src[0] + i, src[1] + j)):
-                    res = None
-
-                    if state.mode == Step.JUMP and src == state.peg:
-                        res = Step.validate_tail(board, src, (src[0] + i, src[1] + j))
-
-                    if state.mode == Step.END or state.mode == Step.CRAWL:
-                        res = Step.validate_head(board, src, (src[0] + i, src[1] + j))
-
-                    if res is not None:
-                        yield Action(src, (src[0] + i, src[1] + j), res)
+        is_empty = state.board.is_empty
+
+        if state.mode == Step.JUMP:
+            # Tail of a move - only the jumping peg continues, either ending the turn or jumping again
+            if src == state.peg:
+                yield Action(src, src, Step.END)
+                for over, landing in topology.jumps[src]:
+                    if not is_empty(over) and is_empty(landing):
+                        yield Action(src, landing, Step.JUMP)
+            return
+
+        # Head of a move - any peg either jumps or crawls
+        for over, landing in topology.jumps[src]:
+            if not is_empty(over) and is_empty(landing):
+                yield Action(src, landing, Step.JUMP)
+        for dest in topology.neighbours[src]:
+            if is_empty(dest):
+                yield Action(src, dest, Step.CRAWL)
 
     def actions(self, state: State) -> Iterable[Action]:
         """
@@ -57,11 +68,59 @@ class ChineseCheckers(GameProblem):
         :param state: current state of the game
         :return: an iterable of valid actions
         """
+        topology = board_topology(state.board.triangle_size)
+        for src in state.board.cells(state.player):
+            yield from self._peg_actions(state, src, topology)
+
+    def macro_actions(self, state: State) -> Iterable[MacroAction]:
+        """
+        Generate one action per whole turn - every crawl, and for every peg one action per distinct square reachable
+        by a chain of jumps (found by a breadth-first search, so the path kept is a shortest one). Squares reached by
+        several paths are generated once and chains returning to the starting square are dropped.
+        In the middle of a jump chain, only the continuations of the jumping peg are generated, including ending there.
+        :param state: current state of the game
+        :return: an iterable of macro actions
+        """
         board = state.board
-        for i in range(board.board_size):
-            for j in range(board.board_size):
-                if board.matrix[i][j] == state.player:
-                    yield from self._peg_actions(state, (i, j))
+        topology = board_topology(board.triangle_size)
+
+        if state.mode == Step.JUMP:
+            src = state.peg
+            yield MacroAction(src, src, Step.END, (src,))
+            yield from self._jump_chains(board, src, topology)
+            return
+
+        for src in board.cells(state.player):
+            yield from self._jump_chains(board, src, topology)
+            for dest in topology.neighbours[src]:
+                if board.is_empty(dest):
+                    yield MacroAction(src, dest, Step.CRAWL, (src, dest))
+
+    @staticmethod
+    def _jump_chains(board, src: Tuple[int, int], topology: Topology) -> Iterable[MacroAction]:
+        """
+        Breadth-first search over the squares a peg can reach by chaining jumps
+        :param board: the board of the current state
+        :param src: the jumping peg coordinate pair - its square counts as empty once the peg has left it
+        :param topology: the move tables of the board
+        :return: an iterable of macro actions, one per reachable square
+        """
+        parents = {src: None}
+        frontier = [src]
+        while frontier:
+            next_frontier = []
+            for cell in frontier:
+                for over, landing in topology.jumps[cell]:
+                    if (landing not in parents and over != src
+                            and not board.is_empty(over) and board.is_empty(landing)):
+                        parents[landing] = cell
+                        next_frontier.append(landing)
+
+                        path = [landing]
+                        while parents[path[-1]] is not None:
+                            path.append(parents[path[-1]])
+                        yield MacroAction(src, landing, Step.END, tuple(reversed(path)))
+            frontier = next_frontier
 
     def result(self, state: State, action: Action) -> State:
         """
@@ -70,23 +129,72 @@ class ChineseCheckers(GameProblem):
         :param action: action to be applied
         :return: the new state obtained
         """
-        new_board = copy(state.board)
-        new_board.move(action.src, action.dest)
+        new_board = state.board.moved(action.src, action.dest)
 
         new_state = State(new_board, state.player, action.step_type, action.dest)
 
-        if action.step_type == Step.CRAWL or action.step_type == Step.END:
+        side_changed = action.step_type == Step.CRAWL or action.step_type == Step.END
+        if side_changed:
             new_state.player = 3 - state.player
 
+        # Seed the cached hash of the child with the O(1) update of the parent hash
+        new_state.zobrist = zobrist_keys(new_board.triangle_size).child_hash(
+            state.zobrist, state.board, action.src, action.dest,
+            state.mode, action.step_type, state.peg, action.dest, side_changed
+        )
+
         return new_state
 
+    def apply(self, state: State, action: Action) -> UndoRecord:
+        """
+        Apply the action to the current state in place - avoids allocating a child state during the search
+        :param state: current state of the game, modified to become the child state
+        :param action: action to be applied
+        :return: the record needed to take the action back with undo
+        """
+        board = state.board
+        keys = zobrist_keys(board.triangle_size)
+        side_changed = action.step_type == Step.CRAWL or action.step_type == Step.END
+        record = UndoRecord(action.src, action.dest, state.mode, state.peg, state.player, state.zobrist,
+                            board if isinstance(board, BitBoard) else None)
+
+        state.zobrist = keys.child_hash(state.zobrist, board, action.src, action.dest,
+                                        state.mode, action.step_type, state.peg, action.dest, side_changed)
+        if record.board is not None:
+            state.board = board.moved(action.src, action.dest)
+        else:
+            board.move(action.src, action.dest)
+        state.mode = action.step_type
+        state.peg = action.dest
+        if side_changed:
+            state.player = 3 - state.player
+        state.reset_terminal_status()
+        return record
+
+    def undo(self, state: State, record: UndoRecord):
+        """
+        Take back an action applied in place with apply
+        :param state: the state the action was applied to
+        :param record: the record returned by apply
+        """
+        if record.board is not None:
+            state.board = record.board
+        else:
+            # Moving swaps the two cells - swapping again restores them
+            state.board.move(record.dest, record.src)
+        state.mode = record.mode
+        state.peg = record.peg
+        state.player = record.player
+        state.zobrist = record.zobrist
+        state.reset_terminal_status()
+
     def terminal_test(self, state: State) -> bool:
         """
         Check if the current state is a terminal state - one of the players wins
         :param state: current state of the game
         :return: flag indicating if the state is terminal
         """
-        return state.board.is_top_right_terminal() or state.board.is_bot_left_terminal()
+        return state.terminal_status != 0
 
     def utility(self, state: State, player: int) -> int:
         """
@@ -95,12 +203,10 @@ class ChineseCheckers(GameProblem):
         :param player: the player index
         :return: payoff values for each player depending on the state
         """
-        if state.board.is_top_right_terminal():
-            return (-1) ** (player == 2)
-        elif state.board.is_bot_left_terminal():
-            return (-1) ** (player == 1)
-        else:
+        winner = state.terminal_status
+        if winner == 0:
             return 0
+        return 1 if winner == player else -1
 
 
 if __name__ == "__main__":
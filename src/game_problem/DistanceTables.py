@@ -0,0 +1,133 @@
+from functools import cache
+from typing import Tuple, List, Dict
+
+import numpy as np
+
+from game.Board import bot_left_corner_coords, top_right_corner_coords
+
+Cell = Tuple[int, int]
+
+
+class DistanceTables:
+    """
+    Precomputed distances from every cell of the board to every goal cell of a player, together with the constants
+    the heuristics normalize by. The goal cells are ordered the way the heuristics pick their target - closest to the
+    tip of the corner first.
+    """
+    def __init__(self, triangle_size: int, player: int):
+        self.triangle_size = triangle_size
+        self.board_size = triangle_size * 2 + 1
+        self.player = player
+
+        if player == 1:
+            corner = top_right_corner_coords(triangle_size, self.board_size)
+        else:
+            corner = bot_left_corner_coords(triangle_size, self.board_size)
+        self.goal_cells: np.ndarray = corner
+        self.targets: Tuple[Cell, ...] = tuple((int(i), int(j)) for i, j in corner)
+
+        # (S, S, T) arrays - distance of cell (i, j) to goal cell k
+        rows, cols = np.indices((self.board_size, self.board_size))
+        diffs = np.stack((rows, cols), axis=-1)[:, :, None, :] - corner
+        self.manhattan: np.ndarray = np.sum(np.abs(diffs), axis=3)
+        self.euclidean: np.ndarray = np.linalg.norm(diffs, axis=3)
+
+        # The same distances per cell as tuples - faster than numpy for the scalar updates of the running totals
+        target_set = set(self.targets)
+        self.manhattan_of: Dict[Cell, Tuple[int, ...]] = {}
+        self.euclidean_of: Dict[Cell, Tuple[float, ...]] = {}
+        self.in_goal: Dict[Cell, int] = {}
+        for i in range(self.board_size):
+            for j in range(self.board_size):
+                self.manhattan_of[(i, j)] = tuple(int(d) for d in self.manhattan[i, j])
+                self.euclidean_of[(i, j)] = tuple(float(d) for d in self.euclidean[i, j])
+                self.in_goal[(i, j)] = int((i, j) in target_set)
+
+        # Normalization constants
+        self.peg_count = (triangle_size + 1) * triangle_size / 2
+        self.max_manhattan = 2 * (self.board_size - 1)
+        self.manhattan_norm = 2 * self.board_size
+        # Average Euclidean distance between the two initial corner triangles, measured to the tip of the corner
+        # (the same value for both players)
+        self.initial_avg_euclidean = float(np.mean(np.linalg.norm(
+            bot_left_corner_coords(triangle_size, self.board_size) - [0, self.board_size - 1], axis=1)))
+
+    def target_index(self, board) -> int:
+        """
+        Index of the goal cell the single-corner heuristics measure towards - the first empty goal cell, or the tip
+        of the corner when the corner is full
+        :param board: the current board
+        :return: index into the goal cells
+        """
+        for k, cell in enumerate(self.targets):
+            if board[cell] == 0:
+                return k
+        return 0
+
+    def empty_target_indices(self, board) -> List[int]:
+        """
+        Indices of the empty goal cells
+        :param board: the current board
+        :return: list of indices into the goal cells
+        """
+        return [k for k, cell in enumerate(self.targets) if board[cell] == 0]
+
+    def peg_distances(self, board, table: np.ndarray) -> np.ndarray:
+        """
+        Looks up the distances of the pegs of the player to every goal cell
+        :param board: the current board
+        :param table: the manhattan or euclidean table
+        :return: array of distances with shape (P, T)
+        """
+        pegs = board.pegs(self.player)
+        return table[pegs[:, 0], pegs[:, 1]]
+
+    def batch_empty_targets(self, boards: np.ndarray) -> np.ndarray:
+        """
+        Flags the empty goal cells on every board of a batch
+        :param boards: array of boards with shape (N, S, S)
+        :return: boolean array with shape (N, T)
+        """
+        return boards[:, self.goal_cells[:, 0], self.goal_cells[:, 1]] == 0
+
+    def batch_target_indices(self, boards: np.ndarray) -> np.ndarray:
+        """
+        Vectorized target_index over a batch of boards
+        :param boards: array of boards with shape (N, S, S)
+        :return: array of N indices into the goal cells
+        """
+        # argmax picks the first empty cell, and the tip (index 0) when there is none
+        return np.argmax(self.batch_empty_targets(boards), axis=1)
+
+    def batch_peg_distances(self, boards: np.ndarray, table: np.ndarray) -> np.ndarray:
+        """
+        Looks up the distances of the pegs of the player to every goal cell on every board of a batch - all boards
+        hold the same number of pegs
+        :param boards: array of boards with shape (N, S, S)
+        :param table: the manhattan or euclidean table
+        :return: array of distances with shape (N, P, T)
+        """
+        _, rows, cols = np.nonzero(boards == self.player)
+        return table[rows, cols].reshape(len(boards), -1, table.shape[2])
+
+    def batch_target_distances(self, boards: np.ndarray, table: np.ndarray) -> np.ndarray:
+        """
+        Looks up the distances of the pegs of the player to the target goal cell of every board of a batch
+        :param boards: array of boards with shape (N, S, S)
+        :param table: the manhattan or euclidean table
+        :return: array of distances with shape (N, P)
+        """
+        distances = self.batch_peg_distances(boards, table)
+        targets = self.batch_target_indices(boards)
+        return np.take_along_axis(distances, targets[:, None, None], axis=2)[:, :, 0]
+
+
+@cache
+def distance_tables(triangle_size: int, player: int) -> DistanceTables:
+    """
+    Returns the shared distance tables of a player on the board with the given triangle size.
+    :param triangle_size: size of the corner triangles
+    :param player: the player index
+    :return: the cached tables object
+    """
+    return DistanceTables(triangle_size, player)
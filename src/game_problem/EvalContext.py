@@ -0,0 +1,54 @@
+from functools import cached_property
+from typing import List
+
+import numpy as np
+
+from game.State import State
+from game_problem.DistanceTables import DistanceTables, distance_tables
+
+
+class EvalContext:
+    """
+    Features of a state shared by the heuristics evaluating it for a player - the peg positions, the goal target and
+    the distance lookups are computed on first use and reused by every heuristic reading the same context.
+    """
+    def __init__(self, state: State, player: int):
+        self.state = state
+        self.board = state.board
+        self.player = player
+        self.tables: DistanceTables = distance_tables(state.board.triangle_size, player)
+
+    @cached_property
+    def pegs(self) -> np.ndarray:
+        """
+        Coordinates of the pegs of the player with shape (P, 2)
+        """
+        return self.board.pegs(self.player)
+
+    @cached_property
+    def target(self) -> int:
+        """
+        Index of the goal cell the single-corner heuristics measure towards
+        """
+        return self.tables.target_index(self.board)
+
+    @cached_property
+    def empty_targets(self) -> List[int]:
+        """
+        Indices of the empty goal cells
+        """
+        return self.tables.empty_target_indices(self.board)
+
+    @cached_property
+    def manhattan(self) -> np.ndarray:
+        """
+        Manhattan distances of the pegs to every goal cell with shape (P, T)
+        """
+        return self.tables.manhattan[self.pegs[:, 0], self.pegs[:, 1]]
+
+    @cached_property
+    def euclidean(self) -> np.ndarray:
+        """
+        Euclidean distances of the pegs to every goal cell with shape (P, T)
+        """
+        return self.tables.euclidean[self.pegs[:, 0], self.pegs[:, 1]]
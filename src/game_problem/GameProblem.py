@@ -23,6 +23,19 @@ class GameProblem(ABC):
     def result(self, state, action):
         raise NotImplementedError
 
+    def apply(self, state, action):
+        """
+        Applies the action to the state in place - optional, used by searches that make and unmake moves
+        :return: a record to take the action back with undo
+        """
+        raise NotImplementedError
+
+    def undo(self, state, record):
+        """
+        Takes back an action applied in place with apply
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def terminal_test(self, state):
         raise NotImplementedError
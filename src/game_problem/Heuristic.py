@@ -4,8 +4,10 @@ from typing import List, Tuple
 import numpy as np
 
 from game import Board
-from game.Board import bot_left_corner_coords, top_right_corner_coords
 from game.State import State
+from game_problem.DistanceTables import distance_tables
+from game_problem.EvalContext import EvalContext
+from game_problem.RunningFeatures import RunningFeatures
 
 """
 Utility functions for evaluation of board states.
@@ -14,9 +16,8 @@ Primarily different Heuristics functions
 
 
 def average_euclidean_to_corner(board: Board, player: int) -> float:
-    corner = decide_goal_corner_coordinates(board, player)
-    indices = np.argwhere(board.matrix == player)
-    distances = np.linalg.norm(indices - corner, axis=1)
+    tables = distance_tables(board.triangle_size, player)
+    distances = tables.peg_distances(board, tables.euclidean)[:, tables.target_index(board)]
     return np.mean(distances)
 
 
@@ -25,41 +26,28 @@ def initial_avg_euclidean(board: Board):
     Returns the average Euclidian distance between the two initial corner triangles
     :return: mean of Euclidian distances
     """
-    bottom_corner = bot_left_corner_coords(board.triangle_size, board.board_size)
-    diffs = bottom_corner - [0, board.board_size - 1]
-    distances = np.linalg.norm(diffs, axis=1)
-    return np.mean(distances)
+    return distance_tables(board.triangle_size, 1).initial_avg_euclidean
 
 
 def average_manhattan_to_corner(board: Board, player: int) -> float:
-    corner = decide_goal_corner_coordinates(board, player)
-    indices = np.argwhere(board.matrix == player)
-    distances = np.sum(np.abs(indices - corner), axis=1)
+    tables = distance_tables(board.triangle_size, player)
+    distances = tables.peg_distances(board, tables.manhattan)[:, tables.target_index(board)]
     return np.mean(distances)
 
 
 def max_manhattan_to_corner(board: Board, player: int) -> float:
-    corner = decide_goal_corner_coordinates(board, player)
-    indices = np.argwhere(board.matrix == player)
-    distances = np.sum(np.abs(indices - corner), axis=1)
+    tables = distance_tables(board.triangle_size, player)
+    distances = tables.peg_distances(board, tables.manhattan)[:, tables.target_index(board)]
     return np.max(distances)
 
 
 def decide_goal_corner_coordinates(board: Board, player: int):
-    if player == 1:
-        corner = top_right_corner_coords(board.triangle_size, board.board_size)
-    else:
-        corner = bot_left_corner_coords(board.triangle_size, board.board_size)
-    for pair in corner:
-        if board.matrix[pair[0], pair[1]] == 0:
-            return pair
-
-    # Base case
-    if player == 1:
-        corner = [0, board.board_size - 1]
-    else:
-        corner = [board.board_size - 1, 0]
-    return corner
+    """
+    Returns the first empty cell of the goal corner of a player, closest to the tip of the corner first.
+    Base case - the tip of the corner when the corner is full.
+    """
+    tables = distance_tables(board.triangle_size, player)
+    return tables.goal_cells[tables.target_index(board)]
 
 
 def sum_player_pegs(board: Board, player: int) -> float:
@@ -69,11 +57,16 @@ def sum_player_pegs(board: Board, player: int) -> float:
     :param player: int
     :return:
     """
-    if player == 1:
-        corner = top_right_corner_coords(board.triangle_size, board.board_size)
-    else:
-        corner = bot_left_corner_coords(board.triangle_size, board.board_size)
-    return np.sum(board.matrix[corner[:, 0], corner[:, 1]] == player)
+    return board.count_in_corner('top' if player == 1 else 'bottom', player)
+
+
+def triangle_size_of(boards: np.ndarray) -> int:
+    """
+    Returns the triangle size of a batch of boards
+    :param boards: array of boards with shape (N, S, S)
+    :return: int
+    """
+    return (boards.shape[1] - 1) // 2
 
 
 class Heuristic(ABC):
@@ -81,6 +74,46 @@ class Heuristic(ABC):
     def eval(self, state: State, player: int) -> float:
         raise NotImplemented
 
+    def eval_context(self, context: EvalContext) -> float:
+        """
+        Evaluates the state from the features shared with the other heuristics evaluating it - computed once for all
+        the components of a WeightedHeuristic.
+        Heuristics without a shared form fall back to the full evaluation.
+        :param context: features of the state for the evaluated player
+        :return: the same value as eval
+        """
+        return self.eval(context.state, context.player)
+
+    def eval_incremental(self, features: RunningFeatures, state: State, player: int) -> float:
+        """
+        Evaluates the state from the running totals maintained along the search path.
+        Heuristics without an incremental form fall back to the full evaluation.
+        :param features: running totals matching the state
+        :param state: the current state of the game
+        :param player: the player for which the heuristic is evaluated
+        :return: the same value as eval
+        """
+        return self.eval(state, player)
+
+    def eval_batch(self, boards: np.ndarray, player: int) -> np.ndarray:
+        """
+        Evaluates a batch of boards in one pass - used to score all leaf children of a search node together.
+        Heuristics without a vectorized form fall back to evaluating the boards one by one.
+        :param boards: array of boards with shape (N, S, S)
+        :param player: the player for which the heuristic is evaluated
+        :return: array of N values, the same as eval for each board
+        """
+        triangle_size = triangle_size_of(boards)
+        return np.array([self.eval(State(Board.Board(triangle_size, matrix=board), player), player)
+                         for board in boards], dtype=float)
+
+    def tag(self) -> str:
+        """
+        Describes the heuristic and its configuration - equal tags evaluate states equally
+        :return: the description
+        """
+        return type(self).__name__
+
 
 class NoneHeuristic(Heuristic):
     """
@@ -89,6 +122,15 @@ class NoneHeuristic(Heuristic):
     def eval(self, state: State, player: int) -> float:
         return 0
 
+    def eval_context(self, context: EvalContext) -> float:
+        return 0
+
+    def eval_incremental(self, features: RunningFeatures, state: State, player: int) -> float:
+        return 0
+
+    def eval_batch(self, boards: np.ndarray, player: int) -> np.ndarray:
+        return np.zeros(len(boards))
+
 
 class EnsuredNormalizedHeuristic(Heuristic):
     """
@@ -103,16 +145,39 @@ class EnsuredNormalizedHeuristic(Heuristic):
         assert -0.001 <= value <= 1, f'{type(self.inner_heuristic).__name__}: Assertion -0.001 <= {value} <= 1 Failed'
         return value
 
+    def eval_context(self, context: EvalContext) -> float:
+        value = self.inner_heuristic.eval_context(context)
+        assert -0.001 <= value <= 1, f'{type(self.inner_heuristic).__name__}: Assertion -0.001 <= {value} <= 1 Failed'
+        return value
+
+    def eval_incremental(self, features: RunningFeatures, state: State, player: int) -> float:
+        value = self.inner_heuristic.eval_incremental(features, state, player)
+        assert -0.001 <= value <= 1, f'{type(self.inner_heuristic).__name__}: Assertion -0.001 <= {value} <= 1 Failed'
+        return value
+
+    def eval_batch(self, boards: np.ndarray, player: int) -> np.ndarray:
+        values = self.inner_heuristic.eval_batch(boards, player)
+        assert np.all((-0.001 <= values) & (values <= 1)), \
+            f'{type(self.inner_heuristic).__name__}: Assertion -0.001 <= {values} <= 1 Failed'
+        return values
+
+    def tag(self) -> str:
+        return self.inner_heuristic.tag()
+
 
 class WeightedHeuristic(Heuristic):
     """
     Utility to combine multiple heuristics with different weights.
+    The components are evaluated in a single pass - the peg positions and the goal target are extracted once and
+    shared by all of them, and the weights are applied as a dot product.
     """
     def __init__(self, weighted_heuristics: List[Tuple[Heuristic, float]]):
         self.weighted_heuristics = weighted_heuristics
         total_weights = sum(weight for _, weight in weighted_heuristics)
         if total_weights != 1:
             raise ValueError(f'Total weights must be 1')
+        self._heuristics = [heuristic for heuristic, _ in weighted_heuristics]
+        self._weights = np.array([weight for _, weight in weighted_heuristics], dtype=float)
 
     def eval(self, state: State, player: int) -> float:
         """
@@ -122,11 +187,30 @@ class WeightedHeuristic(Heuristic):
         :param player: the player for which the heuristic is evaluated
         :return: value of the combined heuristic
         """
+        return self.eval_context(EvalContext(state, player))
+
+    def eval_context(self, context: EvalContext) -> float:
+        values = np.array([heuristic.eval_context(context) for heuristic in self._heuristics], dtype=float)
+        # The weighted terms are summed in component order - a BLAS dot product may reorder the additions and change
+        # the last bits of the score, which decides ties between actions
+        return sum((np.round(values, 4) * self._weights).tolist())
+
+    def eval_incremental(self, features: RunningFeatures, state: State, player: int) -> float:
         total = 0
         for heuristic, weight in self.weighted_heuristics:
-            total += round(heuristic.eval(state, player), 4) * weight
+            total += round(heuristic.eval_incremental(features, state, player), 4) * weight
         return total
 
+    def eval_batch(self, boards: np.ndarray, player: int) -> np.ndarray:
+        total = np.zeros(len(boards))
+        for heuristic, weight in self.weighted_heuristics:
+            total += np.round(heuristic.eval_batch(boards, player), 4) * weight
+        return total
+
+    def tag(self) -> str:
+        components = ','.join(f'{heuristic.tag()}*{weight:g}' for heuristic, weight in self.weighted_heuristics)
+        return f'{type(self).__name__}({components})'
+
 
 class AverageManhattanToCornerHeuristic(Heuristic):
     def eval(self, state: State, player: int) -> float:
@@ -134,7 +218,20 @@ class AverageManhattanToCornerHeuristic(Heuristic):
         Consider Manhattan distance towards the goal corner of each player - normalize the distance by 2 board size
         Subtract the normalized distance from 1 to get a heuristic that is higher when closer to the goal
         """
-        return 1 - average_manhattan_to_corner(state.board, player) / (2 * state.board.board_size)
+        return self.eval_context(EvalContext(state, player))
+
+    def eval_context(self, context: EvalContext) -> float:
+        return 1 - np.mean(context.manhattan[:, context.target]) / context.tables.manhattan_norm
+
+    def eval_incremental(self, features: RunningFeatures, state: State, player: int) -> float:
+        target = features.target_index(state.board, player)
+        mean = features.manhattan_sums[player][target] / features.peg_counts[player]
+        return 1 - mean / features.tables[player].manhattan_norm
+
+    def eval_batch(self, boards: np.ndarray, player: int) -> np.ndarray:
+        tables = distance_tables(triangle_size_of(boards), player)
+        distances = tables.batch_target_distances(boards, tables.manhattan)
+        return 1 - np.mean(distances, axis=1) / tables.manhattan_norm
 
 
 class AverageManhattanToEachCornerHeuristic(Heuristic):
@@ -142,25 +239,30 @@ class AverageManhattanToEachCornerHeuristic(Heuristic):
     Computes the average Manhattan distance to the non-occupied corners.
     """
     def eval(self, state: State, player: int) -> float:
-        if player == 1:
-            corners = top_right_corner_coords(state.board.triangle_size, state.board.board_size)
-        else:
-            corners = bot_left_corner_coords(state.board.triangle_size, state.board.board_size)
+        return self.eval_context(EvalContext(state, player))
 
-        indices = np.argwhere(state.board.matrix == player)
-        total = 0
-        considered_corners_count = 0
-        for corner in corners:
-            if state.board.matrix[corner[0], corner[1]] == 0:
-                distances = np.sum(np.abs(indices - corner), axis=1)
-                total += np.mean(distances)
-                considered_corners_count += 1
-
-        if considered_corners_count == 0:
+    def eval_context(self, context: EvalContext) -> float:
+        targets = context.empty_targets
+        if not targets:
             total_mean = 0
         else:
-            total_mean = total / considered_corners_count
-        return 1 - total_mean / (2 * state.board.board_size)
+            total_mean = np.sum(np.mean(context.manhattan[:, targets], axis=0)) / len(targets)
+        return 1 - total_mean / context.tables.manhattan_norm
+
+    def eval_incremental(self, features: RunningFeatures, state: State, player: int) -> float:
+        targets = features.empty_target_indices(state.board, player)
+        if not targets:
+            return 1
+        sums = features.manhattan_sums[player]
+        total_mean = sum(sums[k] for k in targets) / features.peg_counts[player] / len(targets)
+        return 1 - total_mean / features.tables[player].manhattan_norm
+
+    def eval_batch(self, boards: np.ndarray, player: int) -> np.ndarray:
+        tables = distance_tables(triangle_size_of(boards), player)
+        empty = tables.batch_empty_targets(boards)
+        means = np.mean(tables.batch_peg_distances(boards, tables.manhattan), axis=1)
+        total_mean = np.sum(means * empty, axis=1) / np.maximum(np.sum(empty, axis=1), 1)
+        return 1 - total_mean / tables.manhattan_norm
 
 
 class SumOfPegsInCornerHeuristic(Heuristic):
@@ -168,8 +270,18 @@ class SumOfPegsInCornerHeuristic(Heuristic):
         """
         Consider the sum of pegs of the player - normalize the sum by the peg count for each player
         """
-        peg_count = (state.board.triangle_size + 1) * state.board.triangle_size / 2
-        return sum_player_pegs(state.board, player) / peg_count
+        return self.eval_context(EvalContext(state, player))
+
+    def eval_context(self, context: EvalContext) -> float:
+        return sum_player_pegs(context.board, context.player) / context.tables.peg_count
+
+    def eval_incremental(self, features: RunningFeatures, state: State, player: int) -> float:
+        return features.in_goal_count[player] / features.tables[player].peg_count
+
+    def eval_batch(self, boards: np.ndarray, player: int) -> np.ndarray:
+        tables = distance_tables(triangle_size_of(boards), player)
+        goal = boards[:, tables.goal_cells[:, 0], tables.goal_cells[:, 1]]
+        return np.sum(goal == player, axis=1) / tables.peg_count
 
 
 class AverageEuclideanToCornerHeuristic(Heuristic):
@@ -179,8 +291,20 @@ class AverageEuclideanToCornerHeuristic(Heuristic):
         average distance to the corner - subtract the normalized distance from 1 to get a heuristic that is higher
         when closer to the goal
         """
-        initial_euclidean = initial_avg_euclidean(state.board)
-        return 1 - average_euclidean_to_corner(state.board, player) / initial_euclidean
+        return self.eval_context(EvalContext(state, player))
+
+    def eval_context(self, context: EvalContext) -> float:
+        return 1 - np.mean(context.euclidean[:, context.target]) / context.tables.initial_avg_euclidean
+
+    def eval_incremental(self, features: RunningFeatures, state: State, player: int) -> float:
+        target = features.target_index(state.board, player)
+        mean = features.euclidean_sums[player][target] / features.peg_counts[player]
+        return 1 - mean / features.tables[player].initial_avg_euclidean
+
+    def eval_batch(self, boards: np.ndarray, player: int) -> np.ndarray:
+        tables = distance_tables(triangle_size_of(boards), player)
+        distances = tables.batch_target_distances(boards, tables.euclidean)
+        return 1 - np.mean(distances, axis=1) / tables.initial_avg_euclidean
 
 
 class AverageEuclideanToEachCornerHeuristic(Heuristic):
@@ -189,27 +313,30 @@ class AverageEuclideanToEachCornerHeuristic(Heuristic):
         AverageEuclideanToCornerHeuristic but does a mean of the distance to each corner.
         Computes the average Euclidean distance to the non-occupied corners.
         """
-        initial_euclidean = initial_avg_euclidean(state.board)
+        return self.eval_context(EvalContext(state, player))
 
-        if player == 1:
-            corners = top_right_corner_coords(state.board.triangle_size, state.board.board_size)
-        else:
-            corners = bot_left_corner_coords(state.board.triangle_size, state.board.board_size)
-        indices = np.argwhere(state.board.matrix == player)
-
-        means = 0
-        considered_corners_count = 0
-        for corner in corners:
-            if state.board.matrix[corner[0], corner[1]] == 0:
-                distances = np.linalg.norm(indices - corner, axis=1)
-                means += np.mean(distances)
-                considered_corners_count += 1
-
-        if considered_corners_count == 0:
+    def eval_context(self, context: EvalContext) -> float:
+        targets = context.empty_targets
+        if not targets:
             final_mean = 0
         else:
-            final_mean = means / considered_corners_count
-        return 1 - final_mean / initial_euclidean
+            final_mean = np.sum(np.mean(context.euclidean[:, targets], axis=0)) / len(targets)
+        return 1 - final_mean / context.tables.initial_avg_euclidean
+
+    def eval_incremental(self, features: RunningFeatures, state: State, player: int) -> float:
+        targets = features.empty_target_indices(state.board, player)
+        if not targets:
+            return 1
+        sums = features.euclidean_sums[player]
+        final_mean = sum(sums[k] / features.peg_counts[player] for k in targets) / len(targets)
+        return 1 - final_mean / features.tables[player].initial_avg_euclidean
+
+    def eval_batch(self, boards: np.ndarray, player: int) -> np.ndarray:
+        tables = distance_tables(triangle_size_of(boards), player)
+        empty = tables.batch_empty_targets(boards)
+        means = np.mean(tables.batch_peg_distances(boards, tables.euclidean), axis=1)
+        final_mean = np.sum(means * empty, axis=1) / np.maximum(np.sum(empty, axis=1), 1)
+        return 1 - final_mean / tables.initial_avg_euclidean
 
 
 class MaxManhattanToCornerHeuristic(Heuristic):
@@ -218,4 +345,16 @@ class MaxManhattanToCornerHeuristic(Heuristic):
     board size - helps to avoid the player from leaving pegs behind and carry them together towards the goal
     """
     def eval(self, state: State, player: int) -> float:
-        return 1 - max_manhattan_to_corner(state.board, player) / (2 * state.board.board_size)
+        return self.eval_context(EvalContext(state, player))
+
+    def eval_context(self, context: EvalContext) -> float:
+        return 1 - np.max(context.manhattan[:, context.target]) / context.tables.manhattan_norm
+
+    def eval_incremental(self, features: RunningFeatures, state: State, player: int) -> float:
+        target = features.target_index(state.board, player)
+        return 1 - features.max_manhattan(target, player) / features.tables[player].manhattan_norm
+
+    def eval_batch(self, boards: np.ndarray, player: int) -> np.ndarray:
+        tables = distance_tables(triangle_size_of(boards), player)
+        distances = tables.batch_target_distances(boards, tables.manhattan)
+        return 1 - np.max(distances, axis=1) / tables.manhattan_norm
@@ -0,0 +1,111 @@
+from typing import Tuple, List, Dict
+
+from game_problem.DistanceTables import distance_tables
+
+Cell = Tuple[int, int]
+
+
+class RunningFeatures:
+    """
+    Running totals of the pegs of both players, updated by delta as actions are applied along the search path:
+        - the number of pegs in the goal corner
+        - the sum of Manhattan and of Euclidean distances to every goal cell
+        - a histogram of the Manhattan distances to every goal cell (for the maximal distance)
+    The heuristics read these totals in eval_incremental instead of scanning the board.
+    """
+    def __init__(self, board):
+        self.triangle_size = board.triangle_size
+        self.board_size = board.board_size
+
+        self.tables = {player: distance_tables(self.triangle_size, player) for player in (1, 2)}
+        self.peg_counts: Dict[int, int] = {}
+        self.in_goal_count: Dict[int, int] = {}
+        self.manhattan_sums: Dict[int, List[int]] = {}
+        self.euclidean_sums: Dict[int, List[float]] = {}
+        self.manhattan_histograms: Dict[int, List[List[int]]] = {}
+        for player in (1, 2):
+            tables = self.tables[player]
+            count = len(tables.targets)
+            self.in_goal_count[player] = 0
+            self.manhattan_sums[player] = [0] * count
+            self.euclidean_sums[player] = [0.0] * count
+            self.manhattan_histograms[player] = [[0] * (tables.max_manhattan + 1) for _ in range(count)]
+            self.peg_counts[player] = 0
+            for cell in board.cells(player):
+                self._add(player, cell, 1)
+                self.peg_counts[player] += 1
+
+        # Euclidean sums of the moved player before each applied move - restored exactly on undo
+        self._undo_stack: List[Tuple[int, Cell, Cell, List[float]]] = []
+
+    def _add(self, player: int, cell: Cell, sign: int):
+        tables = self.tables[player]
+        manhattan = tables.manhattan_of[cell]
+        euclidean = tables.euclidean_of[cell]
+        manhattan_sums = self.manhattan_sums[player]
+        euclidean_sums = self.euclidean_sums[player]
+        histograms = self.manhattan_histograms[player]
+        for k in range(len(manhattan)):
+            manhattan_sums[k] += sign * manhattan[k]
+            euclidean_sums[k] += sign * euclidean[k]
+            histograms[k][manhattan[k]] += sign
+        self.in_goal_count[player] += sign * tables.in_goal[cell]
+
+    def push(self, board, src: Cell, dest: Cell):
+        """
+        Updates the totals with a move - to be called with the board before the move is applied
+        :param board: the board before the move
+        :param src: source cell of the move
+        :param dest: destination cell of the move
+        """
+        player = int(board[src]) if src != dest else 0
+        if player == 0:
+            self._undo_stack.append((0, src, dest, []))
+            return
+        self._undo_stack.append((player, src, dest, list(self.euclidean_sums[player])))
+        self._add(player, src, -1)
+        self._add(player, dest, 1)
+
+    def pop(self):
+        """
+        Takes back the latest move pushed
+        """
+        player, src, dest, euclidean_sums = self._undo_stack.pop()
+        if player == 0:
+            return
+        self._add(player, dest, -1)
+        self._add(player, src, 1)
+        self.euclidean_sums[player] = euclidean_sums
+
+    def target_index(self, board, player: int) -> int:
+        """
+        Index of the goal cell the single-corner heuristics measure towards - the first empty goal cell in the order
+        of distance from the tip of the corner, or the tip when the corner is full
+        :param board: the current board
+        :param player: the player index
+        :return: index into the goal cells of the player
+        """
+        return self.tables[player].target_index(board)
+
+    def empty_target_indices(self, board, player: int) -> List[int]:
+        """
+        Indices of the empty goal cells of a player
+        :param board: the current board
+        :param player: the player index
+        :return: list of indices into the goal cells of the player
+        """
+        return self.tables[player].empty_target_indices(board)
+
+    def max_manhattan(self, target: int, player: int) -> int:
+        """
+        Maximal Manhattan distance of the pegs of a player to a goal cell
+        :param target: index of the goal cell
+        :param player: the player index
+        :return: the maximal distance
+        """
+        histogram = self.manhattan_histograms[player][target]
+        for distance in range(len(histogram) - 1, -1, -1):
+            if histogram[distance]:
+                return distance
+        return 0
+
@@ -0,0 +1,331 @@
+import math
+import multiprocessing as mp
+import random
+import time
+from collections import deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from game.Action import Action
+from game.BitBoard import stack_boards
+from game.State import State
+from game_problem.GameProblem import GameProblem
+from game_problem.Heuristic import Heuristic
+from players.Player import Player
+
+# Rollout policy of a worker process - set up once by the pool initializer
+_worker_policy: Optional['RolloutPolicy'] = None
+
+
+def _init_rollout_worker(policy: 'RolloutPolicy'):
+    """
+    Initializes a worker process running rollouts
+    :param policy: the rollout policy of the player
+    """
+    global _worker_policy
+    _worker_policy = policy
+
+
+def _run_rollouts(tasks: List[Tuple[State, int]]) -> List[float]:
+    """
+    Runs a chunk of the rollouts of a batch in a worker process
+    :param tasks: list of (leaf state, seed) pairs
+    :return: rewards of player 1
+    """
+    return _worker_policy.run(tasks)
+
+
+class RolloutPolicy:
+    """
+    Plays the simulations of the tree search - from a leaf, up to depth steps are played and the final state is scored
+    for player 1: 1 for a win, 0 for a loss, otherwise 0.5 plus half the difference of the heuristic values of the
+    players (0.5 without a heuristic).
+    Random rollouts pick uniform actions. Guided rollouts pick, with probability 1 - epsilon, the action leading to
+    the best heuristic value for the player to move - all the children of a rollout step are scored by one batched
+    heuristic call.
+    """
+    def __init__(self, problem: GameProblem, heuristic: Optional[Heuristic] = None, depth: int = 20,
+                 guided: bool = False, epsilon: float = 0.2):
+        if guided and heuristic is None:
+            raise ValueError('Guided rollouts need a heuristic')
+        self.problem = problem
+        self.heuristic = heuristic
+        self.depth = depth
+        self.guided = guided
+        self.epsilon = epsilon
+
+    def run(self, tasks: List[Tuple[State, int]]) -> List[float]:
+        """
+        Plays the rollouts of a batch - the final states are scored together
+        :param tasks: list of (leaf state, seed) pairs
+        :return: rewards of player 1
+        """
+        final_states = [self.play(state, random.Random(seed)) for state, seed in tasks]
+        return self.rewards(final_states)
+
+    def play(self, state: State, rng: random.Random) -> State:
+        """
+        Plays a single rollout
+        :param state: the leaf state the rollout starts from
+        :param rng: random number generator of the rollout
+        :return: the final state
+        """
+        problem = self.problem
+        for _ in range(self.depth):
+            if problem.terminal_test(state):
+                break
+            actions = list(problem.actions(state))
+            if not actions:
+                break
+            if self.guided and rng.random() >= self.epsilon:
+                children = [problem.result(state, action) for action in actions]
+                values = self.heuristic.eval_batch(stack_boards([child.board for child in children]),
+                                                   problem.player(state))
+                state = children[int(np.argmax(values))]
+            else:
+                state = problem.result(state, rng.choice(actions))
+        return state
+
+    def rewards(self, states: List[State]) -> List[float]:
+        """
+        Scores final states for player 1 - the heuristic values of all non-terminal states are computed in one
+        batched call per player
+        :param states: the final states
+        :return: rewards of player 1
+        """
+        rewards = [0.5] * len(states)
+        open_indices = []
+        for index, state in enumerate(states):
+            if self.problem.terminal_test(state):
+                rewards[index] = (self.problem.utility(state, 1) + 1) / 2
+            else:
+                open_indices.append(index)
+        if open_indices and self.heuristic is not None:
+            boards = stack_boards([states[index].board for index in open_indices])
+            advantage = self.heuristic.eval_batch(boards, 1) - self.heuristic.eval_batch(boards, 2)
+            for index, value in zip(open_indices, advantage):
+                rewards[index] = float(np.clip(0.5 + value / 2, 0, 1))
+        return rewards
+
+
+class MCTSNode:
+    """
+    Class that represents a node of the search tree
+    """
+    __slots__ = ('state', 'parent', 'action', 'player', 'children', 'untried', 'visits', 'value')
+
+    def __init__(self, state: State, parent: Optional['MCTSNode'], action: Optional[Action], player: int,
+                 untried: List[Action]):
+        self.state = state
+        self.parent = parent
+        self.action = action  # action leading from the parent to the node
+        self.player = player  # player who took the action - the rewards of the node are counted for this player
+        self.children: List['MCTSNode'] = []
+        self.untried = untried  # actions not expanded yet, in random order
+        self.visits = 0
+        self.value = 0.0  # sum of the rewards of the player
+
+
+class MCTSPlayer(Player):
+    """
+    A player that uses Monte Carlo tree search with UCT selection to decide the next action.
+    Simulations run in batches: the leaves of a batch are selected one after another with a virtual loss (a visit
+    counted before its reward is known) so that they spread over the tree, then their rollouts are played together -
+    in the current process or split over a pool of worker processes - and the rewards are propagated back.
+    The subtree of the reached position is kept between moves.
+    """
+    def __init__(
+            self,
+            problem: GameProblem,
+            heuristic: Optional[Heuristic] = None,
+            iterations: Optional[int] = None,
+            time_budget: Optional[float] = None,
+            exploration: float = math.sqrt(2),
+            batch_size: int = 16,
+            workers: int = 1,
+            rollout_depth: int = 20,
+            guided_rollouts: bool = False,
+            epsilon: float = 0.2,
+            reuse_tree: bool = True,
+            seed: Optional[int] = None,
+            verbose: bool = True,
+            title: str = None
+    ):
+        """
+        :param problem: the game problem
+        :param heuristic: heuristic scoring the final states of the rollouts and guiding them - None for random
+        rollouts scored by their result only
+        :param iterations: number of simulations per move - defaults to 1000 without a time budget
+        :param time_budget: seconds of simulations per move
+        :param exploration: exploration constant of the UCT formula
+        :param batch_size: number of simulations whose rollouts are played together
+        :param workers: number of worker processes playing the rollouts, 1 plays them in the current process
+        :param rollout_depth: maximal number of steps of a rollout
+        :param guided_rollouts: flag to pick the rollout actions by the heuristic instead of uniformly
+        :param epsilon: probability of a uniform action in a guided rollout
+        :param reuse_tree: flag to keep the subtree of the reached position between moves
+        :param seed: seed of the random choices
+        """
+        super().__init__()
+        mp.freeze_support()
+        self._player_type = 'mcts' + (f' {title}' if title is not None else '')
+        self.prob = problem
+        self.verbose = verbose
+        self.iterations = iterations if iterations is not None or time_budget is not None else 1000
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.batch_size = batch_size
+        self.reuse_tree = reuse_tree
+        self.policy = RolloutPolicy(problem, heuristic, rollout_depth, guided_rollouts, epsilon)
+        self._rng = random.Random(seed)
+        self._root: Optional[MCTSNode] = None
+
+        # Rollouts of a batch are split over the worker processes, created on first use
+        self.workers = workers
+        self._pool = None
+
+        # Statistics
+        self.evaluated_states_count = 0  # expanded nodes
+        self.simulations = 0
+        self.reused_visits = 0
+
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data.update({
+            'mcts_simulations': self.simulations,
+            'mcts_reused_visits': self.reused_visits,
+        })
+        return data
+
+    def get_action(self, problem: GameProblem, state: State) -> Action:
+        """
+        Decides the next action by running simulations from the current state
+        :param problem: the game problem definition
+        :param state: the current state of the game
+        :return: the most visited action of the root, None if the state has no actions
+        """
+        timer = time.perf_counter()
+        root = self._find_root(state)
+        deadline = timer + self.time_budget if self.time_budget is not None else None
+        action = None
+        # A terminal state or a state without actions leaves nothing to decide
+        if root.children or root.untried:
+            # At least one batch runs, so that an exhausted budget still decides between simulated children
+            simulations = 0
+            while True:
+                batch_size = self.batch_size if self.iterations is None else max(1, min(self.batch_size,
+                                                                                         self.iterations - simulations))
+                self._run_batch(root, batch_size)
+                simulations += batch_size
+                if self.iterations is not None and simulations >= self.iterations:
+                    break
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+            self.simulations += simulations
+
+            best = max(root.children, key=lambda child: (child.visits, child.value))
+            if self.verbose:
+                print(f'MCTS: {simulations} simulations, best action visited {best.visits} times '
+                      f'(value {best.value / best.visits:0.3f})')
+            if self.reuse_tree:
+                best.parent = None
+                self._root = best
+            action = best.action
+
+        # Measure the time spent on deciding the action
+        elapsed_time = time.perf_counter() - timer
+        self._total_time_spent_on_taking_actions += elapsed_time
+        self._moves_count += 1
+        return action
+
+    def close(self):
+        """
+        Terminates the worker processes playing the rollouts
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def _new_node(self, state: State, parent: Optional[MCTSNode], action: Optional[Action], player: int) -> MCTSNode:
+        """
+        Creates a node with its actions in random order - terminal nodes have none
+        """
+        untried = [] if self.prob.terminal_test(state) else list(self.prob.actions(state))
+        self._rng.shuffle(untried)
+        self.evaluated_states_count += 1
+        return MCTSNode(state, parent, action, player, untried)
+
+    def _find_root(self, state: State) -> MCTSNode:
+        """
+        Finds the current state in the tree kept from the previous move - a breadth-first search of the expanded
+        nodes, the opponent's steps since then lead a few levels down
+        :param state: the current state of the game
+        :return: the node of the state, a new root if it is not in the tree
+        """
+        key = hash(state)
+        if self._root is not None:
+            queue = deque([self._root])
+            while queue:
+                node = queue.popleft()
+                if hash(node.state) == key and node.state == state:
+                    node.parent = None
+                    self.reused_visits += node.visits
+                    return node
+                queue.extend(node.children)
+        return self._new_node(state, None, None, 3 - self.prob.player(state))
+
+    def _uct_child(self, node: MCTSNode) -> MCTSNode:
+        """
+        Selects the child with the best upper confidence bound
+        :param node: a fully expanded node
+        :return: the selected child
+        """
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+        return max(node.children, key=lambda child: child.value / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+    def _select(self, root: MCTSNode) -> MCTSNode:
+        """
+        Descends from the root by UCT and expands one child - every node on the path gets a virtual visit
+        :param root: the root of the tree
+        :return: the selected leaf
+        """
+        node = root
+        node.visits += 1
+        while not node.untried and node.children:
+            node = self._uct_child(node)
+            node.visits += 1
+        if node.untried:
+            action = node.untried.pop()
+            child = self._new_node(self.prob.result(node.state, action), node, action, self.prob.player(node.state))
+            node.children.append(child)
+            node = child
+            node.visits += 1
+        return node
+
+    def _run_batch(self, root: MCTSNode, batch_size: int):
+        """
+        Runs a batch of simulations - selects the leaves, plays their rollouts together and propagates the rewards
+        :param root: the root of the tree
+        :param batch_size: number of simulations
+        """
+        leaves = [self._select(root) for _ in range(batch_size)]
+        tasks = [(leaf.state, self._rng.getrandbits(32)) for leaf in leaves]
+        if self.workers > 1:
+            if self._pool is None:
+                self._pool = mp.Pool(processes=self.workers, initializer=_init_rollout_worker,
+                                     initargs=(self.policy,))
+            chunk_size = math.ceil(len(tasks) / self.workers)
+            chunks = [tasks[start:start + chunk_size] for start in range(0, len(tasks), chunk_size)]
+            rewards = [reward for chunk in self._pool.map(_run_rollouts, chunks) for reward in chunk]
+        else:
+            rewards = self.policy.run(tasks)
+
+        for leaf, reward in zip(leaves, rewards):
+            node = leaf
+            while node is not None:
+                node.value += reward if node.player == 1 else 1 - reward
+                node = node.parent
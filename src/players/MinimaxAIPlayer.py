@@ -2,16 +2,97 @@ import multiprocessing as mp
 import sys
 import time
 from collections import deque
-from typing import Tuple, Optional
+from typing import Tuple, Optional, List
 
 from game.Action import Action
+from game.BitBoard import stack_boards
+from game.MacroAction import MacroAction
+from game.Step import Step
 from game.State import State
 from game_problem import GameProblem
 from game_problem.Heuristic import *
+from game_problem.RunningFeatures import RunningFeatures
 from players.Player import Player
+from search.MoveOrdering import MoveOrdering, StepTypeOrdering
+from search.OpeningBook import OpeningBook
+from search.Ponderer import Ponderer
+from search.EndgameSolver import EndgameSolver
+from search.EvalCache import EvalCache
+from search.SearchBudget import SearchBudget, SearchTimeout
+from search.SearchStatistics import SearchStatistics, MoveStatistics
+from search.TranspositionTable import TranspositionTable, Bound
 
 sys.setrecursionlimit(2000)
 
+# Width of the null windows of the principal variation search - below any difference of two heuristic values
+NULL_WINDOW = 1e-9
+
+# Searcher and shared alpha of a root-parallel worker process - set up once by the pool initializer
+_worker_player: Optional['MinimaxAIPlayer'] = None
+_worker_alpha = None
+# Id of the root search the worker searcher last took part in
+_worker_search_id: Optional[int] = None
+
+
+def _init_root_worker(config: dict, shared_alpha, stop_event=None):
+    """
+    Initializes a worker process of the root-parallel search
+    :param config: constructor arguments of the worker searcher
+    :param shared_alpha: shared value holding the best root score found so far by any worker
+    :param stop_event: event interrupting the running subtree searches once the budget of the move is exhausted
+    """
+    global _worker_player, _worker_alpha
+    _worker_player = MinimaxAIPlayer(**config)
+    _worker_player.budget = SearchBudget(stop_event=stop_event)
+    _worker_alpha = shared_alpha
+
+
+def _search_root_action(task: Tuple[int, State, Action, set, int, int, bool]) \
+        -> Tuple[int, Optional[float], bool, int, MoveStatistics, bool]:
+    """
+    Searches the subtree of a single root action in a worker process
+    :param task: tuple of the action index, the root state, the root action, the state history of the parent, the
+    id of the root search, the depth limit and a flag allowing the stop event to interrupt the search - the first task
+    of a new root search starts a new search generation of the worker's transposition table and move ordering
+    :return: tuple of the action index, the score (None if the child is in the history or the search was
+    interrupted), a flag indicating if the score is exact (not a fail-low bound), the number of evaluated states, the
+    search statistics of the subtree and a flag indicating if the search completed
+    """
+    global _worker_search_id
+    index, state, action, history, search_id, depth_limit, interruptible = task
+    player = _worker_player
+    if search_id != _worker_search_id:
+        _worker_search_id = search_id
+        if player.transposition_table is not None:
+            player.transposition_table.new_search()
+        for ordering in player.move_ordering:
+            ordering.new_search()
+    player._state_history_set = history
+    evaluated_before = player.evaluated_states_count
+    player.statistics.begin_move()
+
+    # Start from the best score any worker has already guaranteed at the root - prunes more than a full window
+    alpha = _worker_alpha.value
+    player._begin_search(state)
+    player._depth_limit = depth_limit
+    player.budget.active = interruptible and player.budget.enabled
+    try:
+        child_value = player._child_value(state, action, 0, alpha, float('inf'))
+    except SearchTimeout:
+        return index, None, False, player.evaluated_states_count - evaluated_before, player.statistics.current, False
+    finally:
+        player.budget.active = False
+        player._end_search()
+    if child_value is None:
+        return index, None, False, 0, player.statistics.current, True
+    score, _ = child_value
+
+    with _worker_alpha.get_lock():
+        if score > _worker_alpha.value:
+            _worker_alpha.value = score
+    return index, score, score > alpha, player.evaluated_states_count - evaluated_before, player.statistics.current, \
+        True
+
 
 class MinimaxAIPlayer(Player):
     """
@@ -25,7 +106,23 @@ class MinimaxAIPlayer(Player):
             heuristic: Heuristic,
             history_size: int = 10,
             verbose=True,
-            title: str = None
+            title: str = None,
+            tt_size: int = 2 ** 18,
+            tt_policy: str = 'depth',
+            time_budget: Optional[float] = None,
+            node_budget: Optional[int] = None,
+            in_place: bool = False,
+            workers: int = 1,
+            turn_plies: bool = False,
+            move_ordering: Optional[List[MoveOrdering]] = None,
+            incremental_eval: bool = False,
+            batch_eval: bool = False,
+            eval_cache: Optional[EvalCache] = None,
+            opening_book: Optional[OpeningBook] = None,
+            endgame_solver: Optional[EndgameSolver] = None,
+            pvs: bool = False,
+            aspiration_window: Optional[float] = 0.05,
+            ponder: bool = False
     ):
         # Sets up multiprocessing
         super().__init__()
@@ -36,9 +133,13 @@ class MinimaxAIPlayer(Player):
         self.MAX_PLAYER = max_player
         self.heuristic = heuristic
         self.max_depth = max_depth
+        # Depth limit of the running search - below max_depth during the iterations of iterative deepening
+        self._depth_limit = max_depth
 
         # Counter for the evaluated states
         self.evaluated_states_count = 0
+        # Per-move counters of the search - nodes per depth, cutoffs, pruned children and time split
+        self.statistics = SearchStatistics()
 
         # set.pop() - removes a random element from the set
         # Therefore, an additional queue is used to remember which element is the oldest
@@ -46,6 +147,80 @@ class MinimaxAIPlayer(Player):
         self._state_history_set = set()
         self._state_history_queue = deque()
 
+        # Search by applying and taking back actions on a single state instead of allocating child states
+        self.in_place = in_place
+
+        # Search whole turns (crawls and complete jump chains) as single plies - the depth counts turns. The steps of
+        # the decided turn are played one per get_action call
+        self.turn_plies = turn_plies
+        self._pending_steps = deque()
+
+        # Evaluate the leaves from running totals updated along the search path instead of scanning the board
+        self.incremental_eval = incremental_eval
+        self._features: Optional[RunningFeatures] = None
+
+        # Evaluate all leaf children of the nodes above the depth limit in one vectorized heuristic call
+        self.batch_eval = batch_eval
+
+        # Bounded cache of heuristic evaluations - kept across moves and can be shared with other players. The
+        # lookups are counted per player
+        self.eval_cache = eval_cache
+        self._heuristic_tag = heuristic.tag()
+        self.eval_cache_hits = 0
+        self.eval_cache_misses = 0
+
+        # Opening book answering the positions it covers without a search - must match the board and the heuristic
+        if opening_book is not None:
+            opening_book.check(problem.triangle_size, heuristic.tag())
+        self.opening_book = opening_book
+        self.book_hits = 0
+
+        # Exact solver taking over near the end of the game - plays a proven shortest win instead of searching
+        self.endgame_solver = endgame_solver
+        self.endgame_moves = 0
+
+        # Principal variation search - a negamax search proving the first action of every node best with null-window
+        # searches of the others. With iterative deepening, the root window is set around the previous iteration's
+        # score (None for full windows)
+        self.pvs = pvs
+        self.aspiration_window = aspiration_window
+
+        # Move ordering strategies in priority order - the transposition table action is always searched first
+        self.move_ordering = move_ordering if move_ordering is not None else [StepTypeOrdering()]
+
+        # Transposition table of searched positions - disabled with a size of 0
+        self.transposition_table = TranspositionTable(tt_size, tt_policy) if tt_size > 0 else None
+
+        # Anytime mode - with a time (seconds) or node budget per move, the search deepens one ply at a time up to
+        # max_depth and plays the best action of the last completed iteration
+        self.budget = SearchBudget(time_budget, node_budget)
+        self._root_first_action: Optional[Action] = None
+        self._completed_depths = []
+
+        # Root-parallel search - the root actions are searched by a pool of worker processes, created on first use
+        self.workers = workers
+        self._pool = None
+        self._shared_alpha = None
+        self._stop_event = None
+        self._search_id = 0
+        self._worker_config = {
+            'problem': problem, 'max_player': max_player, 'max_depth': max_depth, 'heuristic': heuristic,
+            'history_size': history_size, 'verbose': False, 'tt_size': tt_size, 'tt_policy': tt_policy,
+            'in_place': in_place, 'turn_plies': turn_plies, 'move_ordering': self.move_ordering,
+            'incremental_eval': incremental_eval, 'batch_eval': batch_eval, 'pvs': pvs,
+            # Every worker fills a cache of its own - pickling the shared one would slow down the pool start
+            'eval_cache': EvalCache(eval_cache.max_entries) if eval_cache is not None else None,
+        }
+
+        # Pondering - after a move ending the turn, a background process searches the positions after the likely
+        # replies of the opponent. A position searched to max_depth is answered without a search, the tables of the
+        # other searches warm up the own ones
+        self.ponderer = Ponderer(self._worker_config) if ponder else None
+        self._pondered_actions = {}
+        self.ponder_hits = 0
+        self.pondered_positions = 0
+        self.ponder_nodes = 0
+
     @property
     def average_time_spent_on_actions(self) -> float:
         """
@@ -54,6 +229,35 @@ class MinimaxAIPlayer(Player):
         """
         return self._total_time_spent_on_taking_actions / self._moves_count
 
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data['search_algorithm'] = 'pvs' if self.pvs else 'alphabeta'
+        if self.transposition_table is not None:
+            data.update(self.transposition_table.to_dict())
+        if self.eval_cache is not None:
+            lookups = self.eval_cache_hits + self.eval_cache_misses
+            data.update({
+                'eval_cache_hits': self.eval_cache_hits,
+                'eval_cache_misses': self.eval_cache_misses,
+                'eval_cache_hit_rate': self.eval_cache_hits / lookups if lookups else 0.0,
+                'eval_cache_entries': len(self.eval_cache),
+            })
+        if self.opening_book is not None:
+            data['book_hits'] = self.book_hits
+        if self.endgame_solver is not None:
+            data['endgame_moves'] = self.endgame_moves
+            data.update(self.endgame_solver.to_dict())
+        if self.ponderer is not None:
+            data.update({
+                'ponder_hits': self.ponder_hits,
+                'pondered_positions': self.pondered_positions,
+                'ponder_nodes': self.ponder_nodes,
+            })
+        data.update(self.statistics.to_dict())
+        if self._completed_depths:
+            data['average_completed_depth'] = sum(self._completed_depths) / len(self._completed_depths)
+        return data
+
     def get_action(self, problem: GameProblem, state: State) -> Action:
         """
         Decides the next action to take using the Minimax algorithm with alpha-beta pruning
@@ -63,8 +267,24 @@ class MinimaxAIPlayer(Player):
         """
 
         timer = time.perf_counter()
-        # Get the action from the alpha-beta search query
-        action = self.alpha_beta_search(state)
+        self._finish_pondering()
+        if self._pending_steps and self._pending_steps[0].src == state.peg and state.mode == Step.JUMP:
+            # Continue the turn decided by the previous search
+            action = self._pending_steps.popleft()
+        else:
+            self._pending_steps.clear()
+            action = self._book_action(state)
+            if action is None:
+                action = self._pondered_action(state)
+            if action is None:
+                action = self._endgame_action(state)
+            if action is None:
+                # Get the action from the alpha-beta search query
+                action = self.alpha_beta_search(state)
+            if isinstance(action, MacroAction):
+                self._pending_steps.extend(action.steps())
+                action = self._pending_steps.popleft()
+        self._start_pondering(state, action)
 
         # Measure the time spent on deciding the action
         elapsed_time = time.perf_counter() - timer
@@ -72,14 +292,122 @@ class MinimaxAIPlayer(Player):
         self._moves_count += 1
         return action
 
-        # # Prepare thread pool
-        # pool = mp.Pool(processes=16)
-        # # Apply problem of getting results from thread-pool
-        # results = pool.apply_async(self.minimax_alpha_beta,
-        #                            args=(state, state.player))
-        # pool.close()
-        # pool.join()
-        # score, action = results.get()
+    def _book_action(self, state: State) -> Optional[Action]:
+        """
+        Looks up the state in the opening book
+        :param state: the current state of the game
+        :return: the book action, None if the state is not in the book or its action is left to the search
+        """
+        if self.opening_book is None:
+            return None
+        action = self.opening_book.lookup(state)
+        # A hash collision or an action repeating a recent state is left to the search
+        if action is None or action not in self.prob.actions(state) \
+                or self._state_is_in_history(self.prob.result(state, action)):
+            return None
+        self._add_state_to_history(state)
+        self.book_hits += 1
+        return action
+
+    def _start_pondering(self, state: State, action: Action):
+        """
+        Starts pondering the replies of the opponent once the action ends the turn
+        :param state: the current state of the game
+        :param action: the decided action
+        """
+        if self.ponderer is None or self._pending_steps:
+            return
+        next_state = self.prob.result(state, action)
+        if self.prob.player(next_state) != self.MAX_PLAYER and not self.prob.terminal_test(next_state):
+            self.ponderer.start(next_state, self._state_history_queue, self._expected_reply(next_state))
+
+    def _expected_reply(self, state: State) -> Optional[State]:
+        """
+        Follows the best actions of the opponent stored in the transposition table by the last search
+        :param state: the state after the move of the player, at the start of a turn of the opponent
+        :return: the state at the end of the expected turn of the opponent, None if the table does not cover it
+        """
+        # The root-parallel search stores its entries in the tables of the workers
+        if self.transposition_table is None or self.workers > 1:
+            return None
+        visited = set()
+        while self.prob.player(state) != self.MAX_PLAYER:
+            # Stored actions of different searches may chain jumps back and forth
+            if self.prob.terminal_test(state) or state.zobrist in visited:
+                return None
+            visited.add(state.zobrist)
+            entry = self.transposition_table.probe(state.zobrist)
+            # The search of whole turns stores the turns, applied at once
+            actions = self.prob.macro_actions(state) if self.turn_plies else self.prob.actions(state)
+            if entry is None or entry.best_action not in actions:
+                return None
+            state = self.prob.result(state, entry.best_action)
+        return state
+
+    def _finish_pondering(self, cancel: bool = True):
+        """
+        Ends the pondering of the opponent's turn and takes over its results
+        :param cancel: flag to cancel the searches - otherwise waits until all the likely replies are searched
+        """
+        if self.ponderer is None or not self.ponderer.running:
+            return
+        self._pondered_actions.clear()
+        # The root-parallel search does not read the tables of the player - only the full-depth actions are taken over
+        warm_up = self.workers == 1
+        for result in self.ponderer.finish(cancel):
+            self.pondered_positions += 1
+            self.ponder_nodes += result.nodes
+            if warm_up and self.transposition_table is not None:
+                self.transposition_table.merge(result.tt_entries)
+            if warm_up and self.eval_cache is not None:
+                for state_hash, player, value in result.evaluations:
+                    self.eval_cache.put(EvalCache.key(state_hash, player, self._heuristic_tag), value)
+            if result.action is not None and result.depth >= self.max_depth:
+                self._pondered_actions[result.state.zobrist] = (result.state, result.action)
+
+    def _pondered_action(self, state: State) -> Optional[Action]:
+        """
+        Looks up the state in the positions searched to full depth on the opponent's turn
+        :param state: the current state of the game
+        :return: the pondered action, None if the state was not searched to full depth
+        """
+        pondered = self._pondered_actions.get(state.zobrist)
+        if pondered is None or pondered[0] != state or self._state_is_in_history(self.prob.result(state, pondered[1])):
+            return None
+        self._add_state_to_history(state)
+        self.ponder_hits += 1
+        if self.verbose:
+            print('Pondered position - playing the action searched on the opponent\'s turn')
+        return pondered[1]
+
+    def _endgame_action(self, state: State) -> Optional[MacroAction]:
+        """
+        Solves the position exactly once the endgame solver takes over
+        :param state: the current state of the game
+        :return: the first turn of a shortest forced win, None if the position is left to the search
+        """
+        if self.endgame_solver is None or not self.endgame_solver.triggered(state):
+            return None
+        solution = self.endgame_solver.solve(state)
+        if solution is None:
+            return None
+        turns, action = solution
+        if self.verbose:
+            print(f'Endgame solved - forced win in {turns} turns')
+        self._add_state_to_history(state)
+        self.endgame_moves += 1
+        return action
+
+    def close(self):
+        """
+        Terminates the worker processes of the root-parallel search and the pondering process
+        """
+        if self.ponderer is not None:
+            self.ponderer.close()
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
 
     def alpha_beta_search(self, state: State) -> Action:
         """
@@ -88,13 +416,212 @@ class MinimaxAIPlayer(Player):
         :return: decided action
         """
         self._add_state_to_history(state)
-        alpha = float('-inf')
-        beta = float('inf')
-        best_val, best_action = self.max_value(state, 0, alpha, beta)
+        if self.transposition_table is not None:
+            self.transposition_table.new_search()
+        for ordering in self.move_ordering:
+            ordering.new_search()
+        self.statistics.begin_move()
+        timer = time.perf_counter()
+        try:
+            if self.workers > 1:
+                return self.parallel_root_search(state)
+
+            self._begin_search(state)
+            try:
+                if self.budget.enabled:
+                    return self.iterative_deepening_search(state)
+
+                alpha = float('-inf')
+                beta = float('inf')
+                if self.pvs:
+                    best_val, best_action = self.negamax(state, 0, alpha, beta)
+                else:
+                    best_val, best_action = self.max_value(state, 0, alpha, beta)
+            finally:
+                self._end_search()
+        finally:
+            self.statistics.current.search_time = time.perf_counter() - timer
+            self.statistics.end_move()
         if self.verbose:
             print(list(self.prob.actions(state)))
         return best_action
 
+    def _begin_search(self, state: State):
+        """
+        Prepares the search state of a new root search
+        :param state: the root state
+        """
+        self._depth_limit = self.max_depth
+        if self.incremental_eval:
+            self._features = RunningFeatures(state.board)
+
+    def _end_search(self):
+        """
+        Releases the search state of the finished root search
+        """
+        self._depth_limit = self.max_depth
+        self._features = None
+
+    def parallel_root_search(self, state: State) -> Optional[Action]:
+        """
+        Root-parallel alpha-beta search - the subtrees of the root actions are searched by the worker processes.
+        The best root score found so far is shared between the workers and used as their alpha value.
+        With a budget, the root is deepened one ply at a time and every iteration hands the root actions to the pool
+        again, the best action of the previous iteration first. The workers are interrupted once the budget of the
+        move is exhausted and the best action of the last completed iteration is played.
+        :param state: current state of the game
+        :return: decided action
+        """
+        if self._pool is None:
+            self._shared_alpha = mp.Value('d', float('-inf'))
+            self._stop_event = mp.Event()
+            self._pool = mp.Pool(processes=self.workers, initializer=_init_root_worker,
+                                 initargs=(self._worker_config, self._shared_alpha, self._stop_event))
+        self._search_id += 1
+        if not self.budget.enabled:
+            return self._parallel_iteration(state, self.max_depth, None, False)
+
+        self.budget.start()
+        best_action = None
+        completed_depth = 0
+        try:
+            for depth_limit in range(1, self.max_depth + 1):
+                # The first iteration always completes so that there is an action to play
+                interruptible = depth_limit > 1
+                if interruptible and self.budget.exhausted():
+                    break
+                nodes_before = list(self.statistics.current.nodes_per_depth)
+                action = self._parallel_iteration(state, depth_limit, best_action, interruptible)
+                if action is not None:
+                    best_action = action
+                completed_depth = depth_limit
+                self.statistics.current.complete_iteration(nodes_before)
+        except SearchTimeout:
+            pass
+
+        self._completed_depths.append(completed_depth)
+        if self.verbose:
+            print(f'Completed depth {completed_depth} in {self.budget.nodes} nodes')
+        return best_action
+
+    def _parallel_iteration(self, state: State, depth_limit: int, first_action: Optional[Action],
+                            interruptible: bool) -> Optional[Action]:
+        """
+        Searches the root actions to the depth limit in the worker processes
+        :param state: current state of the game
+        :param depth_limit: depth limit of the iteration
+        :param first_action: action searched first, None to only use the move ordering
+        :param interruptible: flag to stop the workers once the budget of the move is exhausted
+        :return: the best action
+        :raises SearchTimeout: when the budget is exhausted before all the root actions are searched
+        """
+        self._shared_alpha.value = float('-inf')
+        self._stop_event.clear()
+        self.statistics.current.node(0)
+        valid_actions = self._ordered_actions(state, first_action, 0)
+        history = set(self._state_history_set)
+        tasks = [(index, state, action, history, self._search_id, depth_limit, interruptible)
+                 for index, action in enumerate(valid_actions)]
+
+        best_index, best_score = None, float('-inf')
+        interrupted = False
+        results = self._pool.imap_unordered(_search_root_action, tasks)
+        for _ in tasks:
+            if interruptible and not interrupted and self.budget.deadline is not None:
+                try:
+                    result = results.next(timeout=max(self.budget.deadline - time.perf_counter(), 0))
+                except mp.TimeoutError:
+                    # Out of time - the remaining subtree searches stop at their next budget check
+                    self._stop_event.set()
+                    interrupted = True
+                    result = results.next()
+            else:
+                result = results.next()
+            index, score, exact, evaluated, statistics, completed = result
+            self.evaluated_states_count += evaluated
+            self.statistics.current.merge(statistics)
+            self.budget.nodes += statistics.nodes
+            if not completed:
+                interrupted = True
+                continue
+            if interruptible and not interrupted and self.budget.node_budget is not None \
+                    and self.budget.nodes > self.budget.node_budget:
+                self._stop_event.set()
+                interrupted = True
+            # Scores at or below the alpha a subtree was searched with are only upper bounds - the best action is the
+            # first one in search order with the highest exact score
+            if score is None or not exact:
+                continue
+            if score > best_score or score == best_score and index < best_index:
+                best_index, best_score = index, score
+
+        if interrupted:
+            raise SearchTimeout()
+        if self.verbose:
+            print(f'Parallel root search over {len(valid_actions)} actions with {self.workers} workers')
+        return valid_actions[best_index] if best_index is not None else None
+
+    def iterative_deepening_search(self, state: State) -> Action:
+        """
+        Anytime alpha-beta search - searches to depth 1, 2, ... until max_depth is reached or the budget of the move
+        is exhausted. The best action of each completed iteration is searched first in the next one.
+        :param state: current state of the game
+        :return: the best action of the deepest completed iteration
+        """
+        self.budget.start()
+        best_action = None
+        best_score = None
+        completed_depth = 0
+        try:
+            for depth_limit in range(1, self.max_depth + 1):
+                # The first iteration always completes so that there is an action to play
+                self.budget.active = depth_limit > 1
+                if self.budget.active and self.budget.exhausted():
+                    break
+                self._depth_limit = depth_limit
+                self._root_first_action = best_action
+                nodes_before = list(self.statistics.current.nodes_per_depth)
+                if self.pvs:
+                    score, action = self.aspiration_search(state, best_score)
+                else:
+                    score, action = self.max_value(state, 0, float('-inf'), float('inf'))
+                if action is not None:
+                    best_action, best_score = action, score
+                completed_depth = depth_limit
+                self.statistics.current.complete_iteration(nodes_before)
+        except SearchTimeout:
+            pass
+        finally:
+            self._depth_limit = self.max_depth
+            self._root_first_action = None
+            self.budget.active = False
+
+        self._completed_depths.append(completed_depth)
+        if self.verbose:
+            print(f'Completed depth {completed_depth} in {self.budget.nodes} nodes')
+        return best_action
+
+    def aspiration_search(self, state: State, guess: Optional[float]) -> Tuple[float, Optional[Action]]:
+        """
+        Searches the root with a narrow window around the expected score - a score outside the window is only a
+        bound, so the search is repeated with that side of the window opened
+        :param state: current state of the game
+        :param guess: the expected score (of the previous iteration), None for a full window search
+        :return: the evaluation and the best action
+        """
+        if guess is None or self.aspiration_window is None:
+            return self.negamax(state, 0, float('-inf'), float('inf'))
+        alpha, beta = guess - self.aspiration_window, guess + self.aspiration_window
+        while True:
+            score, action = self.negamax(state, 0, alpha, beta)
+            if score <= alpha and alpha > float('-inf'):
+                alpha = float('-inf')
+            elif score >= beta and beta < float('inf'):
+                beta = float('inf')
+            else:
+                return score, action
+            self.statistics.current.aspiration_failures += 1
+
     def max_value(self, state: State, depth: int, alpha: float, beta: float) -> Tuple[float, Optional[Action]]:
         """
         The max-value function of the alpha-beta search algorithm
@@ -104,30 +631,32 @@ class MinimaxAIPlayer(Player):
         :param beta: beta value - the best value (max) that the MIN player can guarantee
         :return: the evaluation and the best action
         """
+        self.budget.check()
+        self.statistics.current.node(depth)
         if self.cutoff_test(state, depth):
             return self.eval_state(state, self.MAX_PLAYER), None
 
-        valid_actions = list(self.prob.actions(state))
-        # Effectiveness of pruning - highly dependent of move ordering - we sort the actions by step type
-        # (ends=3, then jumps=2,then crawls=1) - allows to consider the jump ending before the jump backwards (reverse)
-        valid_actions.sort(key=lambda x: x.step_type, reverse=True)
+        tt_action, cutoff = self._probe_transposition_table(state, depth, alpha, beta)
+        if cutoff is not None:
+            return cutoff
+        alpha_orig, beta_orig = alpha, beta
+        if depth == 0 and self._root_first_action is not None:
+            tt_action = self._root_first_action
+
+        valid_actions = self._ordered_actions(state, tt_action, depth)
+        if self.batch_eval and 0 < depth == self._depth_limit - 1:
+            return self._frontier_value(state, depth, valid_actions, alpha, beta, True)
 
         max_eval = float('-inf')
         best_action = None
         tuples = []
 
         # For each action, calculate the evaluation and the best action
-        for action in valid_actions:
-            # Get the child state as a result of the action applied
-            child = self.prob.result(state, action)
-            if self._state_is_in_history(child):
+        for index, action in enumerate(valid_actions):
+            child_value = self._child_value(state, action, depth, alpha, beta)
+            if child_value is None:
                 continue
-            # If the game does not change turn after the action - still a MAX node
-            if self.prob.player(child) == self.MAX_PLAYER:
-                res, sub_action = self.max_value(child, depth + 1, alpha, beta)
-            # If the game changes the turn after the action - becomes a MIN node
-            else:
-                res, sub_action = self.min_value(child, depth + 1, alpha, beta)
+            res, sub_action = child_value
             if depth == 0:
                 tuples.append((action, res, sub_action))
             # Update the best evaluation and the best action
@@ -136,9 +665,11 @@ class MinimaxAIPlayer(Player):
                 best_action = action
                 alpha = max(alpha, res)
             if max_eval >= beta:
+                self._record_cutoff(state, action, depth, index)
                 break
         if self.verbose and depth == 0:
             print(tuples)
+        self._store_transposition_table(state, depth, max_eval, alpha_orig, beta_orig, best_action)
         return max_eval, best_action
 
     def min_value(self, state: State, depth: int, alpha: float, beta: float) -> Tuple[float,Optional[Action]]:
@@ -150,37 +681,332 @@ class MinimaxAIPlayer(Player):
         :param beta: beta value - the best value (max) that the MIN player can guarantee
         :return:
         """
+        self.budget.check()
+        self.statistics.current.node(depth)
         if self.cutoff_test(state, depth):
             return self.eval_state(state, self.MAX_PLAYER), None
 
+        tt_action, cutoff = self._probe_transposition_table(state, depth, alpha, beta)
+        if cutoff is not None:
+            return cutoff
+        alpha_orig, beta_orig = alpha, beta
+
         min_eval = float('inf')
         best_action = None
 
-        valid_actions = list(self.prob.actions(state))
-        # Effectiveness of pruning - highly dependent of move ordering - we sort the actions by step type
-        # (ends=3, then jumps=2,then crawls=1) - allows to consider the jump ending before the jump backwards (reverse)
-        valid_actions.sort(key=lambda x: x.step_type, reverse=True)
+        valid_actions = self._ordered_actions(state, tt_action, depth)
+        if self.batch_eval and 0 < depth == self._depth_limit - 1:
+            return self._frontier_value(state, depth, valid_actions, alpha, beta, False)
 
         # For each action, calculate the evaluation and the best action
-        for action in valid_actions:
-            # Get the child state as a result of the action applied
-            child = self.prob.result(state, action)
-            if self._state_is_in_history(child):
+        for index, action in enumerate(valid_actions):
+            child_value = self._child_value(state, action, depth, alpha, beta)
+            if child_value is None:
                 continue
-            # If the game does not change turn after the action - still a MIN node
-            if self.prob.player(child) == self.MAX_PLAYER:
-                res, sub_action = self.max_value(child, depth + 1, alpha, beta)
-            # If the game changes the turn after the action - becomes a MAX node
-            else:
-                res, sub_action = self.min_value(child, depth + 1, alpha, beta)
+            res, sub_action = child_value
             if res < min_eval:
                 min_eval = res
                 best_action = action
                 beta = min(beta, res)
             if min_eval <= alpha:
+                self._record_cutoff(state, action, depth, index)
                 break
+        self._store_transposition_table(state, depth, min_eval, alpha_orig, beta_orig, best_action)
         return min_eval, best_action
 
+    def negamax(self, state: State, depth: int, alpha: float, beta: float) -> Tuple[float, Optional[Action]]:
+        """
+        Node of the principal variation search - scores, alpha and beta are from the view of the player to move.
+        The first action is searched with the full window, the others with a null window around alpha that only
+        proves them no better. An action failing high inside the window is searched again with the full window.
+        The transposition table, the move ordering and the batched frontier are shared with max_value/min_value, in
+        the MAX player's view.
+        :param state: the current state of the game
+        :param depth: depth of recursion
+        :param alpha: the score the player to move can already guarantee
+        :param beta: the score the opponent can already hold the player to move to
+        :return: the evaluation for the player to move and the best action
+        """
+        self.budget.check()
+        statistics = self.statistics.current
+        statistics.node(depth)
+        sign = 1 if self.prob.player(state) == self.MAX_PLAYER else -1
+        if self.cutoff_test(state, depth):
+            return sign * self.eval_state(state, self.MAX_PLAYER), None
+
+        # Window of the node in the MAX player's view
+        lower, upper = (alpha, beta) if sign == 1 else (-beta, -alpha)
+        tt_action, cutoff = self._probe_transposition_table(state, depth, lower, upper)
+        if cutoff is not None:
+            return sign * cutoff[0], cutoff[1]
+        if depth == 0 and self._root_first_action is not None:
+            tt_action = self._root_first_action
+
+        valid_actions = self._ordered_actions(state, tt_action, depth)
+        if self.batch_eval and 0 < depth == self._depth_limit - 1:
+            score, action = self._frontier_value(state, depth, valid_actions, lower, upper, sign == 1)
+            return sign * score, action
+
+        best_score = float('-inf')
+        best_action = None
+        first = True
+        tuples = []
+        for index, action in enumerate(valid_actions):
+            if first:
+                child_value = self._negamax_child_value(state, action, depth, alpha, beta, sign)
+            else:
+                child_value = self._negamax_child_value(state, action, depth, alpha, alpha + NULL_WINDOW, sign)
+                if child_value is not None and alpha < child_value[0] < beta:
+                    statistics.researches += 1
+                    child_value = self._negamax_child_value(state, action, depth, alpha, beta, sign)
+            if child_value is None:
+                continue
+            first = False
+            res, sub_action = child_value
+            if depth == 0:
+                tuples.append((action, sign * res, sub_action))
+            if res > best_score:
+                best_score = res
+                best_action = action
+                alpha = max(alpha, res)
+            if best_score >= beta:
+                self._record_cutoff(state, action, depth, index)
+                break
+        if self.verbose and depth == 0:
+            print(tuples)
+        self._store_transposition_table(state, depth, sign * best_score, lower, upper, best_action)
+        return best_score, best_action
+
+    def _negamax_child_value(self, state: State, action: Action, depth: int, alpha: float, beta: float,
+                             sign: int) -> Optional[Tuple[float, Optional[Action]]]:
+        """
+        Searches a child of a principal variation search node through _child_value, converting the window and the
+        score between the view of the player to move and the MAX player's view
+        :param state: the current state of the game
+        :param action: the action leading to the child
+        :param depth: depth of recursion of the current node
+        :param alpha: alpha value of the current node, in the view of the player to move
+        :param beta: beta value of the current node, in the view of the player to move
+        :param sign: 1 if the MAX player is to move, -1 otherwise
+        :return: the evaluation for the player to move and the best action of the child, None if the child is
+        skipped by the history
+        """
+        child_value = self._child_value(state, action, depth, *((alpha, beta) if sign == 1 else (-beta, -alpha)))
+        if child_value is None:
+            return None
+        return sign * child_value[0], child_value[1]
+
+    def _child_value(self, state: State, action: Action, depth: int, alpha: float, beta: float) \
+            -> Optional[Tuple[float, Optional[Action]]]:
+        """
+        Searches the child reached by applying the action - either on a new child state or, in the in-place mode,
+        by applying the action to the state itself and taking it back afterwards
+        :param state: the current state of the game
+        :param action: the action leading to the child
+        :param depth: depth of recursion of the current node
+        :param alpha: alpha value of the current node
+        :param beta: beta value of the current node
+        :return: the evaluation and best action of the child, None if the child is skipped by the history
+        """
+        if self._features is not None:
+            self._features.push(state.board, action.src, action.dest)
+        if self.in_place:
+            record = self.prob.apply(state, action)
+            child = state
+        else:
+            record = None
+            child = self.prob.result(state, action)
+        try:
+            if self._state_is_in_history(child):
+                self.statistics.current.history_pruned += 1
+                return None
+            if self.pvs:
+                if self.prob.player(child) == self.MAX_PLAYER:
+                    return self.negamax(child, depth + 1, alpha, beta)
+                score, sub_action = self.negamax(child, depth + 1, -beta, -alpha)
+                return -score, sub_action
+            # If the game does not change turn after the action - a MAX node for the MAX player
+            if self.prob.player(child) == self.MAX_PLAYER:
+                return self.max_value(child, depth + 1, alpha, beta)
+            # If the game changes the turn after the action - a MIN node
+            return self.min_value(child, depth + 1, alpha, beta)
+        finally:
+            # Also restores the state when the search is interrupted by the budget
+            if record is not None:
+                self.prob.undo(state, record)
+            if self._features is not None:
+                self._features.pop()
+
+    def _frontier_value(self, state: State, depth: int, valid_actions: List[Action], alpha: float, beta: float,
+                        maximizing: bool) -> Tuple[float, Optional[Action]]:
+        """
+        Searches a node one ply above the depth limit - all its children are leaves, so they are evaluated in batches
+        in search order, each scored by a single batched heuristic call instead of one call per child. The first
+        batch holds a single child and every further batch is twice as large: a well ordered node cuts off on its
+        first child as in the sequential search, while a node searching all its children needs few heuristic calls.
+        The search stops at the first cutoff - only the children of the batch after the cutting child are evaluated
+        beyond the sequential search, and the same score and action are returned.
+        :param state: the current state of the game
+        :param depth: depth of recursion of the node
+        :param valid_actions: the actions of the node in search order
+        :param alpha: alpha value of the node
+        :param beta: beta value of the node
+        :param maximizing: flag indicating if the node is a MAX node
+        :return: the evaluation and the best action
+        """
+        statistics = self.statistics.current
+        best_score = float('-inf') if maximizing else float('inf')
+        best_action = None
+        start, batch_size = 0, 1
+        while start < len(valid_actions):
+            actions, children = [], []
+            for action in valid_actions[start:start + batch_size]:
+                child = self.prob.result(state, action)
+                if self._state_is_in_history(child):
+                    statistics.history_pruned += 1
+                    continue
+                self.budget.check()
+                statistics.node(depth + 1)
+                actions.append(action)
+                children.append(child)
+            start += batch_size
+            batch_size *= 2
+
+            # The first action in search order wins ties, as in the sequential search
+            for action, score in zip(actions, self._leaf_values(children)):
+                if score > best_score if maximizing else score < best_score:
+                    best_score, best_action = score, action
+                if best_score >= beta if maximizing else best_score <= alpha:
+                    self._record_cutoff(state, action, depth, valid_actions.index(action))
+                    self._store_transposition_table(state, depth, best_score, alpha, beta, best_action)
+                    return best_score, best_action
+        self._store_transposition_table(state, depth, best_score, alpha, beta, best_action)
+        return best_score, best_action
+
+    def _leaf_values(self, children: List[State]) -> List[float]:
+        """
+        Evaluates leaf states for the MAX player - the non-terminal ones that are not cached by one batched heuristic
+        call, or by a plain call when there is only one
+        :param children: the leaf states
+        :return: the evaluations in the order of the states
+        """
+        statistics = self.statistics.current
+        timer = time.perf_counter()
+        scores, boards, heuristic_indices, cache_keys = [], [], [], []
+        for index, child in enumerate(children):
+            if self.prob.terminal_test(child):
+                scores.append(self.prob.utility(child, self.MAX_PLAYER))
+                continue
+            if self.eval_cache is not None:
+                key = EvalCache.key(child.zobrist, self.MAX_PLAYER, self._heuristic_tag)
+                value = self.eval_cache.get(key)
+                if value is not None:
+                    self.eval_cache_hits += 1
+                    scores.append(value)
+                    continue
+                self.eval_cache_misses += 1
+                cache_keys.append(key)
+            scores.append(0.0)
+            boards.append(child.board)
+            heuristic_indices.append(index)
+        if len(boards) == 1:
+            scores[heuristic_indices[0]] = self.heuristic.eval(children[heuristic_indices[0]], self.MAX_PLAYER)
+        elif boards:
+            values = self.heuristic.eval_batch(stack_boards(boards), self.MAX_PLAYER)
+            for index, value in zip(heuristic_indices, values):
+                scores[index] = float(value)
+            for key, index in zip(cache_keys, heuristic_indices):
+                self.eval_cache.put(key, scores[index])
+        self.evaluated_states_count += len(children)
+        statistics.leaves += len(children)
+        statistics.eval_time += time.perf_counter() - timer
+        return scores
+
+    def _ordered_actions(self, state: State, tt_action: Optional[Action], depth: int) -> List[Action]:
+        """
+        Generates the actions of a node in search order
+        :param state: the current state of the game
+        :param tt_action: best action stored in the transposition table for the state, searched first
+        :param depth: depth of the node from the root
+        :return: list of ordered actions
+        """
+        timer = time.perf_counter()
+        if self.turn_plies:
+            valid_actions = list(self.prob.macro_actions(state))
+        else:
+            valid_actions = list(self.prob.actions(state))
+        # Effectiveness of pruning - highly dependent of move ordering - the actions are sorted by the scores of the
+        # ordering strategies, compared in priority order (stable - ties keep the generation order)
+        if len(self.move_ordering) == 1:
+            ordering = self.move_ordering[0]
+            valid_actions.sort(key=lambda x: ordering.score(state, x, depth), reverse=True)
+        else:
+            valid_actions.sort(key=lambda x: tuple(o.score(state, x, depth) for o in self.move_ordering),
+                               reverse=True)
+        if tt_action is not None and tt_action in valid_actions:
+            valid_actions.remove(tt_action)
+            valid_actions.insert(0, tt_action)
+        self.statistics.current.movegen_time += time.perf_counter() - timer
+        return valid_actions
+
+    def _record_cutoff(self, state: State, action: Action, depth: int, index: int):
+        """
+        Reports an action causing a cutoff to the move ordering strategies and the search statistics
+        :param state: the state of the node
+        :param action: the action that caused the cutoff
+        :param depth: depth of the node from the root
+        :param index: index of the action in the search order of the node
+        """
+        self.statistics.current.cutoff(index)
+        for ordering in self.move_ordering:
+            ordering.on_cutoff(state, action, depth, self._depth_limit - depth)
+
+    def _probe_transposition_table(self, state: State, depth: int, alpha: float, beta: float) \
+            -> Tuple[Optional[Action], Optional[Tuple[float, Optional[Action]]]]:
+        """
+        Looks up the state in the transposition table
+        :param state: the current state of the game
+        :param depth: depth of recursion of the node
+        :param alpha: alpha value of the node
+        :param beta: beta value of the node
+        :return: the stored best action and the (score, action) result if the stored entry ends the search of the node
+        """
+        if self.transposition_table is None:
+            return None, None
+        entry = self.transposition_table.probe(state.zobrist)
+        if entry is None:
+            return None, None
+
+        # The root always searches its children so that the decided action accounts for the current history
+        if depth > 0 and entry.depth >= self._depth_limit - depth:
+            if (entry.bound == Bound.EXACT
+                    or entry.bound == Bound.LOWER and entry.score >= beta
+                    or entry.bound == Bound.UPPER and entry.score <= alpha):
+                return entry.best_action, (entry.score, entry.best_action)
+        return entry.best_action, None
+
+    def _store_transposition_table(self, state: State, depth: int, score: float, alpha: float, beta: float,
+                                   best_action: Optional[Action]):
+        """
+        Stores the searched node in the transposition table
+        :param state: the searched state
+        :param depth: depth of recursion of the node
+        :param score: the score found for the node
+        :param alpha: alpha value the node was searched with
+        :param beta: beta value the node was searched with
+        :param best_action: the best action found for the node
+        """
+        # Nodes whose children were all skipped by the history carry no information
+        if self.transposition_table is None or best_action is None:
+            return
+        if score <= alpha:
+            bound = Bound.UPPER
+        elif score >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        self.transposition_table.store(state.zobrist, self._depth_limit - depth, score, bound, best_action)
+
     def eval_state(self, state: State, player: int) -> float:
         """
         Evaluates the state using the heuristic
@@ -189,8 +1015,36 @@ class MinimaxAIPlayer(Player):
         :return: float value of the heuristic evaluation
         """
         self.evaluated_states_count += 1
-        if self.prob.terminal_test(state):
-            return self.prob.utility(state, player)
+        statistics = self.statistics.current
+        statistics.leaves += 1
+        timer = time.perf_counter()
+        try:
+            if self.prob.terminal_test(state):
+                return self.prob.utility(state, player)
+            if self.eval_cache is None:
+                return self._eval_heuristic(state, player)
+
+            key = EvalCache.key(state.zobrist, player, self._heuristic_tag)
+            value = self.eval_cache.get(key)
+            if value is not None:
+                self.eval_cache_hits += 1
+                return value
+            self.eval_cache_misses += 1
+            value = self._eval_heuristic(state, player)
+            self.eval_cache.put(key, value)
+            return value
+        finally:
+            statistics.eval_time += time.perf_counter() - timer
+
+    def _eval_heuristic(self, state: State, player: int) -> float:
+        """
+        Evaluates a non-terminal state with the heuristic - from the running totals when they are maintained
+        :param state: the state to be evaluated
+        :param player: the player for which the state is evaluated
+        :return: float value of the heuristic evaluation
+        """
+        if self._features is not None:
+            return self.heuristic.eval_incremental(self._features, state, player)
         return self.heuristic.eval(state, player)
 
     def cutoff_test(self, state: State, depth: int) -> bool:
@@ -200,7 +1054,7 @@ class MinimaxAIPlayer(Player):
         :param depth: the depth of recursion of the node in the game tree
         :return: flag indicating if the search should be cutoff
         """
-        return self.prob.terminal_test(state) or depth == self.max_depth
+        return self.prob.terminal_test(state) or depth == self._depth_limit
 
     def _add_state_to_history(self, state: State):
         """
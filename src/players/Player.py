@@ -18,6 +18,12 @@ class Player(ABC):
     def get_action(self, problem: GameProblem, state: State) -> Action:
         raise NotImplementedError
 
+    def close(self):
+        """
+        Releases the resources held by the player (e.g. worker processes) - called once the game is over
+        """
+        pass
+
     @property
     def average_time_spent_on_actions(self) -> float:
         return self._total_time_spent_on_taking_actions / self._moves_count
@@ -0,0 +1,189 @@
+from typing import Dict, List, Optional, Tuple
+
+from game.MacroAction import MacroAction
+from game.State import State
+from game.Step import Step
+from game_problem.ChineseCheckers import ChineseCheckers
+from game_problem.DistanceTables import distance_tables
+from search.SearchBudget import SearchBudget, SearchTimeout
+
+
+class EndgameSolver:
+    """
+    Exact solver of near-terminal positions - proves a forced win of the player to move in the fewest own turns.
+    Whole turns (macro actions) are searched. A win within n turns is proven by an own turn after which every reply
+    of the opponent leaves a win within n - 1 turns, so the turn limit is raised one at a time and the first proof
+    found is a shortest one.
+    A goal corner is won once it is full, and an own turn fills at most one of its empty cells - positions with more
+    empty goal cells than turns left are dropped without a search. Proven and disproven positions are kept across
+    moves, so the solver follows its proof without searching again.
+    """
+    def __init__(self, problem: ChineseCheckers, max_outside: int = 2, max_turns: int = 4,
+                 node_budget: Optional[int] = 5000, time_budget: Optional[float] = None,
+                 max_entries: int = 2 ** 18):
+        """
+        :param problem: the game problem
+        :param max_outside: the solver takes over once at most this many pegs of the player are outside the goal
+        :param max_turns: longest win searched for, in own turns
+        :param node_budget: number of positions searched per move before giving up - None for no limit
+        :param time_budget: seconds searched per move before giving up - None for no limit
+        :param max_entries: number of stored positions above which the table is cleared
+        """
+        self.prob = problem
+        self.max_outside = max_outside
+        self.max_turns = max_turns
+        self.budget = SearchBudget(time_budget, node_budget)
+        self.max_entries = max_entries
+
+        # Position hash -> (turns, first turn of the proof) of the shortest proven win
+        self._proven: Dict[int, Tuple[int, MacroAction]] = {}
+        # Position hash -> largest number of turns within which no win could be proven
+        self._disproven: Dict[int, int] = {}
+        # Turns left -> opponent reply that last refuted a proof, tried first
+        self._killers: Dict[int, MacroAction] = {}
+        # Player -> empty goal cells of the last position the solver failed on - retried after progress only
+        self._failed_at: Dict[int, int] = {}
+
+        # Statistics
+        self.nodes = 0
+        self.solved = 0
+        self.failed = 0
+
+    @staticmethod
+    def pegs_outside_goal(state: State, player: int) -> int:
+        """
+        Counts the pegs of the player outside its goal corner
+        :param state: the current state of the game
+        :param player: the player
+        :return: number of pegs
+        """
+        in_goal = distance_tables(state.board.triangle_size, player).in_goal
+        return sum(1 for cell in state.board.cells(player) if not in_goal[cell])
+
+    @staticmethod
+    def empty_goal_cells(state: State, player: int) -> int:
+        """
+        Counts the empty cells of the goal corner of the player - a lower bound of the turns it needs to win
+        :param state: the current state of the game
+        :param player: the player
+        :return: number of cells
+        """
+        board = state.board
+        return sum(1 for cell in distance_tables(board.triangle_size, player).targets if board.is_empty(cell))
+
+    def triggered(self, state: State) -> bool:
+        """
+        Checks if the solver takes over the position - at the start of a turn with few pegs left outside the goal.
+        After a failed solve, the player is only solved again once it has filled another goal cell.
+        :param state: the current state of the game
+        :return: boolean value
+        """
+        if state.mode == Step.JUMP or self.pegs_outside_goal(state, state.player) > self.max_outside:
+            return False
+        failed_at = self._failed_at.get(state.player)
+        return failed_at is None or self.empty_goal_cells(state, state.player) < failed_at
+
+    def solve(self, state: State) -> Optional[Tuple[int, MacroAction]]:
+        """
+        Searches for the shortest forced win of the player to move
+        :param state: the current state of the game, at the start of a turn
+        :return: tuple of the number of own turns of the win and the turn to play, None if no win within max_turns
+        could be proven within the budget
+        """
+        if len(self._proven) + len(self._disproven) > self.max_entries:
+            self._proven.clear()
+            self._disproven.clear()
+        self.budget.start()
+        self.budget.active = True
+        try:
+            for turns in range(max(1, self.empty_goal_cells(state, state.player)), self.max_turns + 1):
+                action = self._win_within(state, turns)
+                if action is not None:
+                    self.solved += 1
+                    self._failed_at.pop(state.player, None)
+                    return turns, action
+        except SearchTimeout:
+            pass
+        finally:
+            self.nodes += self.budget.nodes
+            self.budget.active = False
+        self.failed += 1
+        self._failed_at[state.player] = self.empty_goal_cells(state, state.player)
+        return None
+
+    def _win_within(self, state: State, turns: int) -> Optional[MacroAction]:
+        """
+        OR node - the player to move wins within the given number of own turns
+        :param state: the current state of the game, at the start of a turn of the player
+        :param turns: number of own turns left
+        :return: the first turn of a proof, None if there is none
+        """
+        self.budget.check()
+        key = state.zobrist
+        proven = self._proven.get(key)
+        if proven is not None and proven[0] <= turns:
+            return proven[1]
+        if self._disproven.get(key, 0) >= turns:
+            return None
+
+        player = state.player
+        if self.empty_goal_cells(state, player) <= turns:
+            for action in self._ordered_turns(state):
+                child = self.prob.result(state, action)
+                status = child.terminal_status
+                if status == player:
+                    self._proven[key] = (1, action)
+                    return action
+                if status != 0 or turns == 1 or self.empty_goal_cells(child, player) > turns - 1:
+                    continue
+                if self._all_replies_lose(child, player, turns - 1):
+                    self._proven[key] = (turns, action)
+                    return action
+        self._disproven[key] = turns
+        return None
+
+    def _all_replies_lose(self, state: State, player: int, turns: int) -> bool:
+        """
+        AND node - every reply of the opponent leaves the player a win within the given number of turns
+        :param state: the current state of the game, at the start of a turn of the opponent
+        :param player: the proving player
+        :param turns: number of own turns left after the reply
+        :return: boolean value
+        """
+        replies = list(self.prob.macro_actions(state))
+        if not replies:
+            return False
+        killer = self._killers.get(turns)
+        if killer is not None and killer in replies:
+            replies.remove(killer)
+            replies.insert(0, killer)
+
+        for reply in replies:
+            child = self.prob.result(state, reply)
+            status = child.terminal_status
+            if status == player:
+                continue
+            if status != 0 or self._win_within(child, turns) is None:
+                self._killers[turns] = reply
+                return False
+        return True
+
+    def _ordered_turns(self, state: State) -> List[MacroAction]:
+        """
+        Generates the turns of the player to move, the ones entering the goal first and then by the distance gained
+        towards the tip of the goal corner
+        :param state: the current state of the game
+        :return: list of ordered turns
+        """
+        tables = distance_tables(state.board.triangle_size, state.player)
+        in_goal, manhattan_of = tables.in_goal, tables.manhattan_of
+        return sorted(self.prob.macro_actions(state),
+                      key=lambda action: (in_goal[action.src] - in_goal[action.dest],
+                                          manhattan_of[action.dest][0] - manhattan_of[action.src][0]))
+
+    def to_dict(self) -> dict:
+        return {
+            'endgame_solved': self.solved,
+            'endgame_failed': self.failed,
+            'endgame_nodes': self.nodes,
+        }
@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from typing import Optional, Tuple, List
+
+
+class EvalCache:
+    """
+    Bounded cache of heuristic evaluations keyed by (state hash, player, heuristic tag).
+    Holds at most max_entries values - the least recently used value is evicted first.
+    The heuristic is part of the key, so a single cache can be shared by any players - players evaluating for the same
+    side with equally configured heuristics also share their entries. The hits and misses are counted by the players.
+    """
+    def __init__(self, max_entries: int = 2 ** 16):
+        if max_entries <= 0:
+            raise ValueError('The evaluation cache must hold at least one entry')
+        self.max_entries = max_entries
+        self._values: OrderedDict[Tuple[int, int, str], float] = OrderedDict()
+
+    @staticmethod
+    def key(state_hash: int, player: int, heuristic_tag: str) -> Tuple[int, int, str]:
+        """
+        Builds the key of an evaluation
+        :param state_hash: the Zobrist hash of the evaluated state
+        :param player: the player for which the state is evaluated
+        :param heuristic_tag: the tag of the heuristic evaluating the state - equal tags evaluate states equally
+        :return: cache key
+        """
+        return state_hash, player, heuristic_tag
+
+    def get(self, key: Tuple[int, int, str]) -> Optional[float]:
+        """
+        Looks up an evaluation and marks it as recently used
+        :param key: the key of the evaluation
+        :return: the cached value or None if the evaluation is not cached
+        """
+        value = self._values.get(key)
+        if value is not None:
+            self._values.move_to_end(key)
+        return value
+
+    def put(self, key: Tuple[int, int, str], value: float):
+        """
+        Stores an evaluation, evicting the least recently used one when the cache is full
+        :param key: the key of the evaluation
+        :param value: the evaluated value
+        """
+        self._values[key] = value
+        self._values.move_to_end(key)
+        if len(self._values) > self.max_entries:
+            self._values.popitem(last=False)
+
+    def items(self) -> List[Tuple[Tuple[int, int, str], float]]:
+        """
+        Lists the cached evaluations, least recently used first
+        :return: list of (key, value) pairs
+        """
+        return list(self._values.items())
+
+    def clear(self):
+        """
+        Removes all entries
+        """
+        self._values.clear()
+
+    def __len__(self):
+        return len(self._values)
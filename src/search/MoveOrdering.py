@@ -0,0 +1,112 @@
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import List, Dict, Tuple
+
+from game.Action import Action
+from game.State import State
+
+
+class MoveOrdering(ABC):
+    """
+    Strategy scoring the actions of a search node - actions with higher scores are searched first.
+    The search reports the actions causing a cutoff so that stateful strategies can learn from them.
+    """
+    @abstractmethod
+    def score(self, state: State, action: Action, depth: int) -> float:
+        """
+        Scores an action of a node
+        :param state: the state of the node
+        :param action: the action to be scored
+        :param depth: depth of the node from the root
+        :return: ordering score - higher is searched earlier
+        """
+        raise NotImplementedError
+
+    def on_cutoff(self, state: State, action: Action, depth: int, remaining_depth: int):
+        """
+        Called when an action causes an alpha or beta cutoff
+        :param state: the state of the node
+        :param action: the action that caused the cutoff
+        :param depth: depth of the node from the root
+        :param remaining_depth: depth left to search below the node
+        """
+        pass
+
+    def new_search(self):
+        """
+        Called before every root search
+        """
+        pass
+
+
+class StepTypeOrdering(MoveOrdering):
+    """
+    Orders the actions by step type (ends=3, then jumps=2, then crawls=1) - allows to consider the jump ending before
+    the jump backwards
+    """
+    def score(self, state: State, action: Action, depth: int) -> float:
+        return action.step_type
+
+
+class ProgressOrdering(MoveOrdering):
+    """
+    Orders the actions by the Manhattan distance they gain towards the tip of the goal corner of the moving player
+    """
+    def score(self, state: State, action: Action, depth: int) -> float:
+        size = state.board.board_size
+        goal = (0, size - 1) if state.player == 1 else (size - 1, 0)
+        return (abs(action.src[0] - goal[0]) + abs(action.src[1] - goal[1])
+                - abs(action.dest[0] - goal[0]) - abs(action.dest[1] - goal[1]))
+
+
+class KillerMoveOrdering(MoveOrdering):
+    """
+    Searches first the latest actions that caused a cutoff at the same depth in sibling subtrees (killer moves)
+    """
+    def __init__(self, slots: int = 2):
+        self.slots = slots
+        self.killers: Dict[int, List[Action]] = defaultdict(list)
+
+    def score(self, state: State, action: Action, depth: int) -> float:
+        killers = self.killers.get(depth)
+        if killers and action in killers:
+            # The newest killer scores the highest
+            return self.slots - killers.index(action)
+        return 0
+
+    def on_cutoff(self, state: State, action: Action, depth: int, remaining_depth: int):
+        killers = self.killers[depth]
+        if action in killers:
+            killers.remove(action)
+        killers.insert(0, action)
+        del killers[self.slots:]
+
+    def new_search(self):
+        self.killers.clear()
+
+
+class HistoryOrdering(MoveOrdering):
+    """
+    Searches first the (src, dest) moves that caused many cutoffs anywhere in the tree - each cutoff adds the square
+    of the remaining depth, so cutoffs high in the tree count more. The table is halved between searches.
+    """
+    def __init__(self):
+        self.table: Dict[Tuple[Tuple[int, int], Tuple[int, int]], float] = defaultdict(float)
+
+    def score(self, state: State, action: Action, depth: int) -> float:
+        return self.table.get((action.src, action.dest), 0)
+
+    def on_cutoff(self, state: State, action: Action, depth: int, remaining_depth: int):
+        self.table[(action.src, action.dest)] += remaining_depth * remaining_depth
+
+    def new_search(self):
+        for key in self.table:
+            self.table[key] /= 2
+
+
+def default_move_ordering() -> List[MoveOrdering]:
+    """
+    Returns the recommended ordering - killers, then step type, then history and finally the progress of the action
+    :return: list of strategies in priority order
+    """
+    return [KillerMoveOrdering(), StepTypeOrdering(), HistoryOrdering(), ProgressOrdering()]
@@ -0,0 +1,117 @@
+import mmap
+import os
+import struct
+from typing import Dict, Optional
+
+import numpy as np
+
+from game.Action import Action
+from game.State import State
+
+
+class OpeningBook:
+    """
+    Read-only opening book - the best action of searched opening positions keyed by the Zobrist hash of the state.
+    The file is memory-mapped: opening a book only reads its header and a lookup binary-searches the sorted keys in
+    place, so the pages of the book are shared by all processes using it.
+
+    File layout (little endian):
+        header  - magic b'CCOB', format version (u16), triangle size (u8), search depth (u8), tag length (u16) and
+                  number of entries (u32)
+        tag     - UTF-8 tag of the heuristic the positions were searched with
+        entries - sorted by key: key (u64), source row and column, destination row and column, step type (u8 each)
+    """
+    MAGIC = b'CCOB'
+    FORMAT_VERSION = 1
+    HEADER = struct.Struct('<4sHBBHI')
+    ENTRY_DTYPE = np.dtype([('key', '<u8'), ('src', 'u1', 2), ('dest', 'u1', 2), ('step_type', 'u1')])
+
+    def __init__(self, filename: str, triangle_size: Optional[int] = None, tag: Optional[str] = None):
+        """
+        :param filename: the book file
+        :param triangle_size: expected triangle size of the board - None to accept any
+        :param tag: expected tag of the heuristic - None to accept any
+        :raises ValueError: if the file is not a book of the supported format or does not match the expectations
+        """
+        self.filename = filename
+        with open(filename, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._mmap) < self.HEADER.size:
+                raise ValueError(f'{filename} is not an opening book')
+            magic, version, self.triangle_size, self.depth, tag_length, count = \
+                self.HEADER.unpack_from(self._mmap, 0)
+            if magic != self.MAGIC:
+                raise ValueError(f'{filename} is not an opening book')
+            if version != self.FORMAT_VERSION:
+                raise ValueError(f'Unsupported opening book format version {version}')
+            self.tag = bytes(self._mmap[self.HEADER.size:self.HEADER.size + tag_length]).decode('utf-8')
+            self.check(triangle_size, tag)
+            self._entries = np.frombuffer(self._mmap, dtype=self.ENTRY_DTYPE, count=count,
+                                          offset=self.HEADER.size + tag_length)
+        except (ValueError, struct.error):
+            self._mmap.close()
+            raise
+        self._keys = self._entries['key']
+
+    def check(self, triangle_size: Optional[int] = None, tag: Optional[str] = None):
+        """
+        Verifies that the book was built for the given board and heuristic
+        :param triangle_size: triangle size of the board - None to skip the check
+        :param tag: tag of the heuristic - None to skip the check
+        :raises ValueError: if the book does not match
+        """
+        if triangle_size is not None and triangle_size != self.triangle_size:
+            raise ValueError(f'The opening book is for triangle size {self.triangle_size}, not {triangle_size}')
+        if tag is not None and tag != self.tag:
+            raise ValueError(f'The opening book was built with the heuristic {self.tag}, not {tag}')
+
+    def lookup(self, state: State) -> Optional[Action]:
+        """
+        Looks up the book action of a state
+        :param state: the current state of the game
+        :return: the book action or None if the state is not in the book
+        """
+        key = state.zobrist
+        index = int(np.searchsorted(self._keys, np.uint64(key)))
+        if index == len(self._keys) or int(self._keys[index]) != key:
+            return None
+        entry = self._entries[index]
+        src, dest = entry['src'], entry['dest']
+        return Action((int(src[0]), int(src[1])), (int(dest[0]), int(dest[1])), int(entry['step_type']))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def close(self):
+        """
+        Unmaps the book file
+        """
+        # The arrays are views of the mapped memory - they must be released before the map is closed
+        self._entries = self._keys = None
+        self._mmap.close()
+
+    @staticmethod
+    def write(filename: str, actions: Dict[int, Action], triangle_size: int, depth: int, tag: str):
+        """
+        Writes a book file - the file is replaced at once, so a running reader never sees a partial book
+        :param filename: the book file
+        :param actions: state hash -> book action
+        :param triangle_size: triangle size of the board
+        :param depth: search depth of the book actions
+        :param tag: tag of the heuristic the positions were searched with
+        """
+        entries = np.zeros(len(actions), dtype=OpeningBook.ENTRY_DTYPE)
+        for index, key in enumerate(sorted(actions)):
+            action = actions[key]
+            entries[index] = (key, action.src, action.dest, action.step_type)
+        encoded_tag = tag.encode('utf-8')
+        header = OpeningBook.HEADER.pack(OpeningBook.MAGIC, OpeningBook.FORMAT_VERSION, triangle_size, depth,
+                                         len(encoded_tag), len(entries))
+
+        temporary_filename = filename + '.tmp'
+        with open(temporary_filename, 'wb') as file:
+            file.write(header)
+            file.write(encoded_tag)
+            file.write(entries.tobytes())
+        os.replace(temporary_filename, filename)
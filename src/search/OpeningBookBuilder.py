@@ -0,0 +1,86 @@
+import multiprocessing as mp
+import time
+from typing import List, Tuple
+
+from game.Action import Action
+from game.State import State
+from game_problem.ChineseCheckers import ChineseCheckers
+from game_problem.Heuristic import Heuristic
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+from search.OpeningBook import OpeningBook
+
+"""
+Offline builder of opening books - searches every position of the first plies of the game and writes the decided
+actions to a book file.
+"""
+
+
+def book_positions(problem: ChineseCheckers, plies: int) -> List[State]:
+    """
+    Collects the distinct non-terminal states reachable from the initial state in less than the given number of steps
+    :param problem: the game problem
+    :param plies: number of steps covered by the book
+    :return: list of states in the order they are reached
+    """
+    positions = {}
+    frontier = [problem.initial_state()]
+    for _ in range(plies):
+        next_frontier = []
+        for state in frontier:
+            if state.zobrist in positions or problem.terminal_test(state):
+                continue
+            positions[state.zobrist] = state
+            next_frontier.extend(problem.result(state, action) for action in problem.actions(state))
+        frontier = next_frontier
+    return list(positions.values())
+
+
+def _search_position(task: Tuple[ChineseCheckers, Heuristic, int, State]) -> Tuple[int, Action]:
+    """
+    Searches a book position with a fresh player - the book action does not depend on the history of a game
+    :param task: tuple of the game problem, the heuristic, the search depth and the position
+    :return: tuple of the state hash and the decided action
+    """
+    problem, heuristic, depth, state = task
+    player = MinimaxAIPlayer(problem, state.player, depth, heuristic, verbose=False)
+    return state.zobrist, player.alpha_beta_search(state)
+
+
+def build_opening_book(problem: ChineseCheckers, heuristic: Heuristic, depth: int, plies: int, filename: str,
+                       workers: int = 1, verbose: bool = True) -> int:
+    """
+    Searches the opening positions and writes the book
+    :param problem: the game problem
+    :param heuristic: the heuristic of the searches
+    :param depth: search depth of every position
+    :param plies: number of steps from the initial state covered by the book
+    :param filename: the book file
+    :param workers: number of worker processes searching the positions
+    :param verbose: flag to print the progress
+    :return: number of positions in the book
+    """
+    positions = book_positions(problem, plies)
+    tasks = [(problem, heuristic, depth, state) for state in positions]
+    timer = time.perf_counter()
+
+    actions = {}
+    pool = mp.Pool(processes=workers) if workers > 1 else None
+    try:
+        if pool is not None:
+            results = pool.imap_unordered(_search_position, tasks, chunksize=4)
+        else:
+            results = map(_search_position, tasks)
+        for searched, (key, action) in enumerate(results, start=1):
+            if action is not None:
+                actions[key] = action
+            if verbose and searched % 100 == 0:
+                print(f'[{searched}/{len(tasks)}] positions searched')
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    OpeningBook.write(filename, actions, problem.triangle_size, depth, heuristic.tag())
+    if verbose:
+        print(f'Wrote {len(actions)} positions to {filename} in {time.perf_counter() - timer:0.1f}s')
+    return len(actions)
@@ -0,0 +1,178 @@
+import multiprocessing as mp
+import queue
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from game.Action import Action
+from game.BitBoard import stack_boards
+from game.State import State
+from search.SearchBudget import SearchBudget
+from search.SearchStatistics import SearchStatistics
+from search.TranspositionTable import TTEntry
+
+
+@dataclass
+class PonderResult:
+    """
+    Class that represents the pondered search of a position reached by a likely reply of the opponent
+    """
+    state: State  # the position, at the start of a turn of the pondering player
+    action: Optional[Action]  # best action of the deepest completed iteration, None if no iteration completed
+    depth: int  # depth of the deepest completed iteration
+    nodes: int  # searched nodes
+    tt_entries: List[TTEntry] = field(default_factory=list)  # transposition table entries stored by the search
+    evaluations: List[Tuple[int, int, float]] = field(default_factory=list)  # (state hash, player, value) pairs
+
+
+def _likely_replies(searcher, state: State, expected: Optional[State]) -> List[State]:
+    """
+    Lists the positions reached by the turns of the opponent - the expected one first, then the best ones for the
+    opponent by the heuristic
+    :param searcher: the searching player
+    :param state: the position after the move of the player, at the start of a turn of the opponent
+    :param expected: the position after the reply expected by the search of the player, None if unknown
+    :return: the non-terminal positions
+    """
+    problem = searcher.prob
+    children = [problem.result(state, reply) for reply in problem.macro_actions(state)]
+    children = [child for child in children
+                if not problem.terminal_test(child) and (expected is None or child != expected)]
+    if children:
+        values = searcher.heuristic.eval_batch(stack_boards([child.board for child in children]), state.player)
+        children = [children[index] for index in sorted(range(len(children)), key=lambda index: -values[index])]
+    return children if expected is None else [expected] + children
+
+
+def _ponder(config: dict, tasks: mp.Queue, results: mp.Queue, stop_event):
+    """
+    Pondering process - searches the positions after the likely replies of the opponent until the task is stopped.
+    Every searched position is reported as soon as its search ends, the end of the task by a ('done', task id)
+    message.
+    :param config: constructor arguments of the searching player
+    :param tasks: queue of (task id, position after the move of the player, expected position after the reply, state
+    history) tasks, None to exit - the history lists the hashes of the recent states of the player, oldest first
+    :param results: queue of the messages to the player
+    :param stop_event: event stopping the running task
+    """
+    # Imported here - the player module imports this one
+    from players.MinimaxAIPlayer import MinimaxAIPlayer
+
+    searcher = MinimaxAIPlayer(**config)
+    searcher.budget = SearchBudget(stop_event=stop_event)
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        task_id, state, expected, history = task
+        for child in _likely_replies(searcher, state, expected):
+            if stop_event.is_set():
+                break
+            searcher._state_history_set = set(history)
+            searcher._state_history_queue = deque(history)
+            searcher.statistics = SearchStatistics()
+            if searcher.eval_cache is not None:
+                searcher.eval_cache.clear()
+            searcher._completed_depths.clear()
+            action = searcher.alpha_beta_search(child)
+            tt_entries = []
+            if searcher.transposition_table is not None:
+                tt_entries = searcher.transposition_table.entries(searcher.transposition_table.generation)
+            evaluations = []
+            if searcher.eval_cache is not None:
+                evaluations = [(state_hash, player, value)
+                               for (state_hash, player, _), value in searcher.eval_cache.items()]
+            results.put(('position', task_id, PonderResult(child, action, searcher._completed_depths[-1],
+                                                           searcher.budget.nodes, tt_entries, evaluations)))
+        results.put(('done', task_id))
+
+
+class Ponderer:
+    """
+    Searches on the opponent's turn - a background process searches the positions after the likely replies of the
+    opponent while the opponent decides, and the player takes over the results once the reply arrives.
+    The process is started on first use and kept for the whole game, with a transposition table of its own.
+    """
+    def __init__(self, config: dict, stop_timeout: float = 5.0):
+        """
+        :param config: constructor arguments of the searching player - the search depth is the player's
+        :param stop_timeout: seconds to wait for the process to report a stopped task before it is terminated
+        """
+        self.config = config
+        self.stop_timeout = stop_timeout
+        self._process: Optional[mp.Process] = None
+        self._tasks: Optional[mp.Queue] = None
+        self._results: Optional[mp.Queue] = None
+        self._stop_event = None
+        self._task_id = 0
+        self.running = False
+
+    def start(self, state: State, history: List[int], expected: Optional[State] = None):
+        """
+        Starts pondering the replies to the move of the player
+        :param state: the position after the move of the player, at the start of a turn of the opponent
+        :param history: hashes of the recent states of the player, oldest first
+        :param expected: the position after the reply expected by the search of the player, searched first
+        """
+        if self.running:
+            self.finish()
+        if self._process is None or not self._process.is_alive():
+            self._tasks, self._results, self._stop_event = mp.Queue(), mp.Queue(), mp.Event()
+            self._process = mp.Process(target=_ponder, args=(self.config, self._tasks, self._results,
+                                                             self._stop_event), daemon=True)
+            self._process.start()
+        self._task_id += 1
+        self._tasks.put((self._task_id, state, expected, list(history)))
+        self.running = True
+
+    def finish(self, cancel: bool = True) -> List[PonderResult]:
+        """
+        Ends the running task and collects its results
+        :param cancel: flag to stop the searches - otherwise waits until all the likely replies are searched
+        :return: the results of the searched positions, the interrupted search included
+        """
+        if not self.running:
+            return []
+        self.running = False
+        if cancel:
+            self._stop_event.set()
+        results = []
+        deadline = time.perf_counter() + self.stop_timeout if cancel else None
+        while True:
+            try:
+                message = self._results.get(timeout=0.1)
+            except queue.Empty:
+                if self._process.is_alive() and (deadline is None or time.perf_counter() < deadline):
+                    continue
+                # The process died or does not react - it is replaced on the next start
+                self._terminate()
+                break
+            if message[1] != self._task_id:
+                continue
+            if message[0] == 'done':
+                break
+            results.append(message[2])
+        self._stop_event.clear()
+        return results
+
+    def close(self):
+        """
+        Stops the pondering process
+        """
+        if self._process is None:
+            return
+        self.finish()
+        if self._process is not None:
+            self._tasks.put(None)
+            self._process.join(timeout=self.stop_timeout)
+            self._terminate()
+
+    def _terminate(self):
+        """
+        Terminates the pondering process
+        """
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process.join()
+        self._process = None
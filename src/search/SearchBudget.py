@@ -0,0 +1,73 @@
+import time
+from typing import Optional
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the budget of the current move is exhausted
+    """
+    pass
+
+
+class SearchBudget:
+    """
+    Wall-clock and node budget of a single move search, optionally stopped from another process by an event.
+    The clock and the event are only read every check_interval nodes to keep the check cheap.
+    """
+    def __init__(self, time_budget: Optional[float] = None, node_budget: Optional[int] = None,
+                 check_interval: int = 64, stop_event=None):
+        """
+        :param time_budget: seconds per move - None for no limit
+        :param node_budget: searched nodes per move - None for no limit
+        :param check_interval: number of nodes between two readings of the clock and the stop event
+        :param stop_event: multiprocessing event stopping the search once it is set - None for no event
+        """
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        self.check_interval = check_interval
+        self.stop_event = stop_event
+        self.deadline: Optional[float] = None
+        self.nodes = 0
+        self.active = False
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Flag indicating if any budget is configured
+        """
+        return self.time_budget is not None or self.node_budget is not None or self.stop_event is not None
+
+    def start(self):
+        """
+        Starts the budget of a new move - resets the node counter and the deadline
+        """
+        self.nodes = 0
+        self.deadline = time.perf_counter() + self.time_budget if self.time_budget is not None else None
+
+    def check(self):
+        """
+        Counts a searched node and stops the search once the budget is exhausted
+        :raises SearchTimeout: when the time or the node budget is exhausted
+        """
+        self.nodes += 1
+        if not self.active:
+            return
+        if self.node_budget is not None and self.nodes > self.node_budget:
+            raise SearchTimeout()
+        if self.nodes % self.check_interval:
+            return
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchTimeout()
+
+    def exhausted(self) -> bool:
+        """
+        Checks if the budget is already used up - no point in starting another iteration
+        :return: boolean value
+        """
+        if self.node_budget is not None and self.nodes >= self.node_budget:
+            return True
+        if self.stop_event is not None and self.stop_event.is_set():
+            return True
+        return self.deadline is not None and time.perf_counter() > self.deadline
@@ -0,0 +1,166 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+def _add_at(counts: List[int], index: int, amount: int = 1):
+    """
+    Adds to the count at an index of a list, growing the list with zero counts as needed
+    :param counts: the list of counts
+    :param index: index of the count
+    :param amount: the added amount
+    """
+    if index >= len(counts):
+        counts.extend([0] * (index + 1 - len(counts)))
+    counts[index] += amount
+
+
+@dataclass
+class MoveStatistics:
+    """
+    Counters of the search of a single move
+    """
+    nodes_per_depth: List[int] = field(default_factory=list)  # visited nodes by depth from the root
+    leaves: int = 0  # nodes evaluated by the heuristic or the utility
+    cutoffs: int = 0  # beta cutoffs (alpha cutoffs in MIN nodes)
+    cutoff_index_counts: List[int] = field(default_factory=list)  # cutoffs by search order index of the cutting move
+    history_pruned: int = 0  # children skipped because they repeat a recent state
+    movegen_time: float = 0.0  # seconds spent generating and ordering actions
+    eval_time: float = 0.0  # seconds spent evaluating leaves
+    search_time: float = 0.0  # seconds spent on the whole search of the move
+    researches: int = 0  # null-window searches of the principal variation search repeated with the full window
+    aspiration_failures: int = 0  # root searches repeated because the score fell outside the aspiration window
+    # Visited nodes by depth of the last completed iteration of iterative deepening - empty for a single search
+    iteration_nodes_per_depth: List[int] = field(default_factory=list)
+
+    def node(self, depth: int):
+        """
+        Counts a visited node
+        :param depth: depth of the node from the root
+        """
+        _add_at(self.nodes_per_depth, depth)
+
+    def cutoff(self, index: int):
+        """
+        Counts a cutoff
+        :param index: index of the action causing the cutoff in the search order of the node - 0 when the first
+        searched action cuts off, as with a perfect move ordering
+        """
+        self.cutoffs += 1
+        _add_at(self.cutoff_index_counts, index)
+
+    def complete_iteration(self, nodes_before: List[int]):
+        """
+        Records the node counts of a completed iteration of iterative deepening
+        :param nodes_before: copy of nodes_per_depth taken before the iteration started
+        """
+        self.iteration_nodes_per_depth = [nodes - (nodes_before[depth] if depth < len(nodes_before) else 0)
+                                          for depth, nodes in enumerate(self.nodes_per_depth)]
+
+    def merge(self, other: 'MoveStatistics'):
+        """
+        Adds the counters of another search of the same move, e.g. of a root-parallel worker
+        :param other: the counters to be added
+        """
+        for depth, nodes in enumerate(other.nodes_per_depth):
+            _add_at(self.nodes_per_depth, depth, nodes)
+        for index, cutoffs in enumerate(other.cutoff_index_counts):
+            _add_at(self.cutoff_index_counts, index, cutoffs)
+        self.cutoffs += other.cutoffs
+        self.leaves += other.leaves
+        self.history_pruned += other.history_pruned
+        self.movegen_time += other.movegen_time
+        self.eval_time += other.eval_time
+        self.search_time += other.search_time
+        self.researches += other.researches
+        self.aspiration_failures += other.aspiration_failures
+
+    @property
+    def nodes(self) -> int:
+        return sum(self.nodes_per_depth)
+
+    @property
+    def effective_branching_factor(self) -> Optional[float]:
+        """
+        Effective branching factor - the b for which the root visits of the search would grow into the visited nodes
+        of the deepest level as b ** depth. With iterative deepening, only the nodes of the last completed iteration
+        are counted - the earlier iterations visit the root again but not the deepest level. None for a search that
+        did not expand the root
+        """
+        counts = self.iteration_nodes_per_depth or self.nodes_per_depth
+        depth = len(counts) - 1
+        if depth < 1 or not counts[0]:
+            return None
+        return (counts[depth] / counts[0]) ** (1 / depth)
+
+    def to_dict(self) -> dict:
+        return {
+            'nodes_per_depth': list(self.nodes_per_depth),
+            'leaves': self.leaves,
+            'cutoffs': self.cutoffs,
+            'cutoff_index_counts': list(self.cutoff_index_counts),
+            'history_pruned': self.history_pruned,
+            'movegen_time': self.movegen_time,
+            'eval_time': self.eval_time,
+            'search_time': self.search_time,
+            'researches': self.researches,
+            'aspiration_failures': self.aspiration_failures,
+            'iteration_nodes_per_depth': list(self.iteration_nodes_per_depth),
+            'effective_branching_factor': self.effective_branching_factor,
+        }
+
+
+class SearchStatistics:
+    """
+    Search statistics of a player - the counters of every searched move and their totals over the game
+    """
+    def __init__(self):
+        self.moves: List[MoveStatistics] = []
+        # Counters of the running search - also collects the counts of a search outside of begin/end_move
+        self.current = MoveStatistics()
+
+    def begin_move(self):
+        """
+        Starts the counters of a new move
+        """
+        self.current = MoveStatistics()
+
+    def end_move(self) -> MoveStatistics:
+        """
+        Records the counters of the finished move
+        :return: the counters of the move
+        """
+        self.moves.append(self.current)
+        return self.current
+
+    def totals(self) -> MoveStatistics:
+        """
+        Sums the counters of all recorded moves
+        :return: the summed counters
+        """
+        total = MoveStatistics()
+        for move in self.moves:
+            total.merge(move)
+        return total
+
+    def to_dict(self) -> dict:
+        total = self.totals()
+        branching_factors = [move.effective_branching_factor for move in self.moves
+                             if move.effective_branching_factor is not None]
+        return {
+            'search_nodes': total.nodes,
+            'search_nodes_per_depth': total.nodes_per_depth,
+            'search_leaves': total.leaves,
+            'search_cutoffs': total.cutoffs,
+            'search_cutoff_index_counts': total.cutoff_index_counts,
+            'search_first_move_cutoff_rate':
+                total.cutoff_index_counts[0] / total.cutoffs if total.cutoffs else None,
+            'search_history_pruned': total.history_pruned,
+            'search_movegen_time': total.movegen_time,
+            'search_eval_time': total.eval_time,
+            'search_time': total.search_time,
+            'search_researches': total.researches,
+            'search_aspiration_failures': total.aspiration_failures,
+            'search_effective_branching_factor':
+                sum(branching_factors) / len(branching_factors) if branching_factors else None,
+            'search_moves': [move.to_dict() for move in self.moves],
+        }
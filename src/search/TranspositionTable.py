@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from typing import Optional, Dict, List
+
+from game.Action import Action
+
+
+class Bound:
+    """
+    Class that represents the type of bound a stored score is
+    """
+    EXACT = 0  # the score is the minimax value of the node
+    LOWER = 1  # the search failed high - the value is at least the score
+    UPPER = 2  # the search failed low - the value is at most the score
+
+
+@dataclass(frozen=True)
+class TTEntry:
+    """
+    Class that represents an entry of the transposition table
+    """
+    key: int  # full state hash - verifies the slot belongs to the probed state
+    depth: int  # remaining search depth below the stored node
+    score: float  # score from the point of view of the MAX player
+    bound: int  # bound type of the score (EXACT, LOWER, UPPER)
+    best_action: Optional[Action]  # best action found - searched first on later visits
+    generation: int  # search generation in which the entry was stored
+
+
+class TranspositionTable:
+    """
+    Bounded hash table of searched positions keyed by the Zobrist hash of the state.
+    Holds at most max_entries slots - a new entry colliding with an occupied slot is kept according to the policy:
+        'depth'  - keep the deeper search, but always replace entries left over from older searches
+        'always' - always keep the newest entry
+    """
+    POLICIES = ('depth', 'always')
+
+    def __init__(self, max_entries: int = 2 ** 18, policy: str = 'depth'):
+        if max_entries <= 0:
+            raise ValueError('The transposition table must hold at least one entry')
+        if policy not in self.POLICIES:
+            raise ValueError(f'Unsupported replacement policy: {policy}')
+        self.max_entries = max_entries
+        self.policy = policy
+        self.generation = 0
+        self._slots: Dict[int, TTEntry] = {}
+
+        # Statistics
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self):
+        """
+        Marks the start of a new root search - entries stored before become replaceable.
+        """
+        self.generation += 1
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        """
+        Looks up the entry of a state
+        :param key: the Zobrist hash of the state
+        :return: the stored entry or None if the state is not in the table
+        """
+        self.probes += 1
+        entry = self._slots.get(key % self.max_entries)
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, score: float, bound: int, best_action: Optional[Action]):
+        """
+        Stores the result of a search, subject to the replacement policy
+        :param key: the Zobrist hash of the state
+        :param depth: remaining search depth below the node
+        :param score: score of the node
+        :param bound: bound type of the score
+        :param best_action: the best action found in the node
+        """
+        index = key % self.max_entries
+        current = self._slots.get(index)
+        if (self.policy == 'depth' and current is not None and current.key != key
+                and current.generation == self.generation and current.depth > depth):
+            return
+        self._slots[index] = TTEntry(key, depth, score, bound, best_action, self.generation)
+        self.stores += 1
+
+    def entries(self, generation: Optional[int] = None) -> List[TTEntry]:
+        """
+        Lists the stored entries
+        :param generation: only the entries stored in this search generation - None for all of them
+        :return: list of entries
+        """
+        return [entry for entry in self._slots.values() if generation is None or entry.generation == generation]
+
+    def merge(self, entries: List[TTEntry]):
+        """
+        Stores the entries of another table, e.g. of a search in another process, subject to the replacement policy
+        :param entries: the entries to be stored
+        """
+        for entry in entries:
+            self.store(entry.key, entry.depth, entry.score, entry.bound, entry.best_action)
+
+    def clear(self):
+        """
+        Removes all entries and resets the statistics
+        """
+        self._slots.clear()
+        self.generation = 0
+        self.probes = self.hits = self.stores = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Ratio of probes that found the state in the table
+        """
+        return self.hits / self.probes if self.probes else 0.0
+
+    def __len__(self):
+        return len(self._slots)
+
+    def to_dict(self) -> dict:
+        return {
+            'tt_probes': self.probes,
+            'tt_hit_rate': self.hit_rate,
+            'tt_entries': len(self),
+        }
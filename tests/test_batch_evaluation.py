@@ -0,0 +1,71 @@
+import random
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from game.BitBoard import stack_boards
+from game_problem.ChineseCheckers import ChineseCheckers
+from game_problem.Heuristic import AverageManhattanToCornerHeuristic, AverageManhattanToEachCornerHeuristic, \
+    AverageEuclideanToCornerHeuristic, AverageEuclideanToEachCornerHeuristic, MaxManhattanToCornerHeuristic, \
+    SumOfPegsInCornerHeuristic, WeightedHeuristic, NoneHeuristic, Heuristic
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+
+
+def build_weighted_heuristic():
+    return WeightedHeuristic([
+        (SumOfPegsInCornerHeuristic(), 0.1),
+        (AverageManhattanToEachCornerHeuristic(), 0.3),
+        (AverageEuclideanToEachCornerHeuristic(), 0.4),
+        (MaxManhattanToCornerHeuristic(), 0.2),
+    ])
+
+
+def random_states(problem: ChineseCheckers, count: int, seed: int):
+    rng = random.Random(seed)
+    state = problem.initial_state()
+    states = []
+    for _ in range(count):
+        state = problem.result(state, rng.choice(list(problem.actions(state))))
+        states.append(state)
+    return states
+
+
+class TestBatchEvaluation(unittest.TestCase):
+    @parameterized.expand([
+        (AverageManhattanToCornerHeuristic(),),
+        (AverageManhattanToEachCornerHeuristic(),),
+        (AverageEuclideanToCornerHeuristic(),),
+        (AverageEuclideanToEachCornerHeuristic(),),
+        (MaxManhattanToCornerHeuristic(),),
+        (SumOfPegsInCornerHeuristic(),),
+        (NoneHeuristic(),),
+        (build_weighted_heuristic(),),
+    ])
+    def test_batch_matches_evaluation(self, heuristic: Heuristic):
+        for triangle_size in (2, 3, 4):
+            problem = ChineseCheckers(triangle_size, bitboard=True)
+            states = random_states(problem, 200, triangle_size)
+            boards = stack_boards([state.board for state in states])
+            for player in (1, 2):
+                values = heuristic.eval_batch(boards, player)
+                expected = [heuristic.eval(state, player) for state in states]
+                np.testing.assert_allclose(values, expected, atol=1e-9)
+
+    def test_stack_boards_matches_matrices(self):
+        for triangle_size in (3, 4):
+            states = random_states(ChineseCheckers(triangle_size, bitboard=True), 50, 7)
+            bitboards = [state.board for state in states]
+            boards = [bitboard.to_board() for bitboard in bitboards]
+            np.testing.assert_array_equal(stack_boards(bitboards), np.stack([board.matrix for board in boards]))
+            np.testing.assert_array_equal(stack_boards(boards), stack_boards(bitboards))
+
+    @parameterized.expand([(2,), (3,)])
+    def test_batch_search_decides_the_same_actions(self, max_depth: int):
+        problem = ChineseCheckers(3, bitboard=True)
+        for state in random_states(problem, 6, 11):
+            batched = MinimaxAIPlayer(problem, state.player, max_depth, build_weighted_heuristic(), verbose=False,
+                                      tt_size=0, batch_eval=True)
+            sequential = MinimaxAIPlayer(problem, state.player, max_depth, build_weighted_heuristic(), verbose=False,
+                                         tt_size=0)
+            self.assertEqual(batched.get_action(problem, state), sequential.get_action(problem, state))
@@ -0,0 +1,90 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from game.BitBoard import BitBoard
+from game.Board import Board
+from game.State import State
+from game_problem.ChineseCheckers import ChineseCheckers
+from game_problem.Heuristic import AverageManhattanToCornerHeuristic, AverageEuclideanToCornerHeuristic, \
+    AverageEuclideanToEachCornerHeuristic, AverageManhattanToEachCornerHeuristic, MaxManhattanToCornerHeuristic, \
+    SumOfPegsInCornerHeuristic, Heuristic
+
+
+MIDGAME_MATRIX = np.array([
+    [0, 0, 0, 0, 2, 2, 2],
+    [0, 0, 0, 0, 0, 2, 2],
+    [0, 0, 0, 1, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 2, 0, 0, 0],
+    [1, 1, 0, 0, 0, 0, 0],
+    [1, 1, 1, 0, 0, 0, 0],
+])
+
+
+class TestBitBoard(unittest.TestCase):
+    def test_initial_board_matches_matrix_board(self):
+        board = Board(3)
+        bitboard = BitBoard(3)
+
+        self.assertTrue(np.array_equal(board.matrix, bitboard.matrix))
+        self.assertEqual(BitBoard.from_board(board), bitboard)
+
+    def test_moved_is_immutable(self):
+        bitboard = BitBoard(2)
+        moved = bitboard.moved((3, 0), (2, 0))
+
+        self.assertEqual(bitboard[3, 0], 1)
+        self.assertEqual(bitboard[2, 0], 0)
+        self.assertEqual(moved[3, 0], 0)
+        self.assertEqual(moved[2, 0], 1)
+        self.assertNotEqual(hash(bitboard), hash(moved))
+
+    def test_actions_match_matrix_backend(self):
+        matrix_problem = ChineseCheckers(3)
+        bit_problem = ChineseCheckers(3, bitboard=True)
+        matrix_state = matrix_problem.initial_state()
+        bit_state = bit_problem.initial_state()
+
+        # Follow the same line of play on both backends and compare the generated actions at every ply
+        for _ in range(20):
+            matrix_actions = list(matrix_problem.actions(matrix_state))
+            bit_actions = list(bit_problem.actions(bit_state))
+            self.assertEqual(matrix_actions, bit_actions)
+
+            action = max(matrix_actions)
+            matrix_state = matrix_problem.result(matrix_state, action)
+            bit_state = bit_problem.result(bit_state, action)
+            self.assertTrue(np.array_equal(matrix_state.board.matrix, bit_state.board.matrix))
+            self.assertEqual(matrix_state.player, bit_state.player)
+
+    def test_terminal_test_matches_matrix_backend(self):
+        sut = ChineseCheckers(2, bitboard=True)
+        matrix = np.array([
+            [0, 0, 0, 1, 1],
+            [0, 0, 0, 0, 1],
+            [2, 0, 0, 0, 0],
+            [2, 0, 0, 0, 0],
+            [2, 1, 0, 0, 0],
+        ])
+        state = State(BitBoard(2, matrix=matrix))
+
+        self.assertTrue(sut.terminal_test(state))
+        self.assertEqual(sut.utility(state, player=1), 1)
+        self.assertFalse(sut.terminal_test(sut.initial_state()))
+
+    @parameterized.expand([
+        AverageManhattanToCornerHeuristic(),
+        AverageManhattanToEachCornerHeuristic(),
+        AverageEuclideanToCornerHeuristic(),
+        AverageEuclideanToEachCornerHeuristic(),
+        MaxManhattanToCornerHeuristic(),
+        SumOfPegsInCornerHeuristic(),
+    ])
+    def test_heuristics_match_matrix_backend(self, heuristic: Heuristic):
+        matrix_state = State(Board(3, matrix=MIDGAME_MATRIX.copy()))
+        bit_state = State(BitBoard(3, matrix=MIDGAME_MATRIX))
+
+        for player in (1, 2):
+            self.assertAlmostEqual(heuristic.eval(matrix_state, player), heuristic.eval(bit_state, player))
@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from game.Board import Board, top_right_corner_coords, bot_left_corner_coords
+from game_problem.DistanceTables import distance_tables
+
+
+class TestDistanceTables(unittest.TestCase):
+    @parameterized.expand([(2, 1), (3, 1), (3, 2), (4, 2)])
+    def test_tables_hold_the_distances_to_every_goal_cell(self, triangle_size: int, player: int):
+        tables = distance_tables(triangle_size, player)
+        board_size = triangle_size * 2 + 1
+        corner = top_right_corner_coords(triangle_size, board_size) if player == 1 \
+            else bot_left_corner_coords(triangle_size, board_size)
+
+        np.testing.assert_array_equal(tables.goal_cells, corner)
+        for i in range(board_size):
+            for j in range(board_size):
+                np.testing.assert_array_equal(tables.manhattan[i, j], np.sum(np.abs(corner - (i, j)), axis=1))
+                np.testing.assert_allclose(tables.euclidean[i, j], np.linalg.norm(corner - (i, j), axis=1))
+                self.assertEqual(tables.manhattan_of[(i, j)], tuple(tables.manhattan[i, j]))
+
+    def test_normalization_constants(self):
+        tables = distance_tables(3, 1)
+        self.assertEqual(tables.peg_count, 6)
+        self.assertEqual(tables.manhattan_norm, 14)
+        self.assertEqual(tables.max_manhattan, 12)
+        diffs = bot_left_corner_coords(3, 7) - [0, 6]
+        self.assertAlmostEqual(tables.initial_avg_euclidean, np.mean(np.linalg.norm(diffs, axis=1)))
+        self.assertEqual(tables.initial_avg_euclidean, distance_tables(3, 2).initial_avg_euclidean)
+
+    def test_tables_are_shared(self):
+        self.assertIs(distance_tables(3, 1), distance_tables(3, 1))
+        self.assertIsNot(distance_tables(3, 1), distance_tables(3, 2))
+
+    def test_target_index_skips_occupied_goal_cells(self):
+        tables = distance_tables(3, 1)
+        board = Board(3)
+        # The goal corner of player 1 is full of pegs of player 2
+        self.assertEqual(tables.target_index(board), 0)
+        board.move((0, 6), (3, 3))
+        self.assertEqual(tables.target_index(board), tables.targets.index((0, 6)))
+        self.assertEqual(tables.empty_target_indices(board), [tables.targets.index((0, 6))])
@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from benchmarking.Tournament import HEURISTICS
+from game.BitBoard import BitBoard
+from game.Board import Board
+from game.State import State
+from game.Step import Step
+from game_problem.ChineseCheckers import ChineseCheckers
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+from search.EndgameSolver import EndgameSolver
+
+# Pegs of player 2 far from both goal corners
+FAR_PEGS = [(2, 0), (2, 1), (3, 0), (3, 1), (1, 0), (1, 1)]
+
+
+def build_state(pegs1, pegs2, player=1) -> State:
+    matrix = np.zeros((7, 7), dtype=int)
+    for cell in pegs1:
+        matrix[cell] = 1
+    for cell in pegs2:
+        matrix[cell] = 2
+    return State(BitBoard.from_board(Board(3, matrix=matrix)), player)
+
+
+class TestEndgameSolver(unittest.TestCase):
+    def setUp(self):
+        self.problem = ChineseCheckers(3, bitboard=True)
+
+    @parameterized.expand([
+        ('one_turn', [(0, 4), (0, 5), (0, 6), (1, 5), (1, 6), (3, 6)], 1),
+        ('two_turns', [(0, 5), (0, 6), (1, 5), (1, 6), (3, 6), (1, 4)], 2),
+        ('three_turns', [(0, 5), (0, 6), (1, 5), (3, 6), (1, 4), (2, 4)], 3),
+    ])
+    def test_shortest_forced_win(self, _, pegs, turns):
+        solver = EndgameSolver(self.problem, node_budget=None)
+        state = build_state(pegs, FAR_PEGS)
+
+        solved_turns, action = solver.solve(state)
+
+        self.assertEqual(solved_turns, turns)
+        # Following the proof against any replies wins in the proven number of turns
+        for turn in range(turns):
+            state = self.problem.result(state, action)
+            if turn == turns - 1:
+                break
+            self.assertFalse(self.problem.terminal_test(state))
+            state = self.problem.result(state, next(iter(self.problem.macro_actions(state))))
+            solved_turns, action = solver.solve(state)
+            self.assertEqual(solved_turns, turns - turn - 1)
+        self.assertEqual(state.terminal_status, 1)
+
+    def test_no_win_when_the_opponent_wins_first(self):
+        solver = EndgameSolver(self.problem, node_budget=None)
+        # Player 2 fills its goal with its next crawl, player 1 needs two turns
+        state = build_state([(0, 5), (0, 6), (1, 5), (1, 6), (3, 6), (1, 4)],
+                            [(5, 0), (5, 1), (6, 0), (6, 1), (6, 2), (3, 0)])
+
+        self.assertIsNone(solver.solve(state))
+        self.assertEqual(solver.failed, 1)
+        # Not retried before another goal cell is filled
+        self.assertFalse(solver.triggered(state))
+
+    def test_trigger(self):
+        solver = EndgameSolver(self.problem, max_outside=1)
+
+        self.assertFalse(solver.triggered(self.problem.initial_state()))
+        self.assertTrue(solver.triggered(build_state([(0, 4), (0, 5), (0, 6), (1, 5), (1, 6), (3, 6)], FAR_PEGS)))
+        self.assertFalse(solver.triggered(build_state([(0, 5), (0, 6), (1, 5), (1, 6), (3, 6), (1, 4)], FAR_PEGS)))
+
+    def test_player_plays_the_solved_turn(self):
+        player = MinimaxAIPlayer(self.problem, 1, 6, HEURISTICS['Weighted'](), verbose=False,
+                                 endgame_solver=EndgameSolver(self.problem, max_outside=3))
+        state = build_state([(0, 5), (0, 6), (1, 5), (3, 6), (1, 4), (2, 4)], FAR_PEGS)
+
+        # The first turn of the proof is a jump - played one step per call
+        action = player.get_action(self.problem, state)
+        self.assertEqual((action.src, action.dest, action.step_type), ((2, 4), (0, 4), Step.JUMP))
+        state = self.problem.result(state, action)
+        action = player.get_action(self.problem, state)
+        self.assertEqual(action.step_type, Step.END)
+
+        self.assertEqual(player.evaluated_states_count, 0)
+        self.assertEqual(player.to_dict()['endgame_moves'], 1)
+        self.assertEqual(player.to_dict()['endgame_solved'], 1)
@@ -0,0 +1,76 @@
+import unittest
+
+from parameterized import parameterized
+
+from game_problem.ChineseCheckers import ChineseCheckers
+from game_problem.Heuristic import WeightedHeuristic, SumOfPegsInCornerHeuristic, AverageManhattanToCornerHeuristic
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+from search.EvalCache import EvalCache
+
+
+def build_heuristic():
+    return WeightedHeuristic([
+        (SumOfPegsInCornerHeuristic(), 0.3),
+        (AverageManhattanToCornerHeuristic(), 0.7),
+    ])
+
+
+class TestEvalCache(unittest.TestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        sut = EvalCache(max_entries=2)
+        sut.put((1, 1, 'h'), 0.1)
+        sut.put((2, 1, 'h'), 0.2)
+        self.assertEqual(sut.get((1, 1, 'h')), 0.1)  # (2, 1, 'h') becomes the least recently used
+
+        sut.put((3, 1, 'h'), 0.3)
+
+        self.assertIsNone(sut.get((2, 1, 'h')))
+        self.assertEqual(sut.get((3, 1, 'h')), 0.3)
+        self.assertEqual(len(sut), 2)
+
+    def test_key_distinguishes_players_and_heuristics(self):
+        # Equally configured heuristics share the key, other weights do not
+        tag1, tag2 = build_heuristic().tag(), build_heuristic().tag()
+        other_tag = SumOfPegsInCornerHeuristic().tag()
+        self.assertEqual(EvalCache.key(5, 1, tag1), EvalCache.key(5, 1, tag2))
+        self.assertNotEqual(EvalCache.key(5, 1, tag1), EvalCache.key(5, 2, tag1))
+        self.assertNotEqual(EvalCache.key(5, 1, tag1), EvalCache.key(5, 1, other_tag))
+
+    @parameterized.expand([(False,), (True,)])
+    def test_cached_search_decides_the_same_actions(self, batch_eval: bool):
+        problem = ChineseCheckers(3, bitboard=True)
+        heuristic = build_heuristic()
+        eval_cache = EvalCache()
+        cached = MinimaxAIPlayer(problem, 1, 3, heuristic, verbose=False, tt_size=0, eval_cache=eval_cache,
+                                 batch_eval=batch_eval)
+        uncached = MinimaxAIPlayer(problem, 1, 3, heuristic, verbose=False, tt_size=0, batch_eval=batch_eval)
+
+        state = problem.initial_state()
+        for _ in range(4):
+            action = cached.get_action(problem, state)
+            self.assertEqual(action, uncached.get_action(problem, state))
+            state = problem.result(state, action)
+
+        # Later searches revisit the leaves of the previous ones
+        self.assertGreater(cached.eval_cache_hits, 0)
+        self.assertIn('eval_cache_hit_rate', cached.to_dict())
+
+    def test_players_share_the_cache(self):
+        problem = ChineseCheckers(3, bitboard=True)
+        eval_cache = EvalCache()
+        # Separate but equally configured heuristic objects
+        first = MinimaxAIPlayer(problem, 1, 2, build_heuristic(), verbose=False, tt_size=0, eval_cache=eval_cache)
+        second = MinimaxAIPlayer(problem, 1, 2, build_heuristic(), verbose=False, tt_size=0, eval_cache=eval_cache)
+        state = problem.initial_state()
+
+        first.get_action(problem, state)
+        entries = len(eval_cache)
+        second.get_action(problem, state)
+
+        self.assertEqual(len(eval_cache), entries)
+        self.assertEqual(second.eval_cache_misses, 0)
+        self.assertGreater(second.eval_cache_hits, 0)
+        # The lookups are counted per player
+        self.assertEqual(first.eval_cache_hits + first.eval_cache_misses, first.evaluated_states_count)
+        self.assertEqual(first.to_dict()['eval_cache_misses'], first.eval_cache_misses)
+        self.assertNotEqual(first.to_dict()['eval_cache_hits'], second.to_dict()['eval_cache_hits'])
@@ -0,0 +1,56 @@
+import random
+import unittest
+from unittest import mock
+
+from parameterized import parameterized
+
+from game.Board import Board
+from game.State import State
+from game_problem.ChineseCheckers import ChineseCheckers
+from game_problem.Heuristic import AverageManhattanToCornerHeuristic, AverageManhattanToEachCornerHeuristic, \
+    AverageEuclideanToCornerHeuristic, AverageEuclideanToEachCornerHeuristic, MaxManhattanToCornerHeuristic, \
+    SumOfPegsInCornerHeuristic, WeightedHeuristic, Heuristic
+
+
+class PegCountHeuristic(Heuristic):
+    """
+    Heuristic without a shared form - evaluated through the fallback
+    """
+    def eval(self, state: State, player: int) -> float:
+        return len(state.board.pegs(player)) / 10
+
+
+def composed_eval(weighted_heuristics, state: State, player: int) -> float:
+    total = 0
+    for heuristic, weight in weighted_heuristics:
+        total += round(heuristic.eval(state, player), 4) * weight
+    return total
+
+
+class TestFusedWeightedHeuristic(unittest.TestCase):
+    @parameterized.expand([
+        ([(SumOfPegsInCornerHeuristic(), 0.1), (AverageManhattanToEachCornerHeuristic(), 0.3),
+          (AverageEuclideanToEachCornerHeuristic(), 0.4), (MaxManhattanToCornerHeuristic(), 0.2)],),
+        ([(AverageManhattanToCornerHeuristic(), 0.5), (AverageEuclideanToCornerHeuristic(), 0.3),
+          (PegCountHeuristic(), 0.2)],),
+    ])
+    def test_fused_matches_composition(self, weighted_heuristics):
+        heuristic = WeightedHeuristic(weighted_heuristics)
+        for triangle_size in (2, 3, 4):
+            problem = ChineseCheckers(triangle_size, bitboard=True)
+            rng = random.Random(triangle_size)
+            state = problem.initial_state()
+            for _ in range(300):
+                state = problem.result(state, rng.choice(list(problem.actions(state))))
+                for player in (1, 2):
+                    self.assertEqual(heuristic.eval(state, player), composed_eval(weighted_heuristics, state, player))
+
+    def test_components_share_the_peg_positions(self):
+        problem = ChineseCheckers(3)
+        heuristic = WeightedHeuristic([
+            (AverageManhattanToCornerHeuristic(), 0.25), (AverageEuclideanToEachCornerHeuristic(), 0.25),
+            (MaxManhattanToCornerHeuristic(), 0.25), (AverageManhattanToEachCornerHeuristic(), 0.25)
+        ])
+        with mock.patch.object(Board, 'pegs', autospec=True, side_effect=Board.pegs) as pegs:
+            heuristic.eval(problem.initial_state(), 1)
+        self.assertEqual(pegs.call_count, 1)
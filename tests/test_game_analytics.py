@@ -0,0 +1,68 @@
+import json
+import multiprocessing as mp
+import os
+import tempfile
+import unittest
+
+from benchmarking.GameAnalytics import GameAnalytics
+
+
+def game(index: int) -> dict:
+    return {'game_duration': 1.0, 'total_turns': index, 'winner': 1,
+            'players': [{'player_type': 'minimax', 'player_id': 1, 'max_depth': 2, 'expanded_states': 10,
+                         'average_time_per_action': 0.1, 'move_count': 5}]}
+
+
+def append_games(task):
+    filename, start = task
+    analytics = GameAnalytics(filename)
+    for index in range(start, start + 25):
+        analytics.add_games([game(index)])
+
+
+class TestGameAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'games.jsonl')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_games_are_appended_one_per_line(self):
+        sut = GameAnalytics(self.filename)
+        sut.add_games([game(1), game(2)])
+        sut.add_games([game(3)])
+
+        with open(self.filename) as file:
+            self.assertEqual(len(file.readlines()), 3)
+        self.assertEqual([record['total_turns'] for record in GameAnalytics(self.filename).iter_games()], [1, 2, 3])
+        self.assertEqual(GameAnalytics(self.filename).last_game()['total_turns'], 3)
+
+    def test_legacy_json_is_migrated(self):
+        legacy = os.path.join(self.directory.name, 'games.json')
+        with open(legacy, 'w') as file:
+            json.dump({'games': [game(1), game(2)]}, file, indent=4)
+
+        # Opening the records file leaves the legacy file alone
+        self.assertEqual(list(GameAnalytics(self.filename).iter_games()), [])
+        sut = GameAnalytics(self.filename)
+        sut.migrate(legacy)
+
+        self.assertEqual([record['total_turns'] for record in sut.iter_games()], [1, 2])
+        self.assertEqual(sut.last_game()['total_turns'], 2)
+        self.assertEqual(GameAnalytics.load_from_file(legacy), GameAnalytics.load_from_file(self.filename))
+
+    def test_line_cut_short_by_a_writer_is_skipped(self):
+        sut = GameAnalytics(self.filename)
+        sut.add_games([game(1)])
+        with open(self.filename, 'a') as file:
+            file.write(json.dumps(game(2))[:20])
+
+        self.assertEqual([record['total_turns'] for record in sut.iter_games()], [1])
+
+    def test_concurrent_writers(self):
+        with mp.Pool(4) as pool:
+            pool.map(append_games, [(self.filename, start) for start in range(0, 100, 25)])
+
+        turns = sorted(record['total_turns'] for record in GameAnalytics(self.filename).iter_games())
+        self.assertEqual(turns, list(range(100)))
@@ -0,0 +1,55 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from GameController import GameController
+from players.MCTSPlayer import MCTSPlayer
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code: str, cwd: str = ROOT) -> str:
+    return subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=cwd).stdout
+
+
+class TestHeadlessStartup(unittest.TestCase):
+    def test_game_controller_does_not_load_pygame_or_matplotlib(self):
+        output = run_python('import sys; sys.path.append("src"); import GameController; '
+                            'print("pygame" in sys.modules, "matplotlib" in sys.modules)')
+
+        self.assertEqual(output.strip(), 'False False')
+
+    def test_headless_controller_creates_no_gui(self):
+        # The controller opens the analytics file of the working directory - kept away from the game data of the repo
+        src = os.path.join(ROOT, 'src')
+        with tempfile.TemporaryDirectory() as directory:
+            output = run_python(f'import sys, argparse; sys.path.append({src!r}); '
+                                'from GameController import GameController; '
+                                'args = argparse.Namespace(first_player=None, second_player=None); '
+                                'controller = GameController(verbose=False, use_graphics=False, args=args); '
+                                'print(controller.gui, "pygame" in sys.modules)', cwd=directory)
+
+        self.assertEqual(output.strip(), 'None False')
+
+    def test_headless_rejects_human_player(self):
+        result = subprocess.run([sys.executable, 'main.py', '--headless', '--first-player', 'human',
+                                 '--second-player', 'random'], capture_output=True, text=True, cwd=ROOT)
+
+        self.assertEqual(result.returncode, 2)
+        self.assertIn('needs the GUI', result.stderr)
+
+    def test_options_missing_from_the_namespace_take_their_defaults(self):
+        args = argparse.Namespace(first_player='minimax', second_player='mcts', minimax_pvs=True)
+
+        controller = GameController(verbose=False, use_graphics=False, args=args)
+
+        first, second = controller.players
+        self.assertIsInstance(first, MinimaxAIPlayer)
+        self.assertEqual((first.max_depth, first.workers, first.turn_plies, first.pvs), (6, 1, False, True))
+        self.assertIsNone(first.opening_book)
+        self.assertIsInstance(second, MCTSPlayer)
+        self.assertEqual(second.iterations, 1000)
@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from parameterized import parameterized
+
+from game_problem.ChineseCheckers import ChineseCheckers
+from game_problem.Heuristic import AverageManhattanToCornerHeuristic, AverageManhattanToEachCornerHeuristic, \
+    AverageEuclideanToCornerHeuristic, AverageEuclideanToEachCornerHeuristic, MaxManhattanToCornerHeuristic, \
+    SumOfPegsInCornerHeuristic, WeightedHeuristic, Heuristic
+from game_problem.RunningFeatures import RunningFeatures
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+
+
+def build_weighted_heuristic():
+    return WeightedHeuristic([
+        (SumOfPegsInCornerHeuristic(), 0.1),
+        (AverageManhattanToEachCornerHeuristic(), 0.3),
+        (AverageEuclideanToEachCornerHeuristic(), 0.4),
+        (MaxManhattanToCornerHeuristic(), 0.2),
+    ])
+
+
+class TestIncrementalEvaluation(unittest.TestCase):
+    @parameterized.expand([
+        AverageManhattanToCornerHeuristic(),
+        AverageManhattanToEachCornerHeuristic(),
+        AverageEuclideanToCornerHeuristic(),
+        AverageEuclideanToEachCornerHeuristic(),
+        MaxManhattanToCornerHeuristic(),
+        SumOfPegsInCornerHeuristic(),
+        build_weighted_heuristic(),
+    ])
+    def test_incremental_matches_full_evaluation(self, heuristic: Heuristic):
+        rng = random.Random(3)
+        problem = ChineseCheckers(3, bitboard=True)
+        state = problem.initial_state()
+        features = RunningFeatures(state.board)
+
+        for _ in range(150):
+            action = rng.choice(list(problem.actions(state)))
+            features.push(state.board, action.src, action.dest)
+            state = problem.result(state, action)
+            for player in (1, 2):
+                self.assertAlmostEqual(heuristic.eval_incremental(features, state, player),
+                                       heuristic.eval(state, player))
+
+    def test_pop_restores_the_totals(self):
+        problem = ChineseCheckers(3)
+        state = problem.initial_state()
+        features = RunningFeatures(state.board)
+        expected = (dict(features.in_goal_count), {p: list(s) for p, s in features.manhattan_sums.items()},
+                    {p: list(s) for p, s in features.euclidean_sums.items()})
+
+        for action in list(problem.actions(state)):
+            features.push(state.board, action.src, action.dest)
+            features.pop()
+
+        self.assertEqual((features.in_goal_count, features.manhattan_sums, features.euclidean_sums), expected)
+
+    def test_incremental_search_decides_the_same_actions(self):
+        problem = ChineseCheckers(3, bitboard=True)
+        incremental = MinimaxAIPlayer(problem, 1, 3, build_weighted_heuristic(), verbose=False, incremental_eval=True)
+        full = MinimaxAIPlayer(problem, 1, 3, build_weighted_heuristic(), verbose=False)
+        state = problem.initial_state()
+
+        self.assertEqual(incremental.get_action(problem, state), full.get_action(problem, state))
+        self.assertEqual(incremental.evaluated_states_count, full.evaluated_states_count)
@@ -0,0 +1,47 @@
+import time
+import unittest
+
+from game_problem.ChineseCheckers import ChineseCheckers
+from game_problem.Heuristic import WeightedHeuristic, SumOfPegsInCornerHeuristic, AverageManhattanToCornerHeuristic
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+
+
+def build_heuristic():
+    return WeightedHeuristic([
+        (SumOfPegsInCornerHeuristic(), 0.5),
+        (AverageManhattanToCornerHeuristic(), 0.5),
+    ])
+
+
+class TestIterativeDeepening(unittest.TestCase):
+    def test_time_budget_bounds_the_move_latency(self):
+        problem = ChineseCheckers(3, bitboard=True)
+        sut = MinimaxAIPlayer(problem, 1, 30, build_heuristic(), verbose=False, time_budget=0.05)
+        state = problem.initial_state()
+
+        timer = time.perf_counter()
+        action = sut.get_action(problem, state)
+        elapsed = time.perf_counter() - timer
+
+        self.assertIn(action, list(problem.actions(state)))
+        self.assertLess(elapsed, 0.5)
+        self.assertLess(sut.to_dict()['average_completed_depth'], 30)
+
+    def test_node_budget_stops_deepening(self):
+        problem = ChineseCheckers(3, bitboard=True)
+        sut = MinimaxAIPlayer(problem, 1, 30, build_heuristic(), verbose=False, node_budget=500)
+        state = problem.initial_state()
+
+        action = sut.get_action(problem, state)
+
+        self.assertIn(action, list(problem.actions(state)))
+        self.assertGreaterEqual(sut.to_dict()['average_completed_depth'], 1)
+        self.assertLessEqual(sut.budget.nodes, 501)
+
+    def test_unbounded_budget_reaches_max_depth(self):
+        problem = ChineseCheckers(3, bitboard=True)
+        sut = MinimaxAIPlayer(problem, 1, 3, build_heuristic(), verbose=False, node_budget=10 ** 9)
+
+        sut.get_action(problem, problem.initial_state())
+
+        self.assertEqual(sut.to_dict()['average_completed_depth'], 3)
@@ -0,0 +1,98 @@
+import random
+import unittest
+
+from game.Board import Board
+from game.MacroAction import MacroAction
+from game.State import State
+from game.Step import Step
+from game_problem.ChineseCheckers import ChineseCheckers
+from game_problem.Heuristic import WeightedHeuristic, SumOfPegsInCornerHeuristic, AverageManhattanToCornerHeuristic
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+
+
+def turn_end_states(problem: ChineseCheckers, state: State) -> set:
+    """
+    Explores the single-step actions until the turn passes and collects the reached states
+    """
+    reached = set()
+    stack = [state]
+    seen = {state}
+    while stack:
+        current = stack.pop()
+        for action in problem.actions(current):
+            child = problem.result(current, action)
+            if child.player != state.player:
+                if child.board != state.board:
+                    reached.add(child)
+            elif child not in seen:
+                seen.add(child)
+                stack.append(child)
+    return reached
+
+
+class TestMacroActions(unittest.TestCase):
+    def test_chain_of_jumps_is_a_single_action(self):
+        """
+           0  1  2  3  4
+        0  .  .  .  .  .
+        1  .  .  .  .  .
+        2  2  .  .  .  .
+        3  .  .  .  .  .
+        4  2  .  .  .  .
+        5  2  .  .  .  .
+        6  1  .  .  .  .
+        """
+        board = Board(triangle_size=3, initialised=False)
+        board.place_pegs(1, [(6, 0)])
+        board.place_pegs(2, [(5, 0), (3, 0)])
+        sut = ChineseCheckers(3)
+        state = State(board, 1)
+
+        actions = list(sut.macro_actions(state))
+
+        self.assertIn(MacroAction((6, 0), (2, 0), Step.END), actions)
+        chain = next(action for action in actions if action.dest == (2, 0))
+        self.assertEqual(chain.path, ((6, 0), (4, 0), (2, 0)))
+        self.assertEqual(len({(action.src, action.dest) for action in actions}), len(actions))
+
+    def test_macro_results_match_single_step_turns(self):
+        rng = random.Random(5)
+        sut = ChineseCheckers(3, bitboard=True)
+        state = sut.initial_state()
+
+        for _ in range(30):
+            expected = turn_end_states(sut, state)
+            reached = {sut.result(state, action) for action in sut.macro_actions(state)}
+            self.assertEqual(reached, expected)
+
+            state = sut.result(state, rng.choice(list(sut.macro_actions(state))))
+
+    def test_steps_replay_the_turn(self):
+        sut = ChineseCheckers(3, bitboard=True)
+        state = sut.initial_state()
+        state = sut.result(state, MacroAction((4, 0), (3, 0), Step.CRAWL, ((4, 0), (3, 0))))
+        state = sut.result(state, MacroAction((2, 6), (3, 6), Step.CRAWL, ((2, 6), (3, 6))))
+
+        for action in sut.macro_actions(state):
+            replayed = state
+            for step in action.steps():
+                self.assertIn(step, list(sut.actions(replayed)))
+                replayed = sut.result(replayed, step)
+            self.assertEqual(replayed, sut.result(state, action))
+
+    def test_turn_ply_player_plays_whole_turns(self):
+        problem = ChineseCheckers(3, bitboard=True)
+        heuristic = WeightedHeuristic([
+            (SumOfPegsInCornerHeuristic(), 0.5),
+            (AverageManhattanToCornerHeuristic(), 0.5),
+        ])
+        players = [
+            MinimaxAIPlayer(problem, 1, 2, heuristic, verbose=False, turn_plies=True),
+            MinimaxAIPlayer(problem, 2, 2, heuristic, verbose=False, turn_plies=True),
+        ]
+        state = problem.initial_state()
+
+        for _ in range(30):
+            action = players[state.player - 1].get_action(problem, state)
+            self.assertIn(action, list(problem.actions(state)))
+            state = problem.result(state, action)
@@ -0,0 +1,47 @@
+import random
+import unittest
+from copy import copy
+
+from game.State import State
+from game_problem.ChineseCheckers import ChineseCheckers
+from game_problem.Heuristic import WeightedHeuristic, SumOfPegsInCornerHeuristic, AverageManhattanToCornerHeuristic
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+
+
+class TestMakeUnmake(unittest.TestCase):
+    def test_apply_matches_result_and_undo_restores(self):
+        for bitboard in (False, True):
+            sut = ChineseCheckers(3, bitboard=bitboard)
+            rng = random.Random(11)
+            state = sut.initial_state()
+
+            for _ in range(40):
+                actions = list(sut.actions(state))
+                for action in actions:
+                    before = State(copy(state.board), state.player, state.mode, state.peg)
+                    expected = sut.result(state, action)
+
+                    record = sut.apply(state, action)
+                    self.assertEqual(state, expected)
+                    self.assertEqual(state.zobrist, expected.zobrist)
+
+                    sut.undo(state, record)
+                    self.assertEqual(state, before)
+                    self.assertEqual(state.zobrist, before.zobrist)
+                state = sut.result(state, rng.choice(actions))
+
+    def test_in_place_search_decides_the_same_actions(self):
+        for bitboard in (False, True):
+            problem = ChineseCheckers(3, bitboard=bitboard)
+            heuristic = WeightedHeuristic([
+                (SumOfPegsInCornerHeuristic(), 0.5),
+                (AverageManhattanToCornerHeuristic(), 0.5),
+            ])
+            in_place = MinimaxAIPlayer(problem, 1, 3, heuristic, verbose=False, in_place=True)
+            copying = MinimaxAIPlayer(problem, 1, 3, heuristic, verbose=False)
+
+            state = problem.initial_state()
+            snapshot = State(copy(state.board), state.player, state.mode, state.peg)
+
+            self.assertEqual(in_place.get_action(problem, state), copying.get_action(problem, state))
+            self.assertEqual(state, snapshot)
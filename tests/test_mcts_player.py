@@ -0,0 +1,108 @@
+import time
+import unittest
+
+import numpy as np
+
+from GameController import create_player
+from benchmarking.Tournament import HEURISTICS
+from game.BitBoard import BitBoard
+from game.Board import Board
+from game.State import State
+from game_problem.ChineseCheckers import ChineseCheckers
+from players.MCTSPlayer import MCTSPlayer, RolloutPolicy
+
+# Player 1 wins by crawling from (3, 6) to (2, 6), the pegs of player 2 are far from both goal corners
+WINNING_PEGS = [(0, 4), (0, 5), (0, 6), (1, 5), (1, 6), (3, 6)]
+FAR_PEGS = [(2, 0), (2, 1), (3, 0), (3, 1), (1, 0), (1, 1)]
+
+
+def build_state(pegs1, pegs2, player=1) -> State:
+    matrix = np.zeros((7, 7), dtype=int)
+    for cell in pegs1:
+        matrix[cell] = 1
+    for cell in pegs2:
+        matrix[cell] = 2
+    return State(BitBoard.from_board(Board(3, matrix=matrix)), player)
+
+
+class TestMCTSPlayer(unittest.TestCase):
+    def setUp(self):
+        self.problem = ChineseCheckers(3, bitboard=True)
+
+    def test_plays_the_winning_action(self):
+        player = MCTSPlayer(self.problem, HEURISTICS['Weighted'](), iterations=300, seed=0, verbose=False)
+
+        action = player.get_action(self.problem, build_state(WINNING_PEGS, FAR_PEGS))
+
+        self.assertEqual((action.src, action.dest), ((3, 6), (2, 6)))
+
+    def test_tree_is_reused_between_moves(self):
+        player = MCTSPlayer(self.problem, HEURISTICS['Weighted'](), iterations=200, seed=0, verbose=False)
+        state = self.problem.initial_state()
+
+        state = self.problem.result(state, player.get_action(self.problem, state))
+        while self.problem.player(state) != 1:
+            state = self.problem.result(state, next(iter(self.problem.actions(state))))
+        player.get_action(self.problem, state)
+
+        self.assertGreater(player.reused_visits, 0)
+        self.assertEqual(player.to_dict()['mcts_simulations'], 400)
+
+    def test_time_budget(self):
+        player = MCTSPlayer(self.problem, HEURISTICS['Weighted'](), time_budget=0.2, seed=0, verbose=False)
+
+        timer = time.perf_counter()
+        action = player.get_action(self.problem, self.problem.initial_state())
+
+        self.assertLess(time.perf_counter() - timer, 1.0)
+        self.assertGreater(player.simulations, 0)
+        self.assertIn(action, list(self.problem.actions(self.problem.initial_state())))
+
+    def test_exhausted_time_budget_runs_one_batch(self):
+        player = MCTSPlayer(self.problem, HEURISTICS['Weighted'](), time_budget=0, batch_size=4, seed=0,
+                            verbose=False)
+
+        action = player.get_action(self.problem, self.problem.initial_state())
+
+        self.assertEqual(player.simulations, 4)
+        self.assertIn(action, list(self.problem.actions(self.problem.initial_state())))
+
+    def test_terminal_state_has_no_action(self):
+        player = MCTSPlayer(self.problem, HEURISTICS['Weighted'](), time_budget=0, seed=0, verbose=False)
+        state = build_state(WINNING_PEGS[:-1] + [(2, 6)], FAR_PEGS, player=2)
+        self.assertTrue(self.problem.terminal_test(state))
+
+        self.assertIsNone(player.get_action(self.problem, state))
+        self.assertEqual(player.simulations, 0)
+
+    def test_rollouts_on_worker_processes(self):
+        player = MCTSPlayer(self.problem, HEURISTICS['Weighted'](), iterations=256, workers=2, guided_rollouts=True,
+                            seed=0, verbose=False)
+        try:
+            action = player.get_action(self.problem, build_state(WINNING_PEGS, FAR_PEGS))
+        finally:
+            player.close()
+
+        self.assertEqual((action.src, action.dest), ((3, 6), (2, 6)))
+        self.assertEqual(player.simulations, 256)
+
+    def test_rollout_rewards(self):
+        heuristic = HEURISTICS['Weighted']()
+        policy = RolloutPolicy(self.problem, heuristic)
+        state = build_state(WINNING_PEGS, FAR_PEGS)
+        won = self.problem.result(state, next(action for action in self.problem.actions(state)
+                                              if (action.src, action.dest) == ((3, 6), (2, 6))))
+        initial = self.problem.initial_state()
+
+        rewards = policy.rewards([won, initial])
+
+        self.assertEqual(rewards[0], 1.0)
+        self.assertAlmostEqual(rewards[1], 0.5 + (heuristic.eval(initial, 1) - heuristic.eval(initial, 2)) / 2)
+        self.assertEqual(RolloutPolicy(self.problem).rewards([initial]), [0.5])
+        self.assertRaises(ValueError, RolloutPolicy, self.problem, None, 20, True)
+
+    def test_created_by_the_controller(self):
+        player = create_player('mcts', problem=self.problem, heuristic=HEURISTICS['Weighted'](), iterations=10)
+
+        self.assertIsInstance(player, MCTSPlayer)
+        self.assertEqual(player.iterations, 10)
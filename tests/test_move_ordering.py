@@ -0,0 +1,63 @@
+import unittest
+
+from game.Action import Action
+from game.Step import Step
+from game_problem.ChineseCheckers import ChineseCheckers
+from game_problem.Heuristic import WeightedHeuristic, SumOfPegsInCornerHeuristic, AverageManhattanToCornerHeuristic
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+from search.MoveOrdering import KillerMoveOrdering, HistoryOrdering, ProgressOrdering, StepTypeOrdering, \
+    default_move_ordering
+
+
+class TestMoveOrdering(unittest.TestCase):
+    def setUp(self):
+        self.problem = ChineseCheckers(3, bitboard=True)
+        self.state = self.problem.initial_state()
+        self.forward = Action((4, 0), (3, 0), Step.CRAWL)
+        self.sideways = Action((4, 0), (4, 1), Step.CRAWL)
+        self.backward = Action((4, 0), (5, 1), Step.CRAWL)
+
+    def test_killer_moves_keep_the_newest_cutoffs(self):
+        sut = KillerMoveOrdering(slots=2)
+        sut.on_cutoff(self.state, self.forward, 3, 1)
+        sut.on_cutoff(self.state, self.sideways, 3, 1)
+        sut.on_cutoff(self.state, self.backward, 3, 1)
+
+        self.assertEqual(sut.score(self.state, self.backward, 3), 2)
+        self.assertEqual(sut.score(self.state, self.sideways, 3), 1)
+        self.assertEqual(sut.score(self.state, self.forward, 3), 0)
+        self.assertEqual(sut.score(self.state, self.backward, 2), 0)
+
+        sut.new_search()
+        self.assertEqual(sut.score(self.state, self.backward, 3), 0)
+
+    def test_history_weights_cutoffs_by_remaining_depth(self):
+        sut = HistoryOrdering()
+        sut.on_cutoff(self.state, self.forward, 1, 3)
+        sut.on_cutoff(self.state, self.sideways, 3, 1)
+
+        self.assertGreater(sut.score(self.state, self.forward, 0), sut.score(self.state, self.sideways, 0))
+
+        sut.new_search()
+        self.assertEqual(sut.score(self.state, self.forward, 0), 4.5)
+
+    def test_progress_prefers_moves_towards_the_goal(self):
+        sut = ProgressOrdering()
+
+        self.assertGreater(sut.score(self.state, self.forward, 0), sut.score(self.state, self.backward, 0))
+        self.assertEqual(sut.score(self.state, self.sideways, 0), 1)
+
+    def test_ordering_does_not_change_the_search_score(self):
+        heuristic = WeightedHeuristic([
+            (SumOfPegsInCornerHeuristic(), 0.5),
+            (AverageManhattanToCornerHeuristic(), 0.5),
+        ])
+        plain = MinimaxAIPlayer(self.problem, 1, 3, heuristic, verbose=False, tt_size=0,
+                                move_ordering=[StepTypeOrdering()])
+        ordered = MinimaxAIPlayer(self.problem, 1, 3, heuristic, verbose=False, tt_size=0,
+                                  move_ordering=default_move_ordering())
+
+        plain_score, _ = plain.max_value(self.state, 0, float('-inf'), float('inf'))
+        ordered_score, _ = ordered.max_value(self.state, 0, float('-inf'), float('inf'))
+
+        self.assertEqual(plain_score, ordered_score)
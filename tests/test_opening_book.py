@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+from benchmarking.Perft import position_state
+from benchmarking.Tournament import HEURISTICS
+from game_problem.ChineseCheckers import ChineseCheckers
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+from search.OpeningBook import OpeningBook
+from search.OpeningBookBuilder import book_positions, build_opening_book
+
+
+class TestOpeningBook(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'book.bin')
+        self.problem = ChineseCheckers(3, bitboard=True)
+        self.heuristic = HEURISTICS['Weighted']()
+        build_opening_book(self.problem, self.heuristic, 2, 2, self.filename, verbose=False)
+        self.book = OpeningBook(self.filename, 3, self.heuristic.tag())
+
+    def tearDown(self):
+        self.book.close()
+        self.directory.cleanup()
+
+    def test_book_actions_are_the_searched_actions(self):
+        positions = book_positions(self.problem, 2)
+
+        self.assertEqual(len(self.book), len(positions))
+        self.assertEqual(self.book.depth, 2)
+        for state in positions:
+            player = MinimaxAIPlayer(self.problem, state.player, 2, self.heuristic, verbose=False)
+            self.assertEqual(self.book.lookup(state), player.alpha_beta_search(state))
+
+    def test_positions_outside_the_book_are_searched(self):
+        player = MinimaxAIPlayer(self.problem, 1, 2, self.heuristic, verbose=False, opening_book=self.book)
+        state = self.problem.initial_state()
+
+        action = player.get_action(self.problem, state)
+        self.assertEqual(action, self.book.lookup(state))
+        self.assertEqual(player.book_hits, 1)
+        self.assertEqual(player.evaluated_states_count, 0)
+
+        # A midgame position is not covered by the book
+        state = position_state('opening')
+        self.assertIsNone(self.book.lookup(state))
+        player.get_action(self.problem, state)
+        self.assertEqual(player.book_hits, 1)
+        self.assertGreater(player.evaluated_states_count, 0)
+        self.assertEqual(player.to_dict()['book_hits'], 1)
+
+    def test_version_tag_is_checked(self):
+        other_heuristic = HEURISTICS['AverageManhattan']()
+
+        self.assertRaises(ValueError, OpeningBook, self.filename, 4)
+        self.assertRaises(ValueError, OpeningBook, self.filename, 3, other_heuristic.tag())
+        self.assertRaises(ValueError, MinimaxAIPlayer, self.problem, 1, 2, other_heuristic, verbose=False,
+                          opening_book=self.book)
+
+        with open(self.filename, 'r+b') as file:
+            file.write(b'XXXX')
+        self.assertRaises(ValueError, OpeningBook, self.filename)
@@ -0,0 +1,87 @@
+import multiprocessing as mp
+import unittest
+
+import players.MinimaxAIPlayer as minimax
+from game_problem.ChineseCheckers import ChineseCheckers
+from game_problem.Heuristic import WeightedHeuristic, SumOfPegsInCornerHeuristic, AverageManhattanToCornerHeuristic
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+from search.MoveOrdering import KillerMoveOrdering
+
+
+class TestParallelRootSearch(unittest.TestCase):
+    def test_parallel_action_has_the_sequential_best_score(self):
+        problem = ChineseCheckers(3, bitboard=True)
+        heuristic = WeightedHeuristic([
+            (SumOfPegsInCornerHeuristic(), 0.5),
+            (AverageManhattanToCornerHeuristic(), 0.5),
+        ])
+        parallel = MinimaxAIPlayer(problem, 1, 3, heuristic, verbose=False, workers=2)
+        sequential = MinimaxAIPlayer(problem, 1, 3, heuristic, verbose=False, tt_size=0)
+        state = problem.initial_state()
+
+        try:
+            action = parallel.get_action(problem, state)
+        finally:
+            parallel.close()
+
+        best_score, _ = sequential.max_value(state, 0, float('-inf'), float('inf'))
+        child = problem.result(state, action)
+        if problem.player(child) == 1:
+            score, _ = sequential.max_value(child, 1, float('-inf'), float('inf'))
+        else:
+            score, _ = sequential.min_value(child, 1, float('-inf'), float('inf'))
+
+        self.assertEqual(score, best_score)
+        self.assertGreater(parallel.evaluated_states_count, 0)
+        # The statistics of the workers are merged into the move of the parent
+        self.assertEqual(parallel.statistics.moves[0].leaves, parallel.evaluated_states_count)
+        self.assertEqual(parallel.statistics.moves[0].nodes_per_depth[0], 1)
+
+    def test_worker_starts_a_new_search_generation_per_root_search(self):
+        problem = ChineseCheckers(3, bitboard=True)
+        heuristic = WeightedHeuristic([
+            (SumOfPegsInCornerHeuristic(), 0.5),
+            (AverageManhattanToCornerHeuristic(), 0.5),
+        ])
+        killers = KillerMoveOrdering()
+        config = {'problem': problem, 'max_player': 1, 'max_depth': 2, 'heuristic': heuristic, 'verbose': False,
+                  'move_ordering': [killers]}
+        minimax._init_root_worker(config, mp.Value('d', float('-inf')))
+        worker = minimax._worker_player
+        state = problem.initial_state()
+        actions = list(problem.actions(state))
+
+        try:
+            minimax._search_root_action((0, state, actions[0], set(), 1, 2, False))
+            minimax._search_root_action((1, state, actions[1], set(), 1, 2, False))
+            generation = worker.transposition_table.generation
+            killers.killers[5] = [actions[0]]
+            minimax._search_root_action((0, state, actions[0], set(), 2, 2, False))
+        finally:
+            minimax._worker_player = minimax._worker_alpha = minimax._worker_search_id = None
+
+        self.assertEqual(generation, 1)
+        self.assertEqual(worker.transposition_table.generation, 2)
+        self.assertNotIn(5, killers.killers)
+
+    def test_budgeted_parallel_search_deepens_in_the_workers(self):
+        problem = ChineseCheckers(3, bitboard=True)
+        heuristic = WeightedHeuristic([
+            (SumOfPegsInCornerHeuristic(), 0.5),
+            (AverageManhattanToCornerHeuristic(), 0.5),
+        ])
+        node_limited = MinimaxAIPlayer(problem, 1, 30, heuristic, verbose=False, workers=2, node_budget=2000)
+        time_limited = MinimaxAIPlayer(problem, 1, 30, heuristic, verbose=False, workers=2, time_budget=0.2)
+        state = problem.initial_state()
+
+        try:
+            for player in (node_limited, time_limited):
+                action = player.get_action(problem, state)
+                self.assertIn(action, problem.actions(state))
+                # The iterations completed before the budget ran out, the first one always completes
+                self.assertGreaterEqual(player._completed_depths[-1], 1)
+                self.assertLess(player._completed_depths[-1], 30)
+                self.assertGreater(player.evaluated_states_count, 0)
+        finally:
+            node_limited.close()
+            time_limited.close()
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from benchmarking.Perft import PERFT_EXPECTED, POSITIONS, check_perft, perft, run, search_benchmark
+from game.BitBoard import BitBoard
+from game.Board import Board
+from game.State import State
+from game_problem.ChineseCheckers import ChineseCheckers
+
+
+class TestPerft(unittest.TestCase):
+    @parameterized.expand([
+        ('bitboard', True),
+        ('matrix', False),
+    ])
+    def test_counts_match_reference(self, _, bitboard):
+        counts = check_perft(3, bitboard)
+
+        self.assertEqual(counts, {name: PERFT_EXPECTED[name][:3] for name in POSITIONS})
+
+    def test_mismatch_is_reported(self):
+        expected = PERFT_EXPECTED['initial']
+        PERFT_EXPECTED['initial'] = [expected[0] + 1] + expected[1:]
+        try:
+            self.assertRaises(AssertionError, check_perft, 1)
+        finally:
+            PERFT_EXPECTED['initial'] = expected
+
+    def test_terminal_state_has_no_children(self):
+        problem = ChineseCheckers(3, bitboard=True)
+        matrix = np.zeros((7, 7), dtype=int)
+        matrix[[0, 0, 0, 1, 1, 2], [4, 5, 6, 5, 6, 6]] = 1
+        matrix[[4, 5, 5, 6, 6, 6], [0, 0, 1, 0, 1, 3]] = 2
+        state = State(BitBoard.from_board(Board(3, matrix=matrix)), 2)
+
+        self.assertTrue(problem.terminal_test(state))
+        self.assertEqual(perft(problem, state, 0), 1)
+        self.assertEqual(perft(problem, state, 1), 0)
+
+    def test_report_is_written(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'perft_results.json')
+
+            report = run(2, min_time=0.0, output=filename)
+
+            with open(filename) as file:
+                self.assertEqual(json.load(file), json.loads(json.dumps(report)))
+        self.assertEqual(report['perft']['counts']['initial'], PERFT_EXPECTED['initial'][:2])
+        self.assertIn('commit', report['environment'])
+        self.assertIn('eval.Weighted', report['calls_per_second'])
+        self.assertTrue(all(calls > 0 for calls in report['calls_per_second'].values()))
+
+    def test_search_benchmark_plays_the_same_game(self):
+        games = search_benchmark(2, plies=6, repeats=1)
+
+        self.assertEqual(set(games), {'plain', 'batched'})
+        self.assertEqual(games['plain']['steps'], games['batched']['steps'])
+        # The batched search stops at the cutoffs - at most a few extra leaves per frontier node
+        self.assertLess(games['batched']['leaves'], 2 * games['plain']['leaves'])
@@ -0,0 +1,128 @@
+import multiprocessing as mp
+import time
+import unittest
+
+from benchmarking.Tournament import HEURISTICS
+from game_problem.ChineseCheckers import ChineseCheckers
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+from search.SearchBudget import SearchBudget, SearchTimeout
+from search.TranspositionTable import TranspositionTable, Bound
+
+
+def play_until_pondering(problem, player):
+    """
+    Plays the steps of the player from the initial state until a step ends its turn
+    :return: the state after the turn, at the start of a turn of the opponent
+    """
+    state = problem.initial_state()
+    while True:
+        state = problem.result(state, player.get_action(problem, state))
+        if player.ponderer.running:
+            return state
+
+
+class TestPondering(unittest.TestCase):
+    def setUp(self):
+        self.problem = ChineseCheckers(3, bitboard=True)
+
+    def test_stop_event_ends_the_search(self):
+        stop_event = mp.Event()
+        budget = SearchBudget(stop_event=stop_event, check_interval=4)
+        budget.start()
+        budget.active = True
+        for _ in range(8):
+            budget.check()
+
+        stop_event.set()
+
+        self.assertTrue(budget.enabled)
+        self.assertTrue(budget.exhausted())
+        with self.assertRaises(SearchTimeout):
+            for _ in range(4):
+                budget.check()
+
+    def test_entries_of_a_search_are_merged(self):
+        source = TranspositionTable(64)
+        source.store(1, 2, 0.5, Bound.EXACT, None)
+        source.new_search()
+        source.store(2, 3, 0.25, Bound.LOWER, None)
+        target = TranspositionTable(64)
+
+        target.merge(source.entries(source.generation))
+
+        self.assertIsNone(target.probe(1))
+        self.assertEqual((target.probe(2).depth, target.probe(2).score, target.probe(2).bound), (3, 0.25, Bound.LOWER))
+        self.assertEqual(len(source.entries()), 2)
+
+    def test_pondered_reply_is_answered_without_a_search(self):
+        player = MinimaxAIPlayer(self.problem, 1, 2, HEURISTICS['Weighted'](), verbose=False, ponder=True)
+        try:
+            state = play_until_pondering(self.problem, player)
+            player._finish_pondering(cancel=False)
+            searched_moves = len(player.statistics.moves)
+
+            replies = len(list(self.problem.macro_actions(state)))
+            reply = next(iter(self.problem.macro_actions(state)))
+            state = self.problem.result(state, reply)
+            action = player.get_action(self.problem, state)
+        finally:
+            player.close()
+
+        self.assertIn(action, list(self.problem.actions(state)))
+        self.assertEqual(player.ponder_hits, 1)
+        self.assertEqual(player.pondered_positions, replies)
+        self.assertEqual(len(player.statistics.moves), searched_moves)
+        self.assertGreater(player.to_dict()['ponder_nodes'], 0)
+
+    def test_expected_turn_is_pondered_with_turn_plies(self):
+        player = MinimaxAIPlayer(self.problem, 1, 2, HEURISTICS['Weighted'](), verbose=False, ponder=True,
+                                 turn_plies=True)
+        try:
+            state = play_until_pondering(self.problem, player)
+            # The table stores whole turns of the opponent
+            expected = player._expected_reply(state)
+            player._finish_pondering(cancel=False)
+            action = player.get_action(self.problem, expected)
+        finally:
+            player.close()
+
+        self.assertIn(expected, [self.problem.result(state, reply) for reply in self.problem.macro_actions(state)])
+        self.assertEqual(player.ponder_hits, 1)
+        self.assertIn(action, list(self.problem.actions(expected)))
+
+    def test_parallel_player_only_takes_over_the_pondered_actions(self):
+        player = MinimaxAIPlayer(self.problem, 1, 2, HEURISTICS['Weighted'](), verbose=False, ponder=True, workers=2)
+        try:
+            state = play_until_pondering(self.problem, player)
+            expected = player._expected_reply(state)
+            player._finish_pondering(cancel=False)
+        finally:
+            player.close()
+
+        self.assertIsNone(expected)
+        self.assertGreater(player.pondered_positions, 0)
+        self.assertTrue(player._pondered_actions)
+        self.assertEqual(len(player.transposition_table), 0)
+
+    def test_pondering_is_cancelled_when_the_reply_arrives(self):
+        player = MinimaxAIPlayer(self.problem, 1, 30, HEURISTICS['Weighted'](), verbose=False, ponder=True,
+                                 time_budget=0.05)
+        try:
+            play_until_pondering(self.problem, player)
+            entries = len(player.transposition_table)
+            time.sleep(0.5)
+
+            timer = time.perf_counter()
+            player._finish_pondering()
+            elapsed = time.perf_counter() - timer
+            process = player.ponderer._process
+        finally:
+            player.close()
+
+        self.assertLess(elapsed, 1.0)
+        self.assertFalse(player.ponderer.running)
+        # The interrupted search never reaches the full depth, its table entries are taken over
+        self.assertEqual(player.pondered_positions, 1)
+        self.assertFalse(player._pondered_actions)
+        self.assertGreater(len(player.transposition_table), entries)
+        self.assertFalse(process.is_alive())
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+
+from parameterized import parameterized
+
+from benchmarking.GameAnalytics import GameAnalytics
+from benchmarking.Perft import position_state
+from benchmarking.Tournament import HEURISTICS, Matchup, PlayerSpec, play_game
+from game_problem.ChineseCheckers import ChineseCheckers
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+
+
+def root_value(problem, state, depth, pvs, **options):
+    """
+    Searches the root with a full window and returns its value
+    """
+    player = MinimaxAIPlayer(problem, state.player, depth, HEURISTICS['Weighted'](), verbose=False, pvs=pvs,
+                             **options)
+    player._add_state_to_history(state)
+    player._begin_search(state)
+    if pvs:
+        return player.negamax(state, 0, float('-inf'), float('inf'))[0]
+    return player.max_value(state, 0, float('-inf'), float('inf'))[0]
+
+
+class TestPrincipalVariationSearch(unittest.TestCase):
+    def setUp(self):
+        self.problem = ChineseCheckers(3, bitboard=True)
+
+    @parameterized.expand([
+        ('initial', 4, {}),
+        ('opening', 3, {}),
+        ('midgame', 3, {}),
+        ('contact', 4, {}),
+        ('contact_in_place', 3, {'in_place': True}),
+        ('contact_batch_eval', 3, {'batch_eval': True}),
+        ('contact_turn_plies', 2, {'turn_plies': True}),
+        ('contact_without_tt', 3, {'tt_size': 0}),
+    ])
+    def test_same_value_as_alpha_beta(self, name, depth, options):
+        state = position_state(name.split('_')[0])
+
+        expected = root_value(self.problem, state, depth, False, **options)
+        actual = root_value(self.problem, state, depth, True, **options)
+
+        self.assertAlmostEqual(actual, expected, places=12)
+
+    def test_null_window_searches_are_counted(self):
+        state = position_state('midgame')
+        sut = MinimaxAIPlayer(self.problem, state.player, 4, HEURISTICS['Weighted'](), verbose=False, pvs=True)
+
+        action = sut.get_action(self.problem, state)
+
+        self.assertIn(action, list(self.problem.actions(state)))
+        data = sut.to_dict()
+        self.assertEqual(data['search_algorithm'], 'pvs')
+        self.assertGreater(data['search_researches'], 0)
+        self.assertGreater(data['search_time'], 0)
+
+    def test_aspiration_window_failures_are_searched_again(self):
+        state = position_state('contact')
+        full = MinimaxAIPlayer(self.problem, state.player, 4, HEURISTICS['Weighted'](), verbose=False, pvs=True,
+                               aspiration_window=None, node_budget=10 ** 9)
+        narrow = MinimaxAIPlayer(self.problem, state.player, 4, HEURISTICS['Weighted'](), verbose=False, pvs=True,
+                                 aspiration_window=1e-6, node_budget=10 ** 9)
+
+        self.assertEqual(narrow.get_action(self.problem, state), full.get_action(self.problem, state))
+        self.assertGreater(narrow.statistics.moves[-1].aspiration_failures, 0)
+        self.assertEqual(full.statistics.moves[-1].aspiration_failures, 0)
+        self.assertEqual(narrow.to_dict()['average_completed_depth'], 4)
+
+    def test_comparison_with_alpha_beta_in_analytics(self):
+        record = play_game(Matchup(PlayerSpec('Weighted', 2), PlayerSpec('Weighted', 2, 'pvs')), max_turns=10)
+        with tempfile.TemporaryDirectory() as directory:
+            analytics = GameAnalytics(os.path.join(directory, 'games.jsonl'))
+            analytics.add_games([record, record])
+
+            comparison = analytics.search_comparison()
+
+        alphabeta, pvs = record['players']
+        self.assertEqual(set(comparison[2]), {'alphabeta', 'pvs'})
+        self.assertEqual(comparison[2]['pvs']['nodes'], 2 * pvs['search_nodes'])
+        self.assertAlmostEqual(comparison[2]['pvs']['node_ratio'],
+                               (pvs['search_nodes'] / len(pvs['search_moves']))
+                               / (alphabeta['search_nodes'] / len(alphabeta['search_moves'])))
+        self.assertEqual(comparison[2]['alphabeta']['node_ratio'], 1.0)
+        self.assertIn('time_ratio', comparison[2]['pvs'])
@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+import unittest
+
+from parameterized import parameterized
+
+from benchmarking.GameAnalytics import GameAnalytics
+from game_problem.ChineseCheckers import ChineseCheckers
+from game_problem.Heuristic import WeightedHeuristic, SumOfPegsInCornerHeuristic, AverageManhattanToCornerHeuristic
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+from search.SearchStatistics import MoveStatistics
+
+
+def build_player(problem: ChineseCheckers, **kwargs) -> MinimaxAIPlayer:
+    heuristic = WeightedHeuristic([
+        (SumOfPegsInCornerHeuristic(), 0.5),
+        (AverageManhattanToCornerHeuristic(), 0.5),
+    ])
+    return MinimaxAIPlayer(problem, 1, 3, heuristic, verbose=False, **kwargs)
+
+
+class TestSearchStatistics(unittest.TestCase):
+    @parameterized.expand([
+        ('sequential', {}),
+        ('batched', {'batch_eval': True}),
+        ('anytime', {'node_budget': 10 ** 6}),
+    ])
+    def test_counters_of_a_move(self, _, kwargs):
+        problem = ChineseCheckers(3, bitboard=True)
+        player = build_player(problem, **kwargs)
+
+        player.get_action(problem, problem.initial_state())
+
+        self.assertEqual(len(player.statistics.moves), 1)
+        move = player.statistics.moves[0]
+        # Every evaluated state is a leaf - the root is visited once per iteration of iterative deepening
+        self.assertEqual(move.leaves, player.evaluated_states_count)
+        self.assertEqual(move.nodes_per_depth[0], 3 if 'node_budget' in kwargs else 1)
+        self.assertEqual(len(move.nodes_per_depth), 4)
+        if 'node_budget' in kwargs:
+            # The branching factor is measured on the last iteration only
+            self.assertEqual(move.iteration_nodes_per_depth[0], 1)
+            self.assertAlmostEqual(move.effective_branching_factor, move.iteration_nodes_per_depth[3] ** (1 / 3))
+        self.assertGreater(move.cutoffs, 0)
+        self.assertEqual(sum(move.cutoff_index_counts), move.cutoffs)
+        self.assertGreater(move.effective_branching_factor, 1)
+        self.assertGreater(move.movegen_time, 0)
+        self.assertGreater(move.eval_time, 0)
+
+    def test_history_pruned_children_are_counted(self):
+        problem = ChineseCheckers(3, bitboard=True)
+        player = build_player(problem)
+        state = problem.initial_state()
+        for action in problem.actions(state):
+            player._state_history_set.add(hash(problem.result(state, action)))
+
+        player.alpha_beta_search(state)
+
+        self.assertEqual(player.statistics.moves[0].history_pruned, len(list(problem.actions(state))))
+
+    def test_merge_and_branching_factor(self):
+        first = MoveStatistics(nodes_per_depth=[1, 4], leaves=4, cutoffs=1, cutoff_index_counts=[1])
+        second = MoveStatistics(nodes_per_depth=[0, 2, 16], cutoffs=2, cutoff_index_counts=[0, 0, 2],
+                                history_pruned=3)
+
+        first.merge(second)
+
+        self.assertEqual(first.nodes_per_depth, [1, 6, 16])
+        self.assertEqual(first.cutoff_index_counts, [1, 0, 2])
+        self.assertEqual(first.cutoffs, 3)
+        self.assertEqual(first.history_pruned, 3)
+        self.assertAlmostEqual(first.effective_branching_factor, 4.0)
+        self.assertIsNone(MoveStatistics(nodes_per_depth=[1]).effective_branching_factor)
+
+    def test_branching_factor_of_the_last_iteration(self):
+        # Iterations to depth 1 (1 + 4 nodes) and depth 2 (1 + 4 + 16 nodes)
+        sut = MoveStatistics(nodes_per_depth=[1, 4])
+        nodes_before = list(sut.nodes_per_depth)
+        sut.merge(MoveStatistics(nodes_per_depth=[1, 4, 16]))
+        sut.complete_iteration(nodes_before)
+
+        self.assertEqual(sut.iteration_nodes_per_depth, [1, 4, 16])
+        self.assertAlmostEqual(sut.effective_branching_factor, 4.0)
+
+    def test_statistics_are_exported_and_aggregated(self):
+        problem = ChineseCheckers(3, bitboard=True)
+        players = [build_player(problem, title='A'), build_player(problem, title='B')]
+        state = problem.initial_state()
+        while min(player.moves_count for player in players) < 2:
+            action = players[state.player - 1].get_action(problem, state)
+            state = problem.result(state, action)
+
+        with tempfile.TemporaryDirectory() as directory:
+            analytics = GameAnalytics(os.path.join(directory, 'games.jsonl'))
+            analytics.add_game_data(1.0, 4, players, 0)
+            analytics.add_game_data(1.0, 4, players, 0)
+            summary = analytics.search_statistics()
+
+        data = json.loads(json.dumps(players[0].to_dict()))
+        self.assertEqual(len(data['search_moves']), players[0].moves_count)
+        self.assertEqual(data['search_leaves'], players[0].evaluated_states_count)
+        self.assertEqual(set(summary), {'minimax A', 'minimax B'})
+        self.assertEqual(summary['minimax A']['games'], 2)
+        self.assertEqual(summary['minimax A']['nodes'], 2 * data['search_nodes'])
+        self.assertEqual(summary['minimax A']['nodes_per_depth'], [2 * n for n in data['search_nodes_per_depth']])
+        self.assertGreater(summary['minimax A']['effective_branching_factor'], 1)
+        self.assertLessEqual(summary['minimax A']['first_move_cutoff_rate'], 1)
@@ -1,5 +1,9 @@
-from game_problem.ChineseCheckers import ChineseCheckers
+import random
 import unittest
+from copy import copy
+
+from game.State import State
+from game_problem.ChineseCheckers import ChineseCheckers
 
 
 class TestStateHashing(unittest.TestCase):
@@ -24,4 +28,27 @@ class TestStateHashing(unittest.TestCase):
         state2 = sut.initial_state()
         state2.board.move((3, 0), (2, 0))
 
-        self.assertNotEqual(hash(state1), hash(state2))
\ No newline at end of file
+        self.assertNotEqual(hash(state1), hash(state2))
+
+    def test_incremental_hash_matches_full_hash(self):
+        for bitboard in (False, True):
+            sut = ChineseCheckers(triangle_size=3, bitboard=bitboard)
+            rng = random.Random(7)
+            state = sut.initial_state()
+
+            for _ in range(60):
+                state = sut.result(state, rng.choice(list(sut.actions(state))))
+                recomputed = State(copy(state.board), state.player, state.mode, state.peg)
+                self.assertEqual(state.zobrist, recomputed.zobrist)
+
+    def test_hash_is_independent_of_board_backend(self):
+        matrix_problem = ChineseCheckers(triangle_size=3)
+        bit_problem = ChineseCheckers(triangle_size=3, bitboard=True)
+        matrix_state = matrix_problem.initial_state()
+        bit_state = bit_problem.initial_state()
+
+        for _ in range(10):
+            action = max(matrix_problem.actions(matrix_state))
+            matrix_state = matrix_problem.result(matrix_state, action)
+            bit_state = bit_problem.result(bit_state, action)
+            self.assertEqual(hash(matrix_state), hash(bit_state))
@@ -1,6 +1,12 @@
 import unittest
 import numpy as np
+from parameterized import parameterized
 
+from game.Action import Action
+from game.BitBoard import BitBoard
+from game.Board import Board
+from game.State import State
+from game.Step import Step
 from src.game_problem.ChineseCheckers import ChineseCheckers
 
 
@@ -64,3 +70,35 @@ class TestTerminalState(unittest.TestCase):
         ])
         self.assertTrue(sut.terminal_test(state))
         self.assertEqual(sut.utility(state, player=1), -1)
+
+    @parameterized.expand([
+        ([[0, 0, 0, 1, 1], [0, 0, 0, 0, 1], [2, 0, 0, 0, 0], [2, 0, 0, 0, 0], [2, 1, 0, 0, 0]], 1),
+        ([[0, 0, 1, 0, 1], [0, 0, 0, 0, 1], [0, 0, 0, 0, 0], [2, 0, 0, 0, 0], [2, 2, 0, 0, 0]], 2),
+        ([[0, 0, 0, 2, 2], [0, 0, 0, 0, 2], [0, 0, 0, 0, 0], [1, 0, 0, 0, 0], [1, 1, 0, 0, 0]], 0),
+    ])
+    def test_terminal_status_matches_on_both_boards(self, matrix, winner):
+        board = Board(2, matrix=np.array(matrix))
+        self.assertEqual(board.terminal_status(), winner)
+        self.assertEqual(BitBoard.from_board(board).terminal_status(), winner)
+        self.assertEqual(State(board).terminal_status, winner)
+
+    @parameterized.expand([(False,), (True,)])
+    def test_terminal_status_is_reset_by_apply_and_undo(self, bitboard: bool):
+        sut = ChineseCheckers(triangle_size=2)
+        board = Board(2, matrix=np.array([
+            [0, 0, 0, 0, 1],
+            [0, 0, 0, 1, 1],
+            [0, 2, 2, 0, 0],
+            [0, 0, 0, 2, 0],
+            [0, 0, 0, 0, 0],
+        ]))
+        state = State(BitBoard.from_board(board) if bitboard else board)
+        self.assertFalse(sut.terminal_test(state))
+
+        record = sut.apply(state, Action((1, 3), (0, 3), Step.CRAWL))
+        self.assertTrue(sut.terminal_test(state))
+        self.assertEqual(sut.utility(state, player=1), 1)
+
+        sut.undo(state, record)
+        self.assertFalse(sut.terminal_test(state))
+        self.assertEqual(sut.utility(state, player=1), 0)
@@ -0,0 +1,52 @@
+import random
+import unittest
+
+from game.Action import Action
+from game.Board import Board
+from game.State import State
+from game.Step import Step
+from game.Topology import board_topology
+from game_problem.ChineseCheckers import ChineseCheckers
+
+
+class TestTopology(unittest.TestCase):
+    def test_topology_is_cached_per_triangle_size(self):
+        self.assertIs(board_topology(3), board_topology(3))
+        self.assertIsNot(board_topology(2), board_topology(3))
+
+    def test_center_cell_has_six_neighbours_and_jumps(self):
+        topology = board_topology(3)
+
+        self.assertEqual(len(topology.neighbours[(3, 3)]), 6)
+        self.assertEqual(len(topology.jumps[(3, 3)]), 6)
+        self.assertIn(((2, 2), (1, 1)), topology.jumps[(3, 3)])
+        self.assertNotIn(((2, 4), (1, 5)), topology.jumps[(3, 3)])
+
+    def test_corner_cell_tables(self):
+        topology = board_topology(2)
+
+        self.assertEqual(set(topology.neighbours[(0, 0)]), {(0, 1), (1, 0), (1, 1)})
+        self.assertEqual(set(topology.jumps[(0, 0)]), {((0, 1), (0, 2)), ((1, 0), (2, 0)), ((1, 1), (2, 2))})
+
+    def test_actions_agree_with_step_validation(self):
+        rng = random.Random(2180)
+        sut = ChineseCheckers(3)
+
+        for _ in range(50):
+            board = Board(3, initialised=False)
+            cells = rng.sample(board_topology(3).cells, 12)
+            board.place_pegs(1, cells[:6])
+            board.place_pegs(2, cells[6:])
+            state = State(board, 1)
+
+            expected = set()
+            for src in cells[:6]:
+                for i in range(-2, 3):
+                    for j in range(-2, 3):
+                        dest = src[0] + i, src[1] + j
+                        if board.within_bounds(dest):
+                            res = Step.validate_head(board, src, dest)
+                            if res is not None:
+                                expected.add(Action(src, dest, res))
+
+            self.assertEqual(set(sut.actions(state)), expected)
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from benchmarking.GameAnalytics import GameAnalytics
+from benchmarking.Tournament import build_matchups, play_game, run_tournament, summarize, Matchup, PlayerSpec
+
+
+class TestTournament(unittest.TestCase):
+    def test_matchups_cover_heuristics_depths_and_seats(self):
+        matchups = build_matchups(['Weighted', 'AverageManhattan'], [1, 2])
+
+        # 4 players - every ordered pair of different players
+        self.assertEqual(len(matchups), 12)
+        self.assertIn(Matchup(PlayerSpec('Weighted', 1), PlayerSpec('AverageManhattan', 2)), matchups)
+        self.assertIn(Matchup(PlayerSpec('AverageManhattan', 2), PlayerSpec('Weighted', 1)), matchups)
+        self.assertEqual(len(build_matchups(['Weighted', 'AverageManhattan'], [1, 2], both_seats=False)), 6)
+        self.assertRaises(ValueError, build_matchups, ['Unknown'], [1])
+
+    def test_matchups_cover_search_algorithms(self):
+        matchups = build_matchups(['Weighted'], [2], algorithms=['alphabeta', 'pvs'])
+
+        self.assertEqual(matchups, [Matchup(PlayerSpec('Weighted', 2), PlayerSpec('Weighted', 2, 'pvs')),
+                                    Matchup(PlayerSpec('Weighted', 2, 'pvs'), PlayerSpec('Weighted', 2))])
+        self.assertEqual(matchups[0].label, 'Weighted@2 vs Weighted@2/pvs')
+        self.assertRaises(ValueError, build_matchups, ['Weighted'], [2], True, ['mtdf'])
+
+    def test_game_stopped_after_max_turns_has_no_winner(self):
+        matchup = Matchup(PlayerSpec('Weighted', 1), PlayerSpec('AverageManhattan', 1))
+
+        record = play_game(matchup, max_turns=6, opening_plies=2, seed=1)
+
+        self.assertEqual(record['total_turns'], 6)
+        self.assertEqual(record['winner'], 0)
+        self.assertEqual(record['matchup'], 'Weighted@1 vs AverageManhattan@1')
+        self.assertEqual([player['player_id'] for player in record['players']], [1, 2])
+
+    def test_tournament_workers_append_every_game(self):
+        matchups = build_matchups(['Weighted'], [1, 2])
+        with tempfile.TemporaryDirectory() as directory:
+            analytics = GameAnalytics(os.path.join(directory, 'games.jsonl'))
+            records = run_tournament(matchups, games=2, workers=2, max_turns=8, opening_plies=2,
+                                     analytics=analytics, verbose=False)
+
+            stored = list(analytics.iter_games())
+        self.assertEqual(sorted(record['seed'] for record in stored), [0, 1, 2, 3])
+        self.assertEqual([record['seed'] for record in records], [0, 1, 2, 3])
+        self.assertEqual(summarize(records), {'Weighted@1 vs Weighted@2': (0, 0, 2),
+                                              'Weighted@2 vs Weighted@1': (0, 0, 2)})
+
+    def test_tournament_does_not_import_pygame(self):
+        src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+        code = f'import sys; sys.path.append({src!r}); import benchmarking.Tournament; print("pygame" in sys.modules)'
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+
+        self.assertEqual(output.strip(), 'False')
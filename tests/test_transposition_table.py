@@ -0,0 +1,69 @@
+import unittest
+
+from game.Action import Action
+from game.Step import Step
+from game_problem.ChineseCheckers import ChineseCheckers
+from game_problem.Heuristic import WeightedHeuristic, SumOfPegsInCornerHeuristic, AverageManhattanToCornerHeuristic
+from players.MinimaxAIPlayer import MinimaxAIPlayer
+from search.TranspositionTable import TranspositionTable, Bound
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_probe_returns_stored_entry(self):
+        sut = TranspositionTable(max_entries=16)
+        action = Action((4, 0), (3, 0), Step.CRAWL)
+        sut.store(123, 3, 0.5, Bound.EXACT, action)
+
+        entry = sut.probe(123)
+
+        self.assertEqual(entry.best_action, action)
+        self.assertEqual(entry.depth, 3)
+        self.assertIsNone(sut.probe(123 + 16))  # same slot, different state
+        self.assertEqual(sut.hit_rate, 0.5)
+        self.assertEqual(len(sut), 1)
+
+    def test_depth_policy_keeps_deeper_entry_of_current_search(self):
+        sut = TranspositionTable(max_entries=16, policy='depth')
+        sut.store(1, 5, 0.1, Bound.EXACT, None)
+        sut.store(17, 2, 0.2, Bound.EXACT, None)
+
+        self.assertIsNotNone(sut.probe(1))
+        self.assertIsNone(sut.probe(17))
+
+        # Entries from older searches are always replaced
+        sut.new_search()
+        sut.store(17, 2, 0.2, Bound.EXACT, None)
+        self.assertIsNotNone(sut.probe(17))
+
+    def test_always_policy_replaces(self):
+        sut = TranspositionTable(max_entries=16, policy='always')
+        sut.store(1, 5, 0.1, Bound.EXACT, None)
+        sut.store(17, 2, 0.2, Bound.EXACT, None)
+
+        self.assertIsNone(sut.probe(1))
+        self.assertIsNotNone(sut.probe(17))
+
+    def test_invalid_configuration(self):
+        self.assertRaises(ValueError, TranspositionTable, 0)
+        self.assertRaises(ValueError, TranspositionTable, 16, 'random')
+
+    def test_search_with_table_decides_the_same_actions(self):
+        problem = ChineseCheckers(3, bitboard=True)
+        heuristic = WeightedHeuristic([
+            (SumOfPegsInCornerHeuristic(), 0.5),
+            (AverageManhattanToCornerHeuristic(), 0.5),
+        ])
+        with_table = MinimaxAIPlayer(problem, 1, 3, heuristic, verbose=False)
+        without_table = MinimaxAIPlayer(problem, 1, 3, heuristic, verbose=False, tt_size=0)
+
+        state = problem.initial_state()
+        for _ in range(4):
+            action = with_table.get_action(problem, state)
+            self.assertEqual(action, without_table.get_action(problem, state))
+            state = problem.result(state, action)
+            while state.player != 1:
+                state = problem.result(state, max(problem.actions(state)))
+
+        self.assertLessEqual(with_table.evaluated_states_count, without_table.evaluated_states_count)
+        self.assertIn('tt_hit_rate', with_table.to_dict())
+        self.assertNotIn('tt_hit_rate', without_table.to_dict())
@@ -0,0 +1,46 @@
+import argparse
+import os
+import sys
+
+sys.path.append("src")
+from benchmarking.GameAnalytics import GameAnalytics
+from benchmarking.Tournament import HEURISTICS, SEARCH_ALGORITHMS, build_matchups, run_tournament, summarize
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Headless Chinese Checkers tournament between minimax players.')
+
+    parser.add_argument('--heuristics', nargs='+', choices=sorted(HEURISTICS), default=['Weighted', 'WeightedEachCorner'],
+                        help='Heuristics entered in the tournament.')
+    parser.add_argument('--depths', nargs='+', type=int, default=[3],
+                        help='Search depths entered in the tournament - every (heuristic, depth) pair is a player.')
+    parser.add_argument('--algorithms', nargs='+', choices=SEARCH_ALGORITHMS, default=['alphabeta'],
+                        help='Search algorithms entered in the tournament - every (heuristic, depth, algorithm) '
+                             'triple is a player.')
+    parser.add_argument('--single-seat', action='store_true',
+                        help='Play every pairing in one seat order only instead of both.')
+    parser.add_argument('--games', type=int, default=1,
+                        help='Number of games per matchup.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Number of worker processes playing games in parallel.')
+    parser.add_argument('--max-turns', type=int, default=1000,
+                        help='Number of applied actions after which a game is stopped as unfinished.')
+    parser.add_argument('--opening-plies', type=int, default=0,
+                        help='Number of random actions opening each game - varies games between the same players.')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Base seed of the random openings.')
+    parser.add_argument('--output', default='game_data.jsonl',
+                        help='Analytics file the game records are appended to.')
+
+    args = parser.parse_args()
+
+    matchups = build_matchups(args.heuristics, args.depths, both_seats=not args.single_seat,
+                              algorithms=args.algorithms)
+    analytics = GameAnalytics(args.output)
+    records = run_tournament(matchups, args.games, workers=args.workers, max_turns=args.max_turns,
+                             opening_plies=args.opening_plies, seed=args.seed, analytics=analytics)
+
+    for label, (first, second, unfinished) in summarize(records).items():
+        print(f'{label}: {first} - {second} ({unfinished} unfinished)')
+    if len(args.algorithms) > 1:
+        analytics.print_search_comparison()